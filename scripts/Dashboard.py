@@ -1,6 +1,8 @@
+import os
+import re
 import sys
+import argparse
 import pandas as pd
-import pyodbc
 import matplotlib.pyplot as plt
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
 from matplotlib.figure import Figure
@@ -8,30 +10,1144 @@ from PyQt5.QtWidgets import *
 from PyQt5.QtCore import *
 from PyQt5.QtGui import *
 from datetime import datetime
+from collections import OrderedDict
 import numpy as np
+from query_cache import QueryResultCache, TableSnapshot, cacheable_query, warehouse_version
+from warehouse import DatabaseError, warehouse_backend
+from columnar_fetch import read_columnar
+from time_rollup import TimeRollup
+from olap_cube import OlapCube
+from cross_filter import CrossFilter
+from charts import BarChart, LineChart, OffscreenChart, PieChart, ScatterChart
+
+# Warehouse the dashboard reads, SQL Server unless DW_WAREHOUSE names another
+WAREHOUSE = warehouse_backend()
 
 # Database connection
 def get_db_connection():
     """Establish database connection"""
     try:
-        conn_str = (
-            'DRIVER={ODBC Driver 18 for SQL Server};'
-            'SERVER=localhost;'
-            'DATABASE=DataWareHouse;'
-            'Trusted_Connection=yes;'
-            'Encrypt=no;'
-        )
-        conn = pyodbc.connect(conn_str)
+        conn = WAREHOUSE.connect()
         return conn
     except Exception as e:
         print(f"Database connection error: {e}")
         return None
 
+# Columns each dashboard tab reads, per warehouse table. load_data only fetches
+# the union of these, so address/ship columns no chart uses stay on the server.
+TAB_COLUMNS = {
+    'overview': {
+        'FactOrders': ['CustomerKey', 'EmployeeKey', 'OrderDateKey', 'TotalAmount', 'IsDelivered'],
+        'DimCustomer': ['CustomerKey', 'CustomerID', 'CompanyName'],
+        'DimEmployee': ['EmployeeKey', 'FirstName', 'LastName'],
+        'DimDate': ['DateKey', 'Year', 'Month', 'MonthName'],
+    },
+    'sales': {
+        'FactOrders': ['OrderID', 'OrderDate', 'CustomerKey', 'TotalAmount', 'Freight', 'IsDelivered'],
+        'DimCustomer': ['CustomerKey', 'CompanyName', 'Country'],
+    },
+    'customers': {
+        'FactOrders': ['OrderID', 'CustomerKey', 'TotalAmount'],
+        'DimCustomer': ['CustomerKey', 'CompanyName', 'Country', 'City', 'ContactName'],
+    },
+    'employees': {
+        'FactOrders': ['OrderID', 'EmployeeKey', 'TotalAmount'],
+        'DimEmployee': ['EmployeeKey', 'FirstName', 'LastName', 'Title', 'Country'],
+    },
+    'time': {
+        'FactOrders': ['OrderDateKey', 'TotalAmount'],
+        'DimDate': ['DateKey', 'Date', 'Year', 'Quarter', 'Month', 'MonthName', 'DayOfWeek'],
+    },
+    # Dimensions and measures of the OLAP cube the tabs query
+    'cube': {
+        'FactOrders': ['CustomerKey', 'EmployeeKey', 'OrderDateKey', 'TotalAmount', 'Freight',
+                       'IsDelivered', 'SourceSystem'],
+        'DimCustomer': ['CustomerKey', 'Country'],
+        'DimEmployee': ['EmployeeKey', 'Title'],
+        'DimDate': ['DateKey', 'Year', 'Quarter', 'Month'],
+    },
+}
+
+# Explicit dtypes for the manifest columns (text columns stay as object)
+COLUMN_DTYPES = {
+    'FactOrders': {
+        'OrderID': 'int32', 'CustomerKey': 'int32', 'EmployeeKey': 'int32',
+        'OrderDateKey': 'int32', 'TotalAmount': 'float64', 'Freight': 'float64',
+        'IsDelivered': 'int8'
+    },
+    'DimCustomer': {'CustomerKey': 'int32'},
+    'DimEmployee': {'EmployeeKey': 'int32'},
+    'DimDate': {'DateKey': 'int32', 'Year': 'int16', 'Quarter': 'int8', 'Month': 'int8'},
+}
+
+DATE_COLUMNS = {
+    'FactOrders': ['OrderDate'],
+    'DimDate': ['Date'],
+}
+
+def manifest_columns(table):
+    """Return the columns of a table needed by at least one tab, in manifest order"""
+    columns = []
+    for tables in TAB_COLUMNS.values():
+        for col in tables.get(table, []):
+            if col not in columns:
+                columns.append(col)
+    return columns
+
+def cast_columns(df, table):
+    """Apply the declared dtypes of a table to a freshly loaded frame"""
+    for col, dtype in COLUMN_DTYPES.get(table, {}).items():
+        if col not in df.columns:
+            continue
+        # Integer columns holding NULLs fall back to the nullable pandas dtype
+        if dtype.startswith('int') and df[col].isna().any():
+            dtype = dtype.capitalize()
+        df[col] = df[col].astype(dtype)
+    return df
+
+def read_table(conn, table, where='', params=None):
+    """Read the manifest columns of a warehouse table with explicit dtypes"""
+    columns = manifest_columns(table)
+    query = f"SELECT {', '.join(columns)} FROM {table}"
+    if where:
+        query += f" WHERE {where}"
+    parse_dates = [col for col in DATE_COLUMNS.get(table, []) if col in columns]
+    df = read_columnar(conn, query, params, parse_dates, connection_string=WAREHOUSE.connection_string())
+    return cast_columns(df, table)
+
+# Directory the ETL publishes its CSV extract to, one file per warehouse table
+EXTRACT_DIR = os.path.join('data', 'extract')
+
+def read_extract_table(directory, table):
+    """Read the manifest columns of a table from the CSV extract the ETL publishes"""
+    columns = manifest_columns(table)
+    # Integer columns parse as nullable, cast_columns narrows those without NULLs
+    dtypes = {col: dtype.capitalize() if dtype.startswith('int') else dtype
+              for col, dtype in COLUMN_DTYPES.get(table, {}).items() if col in columns}
+    parse_dates = [col for col in DATE_COLUMNS.get(table, []) if col in columns]
+    df = pd.read_csv(os.path.join(directory, f"{table}.csv"), usecols=columns, dtype=dtypes,
+                     parse_dates=parse_dates)
+    return cast_columns(df[columns], table)
+
+# Aggregate queries used by the widgets in server-side aggregation mode.
+# {where} is filled by build_aggregate_query with the active filters.
+AGGREGATE_QUERIES = {
+    'overview_kpis': """
+        SELECT COUNT(*) AS TotalOrders, SUM(f.TotalAmount) AS TotalRevenue,
+               AVG(f.TotalAmount) AS AvgOrder,
+               SUM(CAST(f.IsDelivered AS INT)) AS DeliveredOrders
+        FROM FactOrders f
+    """,
+    'monthly_revenue': """
+        SELECT d.Year, d.Month, d.MonthName, SUM(f.TotalAmount) AS TotalAmount
+        FROM FactOrders f
+        JOIN DimDate d ON f.OrderDateKey = d.DateKey
+        GROUP BY d.Year, d.Month, d.MonthName
+        ORDER BY d.Year, d.Month
+    """,
+    'top_customers': """
+        SELECT f.CustomerKey, c.CompanyName, SUM(f.TotalAmount) AS TotalAmount
+        FROM FactOrders f
+        LEFT JOIN DimCustomer c ON f.CustomerKey = c.CustomerKey
+        GROUP BY f.CustomerKey, c.CompanyName
+        ORDER BY TotalAmount DESC
+    """,
+    'country_sales': """
+        SELECT c.Country, SUM(f.TotalAmount) AS TotalAmount
+        FROM FactOrders f
+        LEFT JOIN DimCustomer c ON f.CustomerKey = c.CustomerKey
+        WHERE {where}
+        GROUP BY c.Country
+        ORDER BY TotalAmount DESC
+    """,
+    'daily_sales': """
+        SELECT f.OrderDate AS Date, SUM(f.TotalAmount) AS Revenue
+        FROM FactOrders f
+        LEFT JOIN DimCustomer c ON f.CustomerKey = c.CustomerKey
+        WHERE {where}
+        GROUP BY f.OrderDate
+        ORDER BY f.OrderDate
+    """,
+    'sales_rows': """
+        SELECT f.OrderID, f.OrderDate, f.CustomerKey, f.TotalAmount,
+               f.Freight, f.IsDelivered
+        FROM FactOrders f
+        LEFT JOIN DimCustomer c ON f.CustomerKey = c.CustomerKey
+        WHERE {where}
+        ORDER BY f.OrderID
+    """,
+    'customer_summary': """
+        SELECT c.CustomerKey, c.CompanyName, c.Country, c.City, c.ContactName,
+               COUNT(f.OrderID) AS OrderCount,
+               COALESCE(SUM(f.TotalAmount), 0) AS TotalSpent
+        FROM DimCustomer c
+        LEFT JOIN FactOrders f ON f.CustomerKey = c.CustomerKey
+        WHERE {where}
+        GROUP BY c.CustomerKey, c.CompanyName, c.Country, c.City, c.ContactName
+        HAVING COUNT(f.OrderID) >= ?
+    """,
+    'employee_performance': """
+        SELECT e.EmployeeKey, e.FirstName, e.LastName, e.Title, e.Country,
+               COUNT(f.OrderID) AS OrderCount,
+               COALESCE(SUM(f.TotalAmount), 0) AS TotalRevenue
+        FROM DimEmployee e
+        LEFT JOIN FactOrders f ON f.EmployeeKey = e.EmployeeKey
+        GROUP BY e.EmployeeKey, e.FirstName, e.LastName, e.Title, e.Country
+    """,
+    'time_series_Daily': """
+        SELECT d.Date, SUM(f.TotalAmount) AS TotalAmount
+        FROM FactOrders f
+        JOIN DimDate d ON f.OrderDateKey = d.DateKey
+        WHERE {where}
+        GROUP BY d.Date
+        ORDER BY d.Date
+    """,
+    'time_series_Weekly': """
+        SELECT {week_start} AS Date,
+               SUM(f.TotalAmount) AS TotalAmount
+        FROM FactOrders f
+        JOIN DimDate d ON f.OrderDateKey = d.DateKey
+        WHERE {where}
+        GROUP BY {week_start}
+        ORDER BY Date
+    """,
+    'time_series_Monthly': """
+        SELECT d.Year, d.Month, d.MonthName, SUM(f.TotalAmount) AS TotalAmount
+        FROM FactOrders f
+        JOIN DimDate d ON f.OrderDateKey = d.DateKey
+        WHERE {where}
+        GROUP BY d.Year, d.Month, d.MonthName
+        ORDER BY d.Year, d.Month
+    """,
+    'time_series_Quarterly': """
+        SELECT d.Year, d.Quarter, SUM(f.TotalAmount) AS TotalAmount
+        FROM FactOrders f
+        JOIN DimDate d ON f.OrderDateKey = d.DateKey
+        WHERE {where}
+        GROUP BY d.Year, d.Quarter
+        ORDER BY d.Year, d.Quarter
+    """,
+    'time_series_Yearly': """
+        SELECT d.Year, SUM(f.TotalAmount) AS TotalAmount
+        FROM FactOrders f
+        JOIN DimDate d ON f.OrderDateKey = d.DateKey
+        WHERE {where}
+        GROUP BY d.Year
+        ORDER BY d.Year
+    """,
+    'day_of_week': """
+        SELECT d.DayOfWeek, AVG(f.TotalAmount) AS Mean, SUM(f.TotalAmount) AS Sum,
+               COUNT(*) AS Count
+        FROM FactOrders f
+        JOIN DimDate d ON f.OrderDateKey = d.DateKey
+        WHERE {where}
+        GROUP BY d.DayOfWeek
+    """,
+    'order_years': """
+        SELECT DISTINCT d.Year
+        FROM FactOrders f
+        JOIN DimDate d ON f.OrderDateKey = d.DateKey
+        ORDER BY d.Year
+    """,
+}
+
+# Unfiltered widgets read the summary tables the ETL keeps up to date, when the warehouse has them
+AGG_TABLES = ['AggMonthlyRevenue', 'AggCustomerRevenue', 'AggEmployeePerformance', 'AggCountryRevenue']
+
+AGG_TABLE_QUERIES = {
+    'overview_kpis': """
+        SELECT SUM(OrderCount) AS TotalOrders, SUM(Revenue) AS TotalRevenue,
+               SUM(Revenue) / NULLIF(SUM(OrderCount), 0) AS AvgOrder,
+               SUM(DeliveredCount) AS DeliveredOrders
+        FROM AggMonthlyRevenue
+    """,
+    'monthly_revenue': """
+        SELECT Year, Month, MonthName, Revenue AS TotalAmount
+        FROM AggMonthlyRevenue
+        ORDER BY Year, Month
+    """,
+    'top_customers': """
+        SELECT a.CustomerKey, c.CompanyName, a.Revenue AS TotalAmount
+        FROM AggCustomerRevenue a
+        LEFT JOIN DimCustomer c ON a.CustomerKey = c.CustomerKey
+        ORDER BY a.Revenue DESC
+    """,
+    'country_sales': """
+        SELECT Country, Revenue AS TotalAmount
+        FROM AggCountryRevenue
+        ORDER BY Revenue DESC
+    """,
+    'employee_performance': """
+        SELECT e.EmployeeKey, e.FirstName, e.LastName, e.Title, e.Country,
+               COALESCE(a.OrderCount, 0) AS OrderCount,
+               COALESCE(a.Revenue, 0) AS TotalRevenue
+        FROM DimEmployee e
+        LEFT JOIN AggEmployeePerformance a ON a.EmployeeKey = e.EmployeeKey
+    """,
+}
+
+# Widgets whose queries return only their first rows: the row count parameter, or a fixed count
+QUERY_ROW_LIMITS = {'top_customers': 0, 'sales_rows': 3, 'country_sales': None}
+COUNTRY_SALES_ROWS = 10
+
+AGG_MONTHS_QUERY = "SELECT MIN(Year * 100 + Month), MAX(Year * 100 + Month) FROM AggMonthlyRevenue"
+
+# Spending per customer the segments are cut from when the facts stay in the warehouse
+CUSTOMER_SPENDING_QUERY = """
+    SELECT CustomerKey, SUM(TotalAmount) AS TotalAmount
+    FROM FactOrders
+    WHERE CustomerKey IS NOT NULL
+    GROUP BY CustomerKey
+"""
+
+def has_agg_tables(conn):
+    """Return True if the warehouse has every summary table the ETL maintains"""
+    return set(AGG_TABLES) <= WAREHOUSE.tables(conn)
+
+def limit_rows(widget, sql, params):
+    """Apply the row limit of a widget query in the warehouse dialect"""
+    if widget not in QUERY_ROW_LIMITS:
+        return sql
+    position = QUERY_ROW_LIMITS[widget]
+    return WAREHOUSE.limit(sql, COUNTRY_SALES_ROWS if position is None else params[position])
+
+# Seconds between change probes when --auto-refresh is given without a value
+AUTO_REFRESH_SECONDS = 60
+
+# Identity column of FactOrders: FactOrderKey, or OrderKey in warehouses built by
+# create_database.py before it named the key like the ETL does
+FACT_KEY_COLUMNS = ['FactOrderKey', 'OrderKey']
+
+# Tables the ETL appends to and their increasing keys, FactOrders' is detected
+REFRESH_TABLES = {'FactOrders': None, 'DimCustomer': 'CustomerKey', 'DimEmployee': 'EmployeeKey'}
+
+# Frames of the local snapshot and the warehouse tables they come from; bump
+# SNAPSHOT_FORMAT when build_analysis_frame changes the frames it produces
+SNAPSHOT_FRAMES = {'customers': 'DimCustomer', 'employees': 'DimEmployee', 'dates': 'DimDate', 'orders': 'FactOrders'}
+SNAPSHOT_FORMAT = 1
+
+def snapshot_schema():
+    """What a snapshot must have been built from to be loaded"""
+    return {'format': SNAPSHOT_FORMAT, 'warehouse': WAREHOUSE.spec,
+            'columns': {table: manifest_columns(table) for table in SNAPSHOT_FRAMES.values()}}
+
+def fact_key_column(conn):
+    """Identity column of FactOrders, None when it has none"""
+    cursor = conn.cursor()
+    cursor.execute("SELECT * FROM FactOrders WHERE 1 = 0")
+    columns = [col[0] for col in cursor.description]
+    cursor.close()
+    return next((col for col in FACT_KEY_COLUMNS if col in columns), None)
+
+def refresh_keys(fact_key):
+    """Increasing key of each table the ETL appends to"""
+    return dict(REFRESH_TABLES, FactOrders=fact_key)
+
+def table_marks(conn, fact_key):
+    """Row count and highest key of each table the ETL appends to"""
+    keys = refresh_keys(fact_key)
+    cursor = conn.cursor()
+    row = cursor.execute('SELECT ' + ', '.join(
+        f'(SELECT COUNT(*) FROM {table}), (SELECT MAX({key}) FROM {table})' for table, key in keys.items()
+    )).fetchone()
+    cursor.close()
+    return {table: (row[2 * i], row[2 * i + 1] or 0) for i, table in enumerate(keys)}
+
+# Measures of aggregate results, cast to float64 whatever SQL type the sums come back as
+AGGREGATE_MEASURES = ['TotalAmount', 'TotalRevenue', 'TotalSpent', 'Revenue', 'AvgOrder',
+                      'Mean', 'Sum', 'Freight']
+
+# Text columns of the analysis frame stored as categoricals
+ANALYSIS_CATEGORIES = ['MonthName', 'DayOfWeek', 'CompanyName', 'Country', 'EmployeeName']
+
+# Spending segments and the quantiles cutting them, computed once per load over every
+# customer with orders; the segment filter, the pie and the cross-filter all read them
+SEGMENTS = ['Low', 'Medium', 'High']
+SEGMENT_QUANTILES = [0.33, 0.67]
+
+def spending_segments(spending):
+    """Segment of each customer of a spending Series indexed by CustomerKey"""
+    low, high = spending.quantile(SEGMENT_QUANTILES)
+    return pd.Series(np.where(spending > high, 'High', np.where(spending > low, 'Medium', 'Low')),
+                     index=spending.index)
+
+# Orders listed in the sales table
+SALES_TABLE_ROWS = 1000
+
+# Quiet time after the last resize event before charts are laid out again
+RESIZE_DEBOUNCE_MS = 150
+
+# Rows per fetchmany call of explorer queries
+EXPLORER_FETCH_ROWS = 5000
+
+# Default rows per page of paged explorer queries
+EXPLORER_PAGE_ROWS = 1000
+
+# Largest explorer result stored in the query cache
+QUERY_CACHE_MAX_ROWS = 1000000
+
+# Rows of an Excel worksheet, header included
+EXCEL_MAX_ROWS = 1048576
+
+# Default explorer query timeout in seconds
+EXPLORER_TIMEOUT_SECONDS = 300
+
+# Memory cap of the widget aggregation cache
+AGG_CACHE_MAX_BYTES = 64 * 1024 * 1024
+
+DAY_ORDER = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
+DAY_POSITIONS = {day: position for position, day in enumerate(DAY_ORDER)}
+
+def quarter_label(date):
+    """Tick label of a quarter starting at date"""
+    return f"Q{(date.month - 1) // 3 + 1} {date.year}"
+
+# Time series tick labels per period, None leaves daily and weekly ticks to the date locator
+PERIOD_TICK_FORMATS = {
+    'Daily': None,
+    'Weekly': None,
+    'Monthly': '%b %Y',
+    'Quarterly': quarter_label,
+    'Yearly': '%Y',
+}
+
+def period_start_dates(df, period):
+    """First day of each time series bucket"""
+    if period in ('Daily', 'Weekly'):
+        return pd.to_datetime(df['Date'])
+    if period == 'Monthly':
+        month = df['Month']
+    elif period == 'Quarterly':
+        month = df['Quarter'] * 3 - 2
+    else:
+        month = 1
+    return pd.to_datetime(pd.DataFrame({'year': df['Year'], 'month': month, 'day': 1}))
+
+class AggregationCache:
+    """LRU cache of chart-ready frames, bounded by their total memory size"""
+    
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.sizes = {}
+        self.total_bytes = 0
+        
+    def get(self, key):
+        """Return the cached frame for key, or None"""
+        df = self.entries.get(key)
+        if df is not None:
+            self.entries.move_to_end(key)
+        return df
+        
+    def put(self, key, df):
+        """Store a frame, evicting the least recently used ones over the cap"""
+        size = int(df.memory_usage(deep=True).sum())
+        if size > self.max_bytes:
+            return
+        if key in self.entries:
+            self.total_bytes -= self.sizes.pop(key)
+        self.entries[key] = df
+        self.sizes[key] = size
+        self.total_bytes += size
+        
+        while self.total_bytes > self.max_bytes:
+            old_key, _ = self.entries.popitem(last=False)
+            self.total_bytes -= self.sizes.pop(old_key)
+            
+    def clear(self):
+        """Drop every entry"""
+        self.entries.clear()
+        self.sizes.clear()
+        self.total_bytes = 0
+
+class DebouncedCanvas(FigureCanvas):
+    """Figure canvas that resizes its figure once resizing settles"""
+    
+    def __init__(self, figure):
+        super().__init__(figure)
+        self.pending_resize = None
+        self.resize_timer = QTimer(self)
+        self.resize_timer.setSingleShot(True)
+        self.resize_timer.setInterval(RESIZE_DEBOUNCE_MS)
+        self.resize_timer.timeout.connect(self.apply_resize)
+        
+    def resizeEvent(self, event):
+        # Keep only the latest size while the window edge is dragged
+        self.pending_resize = QResizeEvent(event.size(), event.oldSize())
+        self.resize_timer.start()
+        
+    def apply_resize(self):
+        """Resize the figure to the widget, the canvas draws it again"""
+        event, self.pending_resize = self.pending_resize, None
+        if event is not None:
+            super().resizeEvent(event)
+
+# One thread builds and draws the figures of every chart, only it touches them
+RENDER_POOL = QThreadPool()
+RENDER_POOL.setMaxThreadCount(1)
+
+class RenderSignals(QObject):
+    """Signals of a render task, which is not a QObject itself"""
+    rendered = pyqtSignal(int, QImage, object)
+    failed = pyqtSignal(int, str)
+
+class RenderTask(QRunnable):
+    """Draw a frame of a canvas chart off the GUI thread
+    
+    Matplotlib figures are not thread-safe: the chart and its figure belong
+    to the render thread, the task only carries the chart calls recorded
+    since the last frame and the size of the canvas.
+    """
+    
+    def __init__(self, canvas, generation):
+        super().__init__()
+        self.signals = RenderSignals()
+        self.signals.rendered.connect(canvas.on_rendered)
+        self.signals.failed.connect(canvas.on_render_failed)
+        self.generation = generation
+        self.offscreen = canvas.offscreen
+        self.calls, canvas.calls = canvas.calls, []
+        # Size in inches and dpi of the canvas figure, which Qt keeps at the widget size
+        # in device pixels; the figure itself is never drawn
+        self.size_inches = tuple(canvas.figure.get_size_inches())
+        self.dpi = canvas.figure.dpi
+        
+    def run(self):
+        try:
+            pixels, hits = self.offscreen.draw(self.calls, self.size_inches, self.dpi)
+            height, width = pixels.shape[:2]
+            image = QImage(pixels, width, height, width * 4, QImage.Format_RGBA8888).copy()
+        except Exception as e:
+            self.emit('failed', self.generation, str(e))
+        else:
+            self.emit('rendered', self.generation, image, hits)
+            
+    def emit(self, signal, *args):
+        try:
+            getattr(self.signals, signal).emit(*args)
+        except RuntimeError:
+            pass  # canvas closed before the frame was done
+
+class ChartHandle:
+    """The dashboard side of a chart drawn on the render thread
+    
+    Chart calls are recorded on the canvas and made by the render thread
+    before its next frame; clicks are matched against the last frame shown.
+    """
+    
+    def __init__(self, canvas):
+        self.canvas = canvas
+        
+    def update(self, *args, **kwargs):
+        self.canvas.record('update', args, kwargs)
+        
+    def set_title(self, title):
+        self.canvas.record('set_title', (title,), {})
+        
+    def set_font_sizes(self, title_size, label_size, tick_size):
+        self.canvas.record('set_font_sizes', (title_size, label_size, tick_size), {})
+        
+    def show_message(self, text):
+        self.canvas.record('show_message', (text,), {})
+        
+    def on_select(self, callback):
+        """Call callback with the key of each clicked item"""
+        self.canvas.mpl_connect('button_press_event', lambda event: self.canvas.on_click(event, callback))
+
+class AsyncCanvas(DebouncedCanvas):
+    """Canvas whose chart is drawn on the render thread and shown when ready
+    
+    The canvas figure only follows the widget size. One frame is drawn at a
+    time; draws asked for meanwhile are folded into one more frame started
+    when it is done, and frames of an older chart state are dropped.
+    """
+    
+    # Full frames come from the render thread, there is no GUI-side buffer to blit into
+    supports_blit = False
+    failed = pyqtSignal(str)
+    
+    def __init__(self, figure):
+        super().__init__(figure)
+        self.generation = 0
+        self.rendering = False
+        self.redraw = False
+        self.frame = None
+        self.offscreen = None
+        self.calls = []
+        self.hits = None
+        
+    def chart(self, chart_class, *args, **kwargs):
+        """Handle of a chart_class chart, built on the render thread with a figure of its own"""
+        self.offscreen = OffscreenChart(chart_class, *args, **kwargs)
+        return ChartHandle(self)
+        
+    def record(self, name, args, kwargs):
+        """Queue a chart call for the next frame, calls made together share one frame"""
+        self.calls.append((name, args, kwargs))
+        self.draw_idle()
+        
+    def draw(self):
+        """Start drawing the chart, the last frame stays on screen meanwhile"""
+        if self.rendering:
+            self.redraw = True
+            return
+        if self.offscreen is None or self.width() <= 0 or self.height() <= 0:
+            return
+        self.rendering = True
+        self.redraw = False
+        self.generation += 1
+        RENDER_POOL.start(RenderTask(self, self.generation))
+        
+    def frame_done(self):
+        """Start the frame asked for while the last one was drawn"""
+        self.rendering = False
+        if self.redraw:
+            self.draw()
+            
+    def on_rendered(self, generation, image, hits):
+        """Show a finished frame unless the chart changed while it was drawn"""
+        self.frame_done()
+        if generation == self.generation:
+            image.setDevicePixelRatio(self.device_pixel_ratio)
+            self.frame = image
+            self.hits = hits
+            self.update()
+            
+    def on_click(self, event, callback):
+        """Report the item of the shown frame under a left click"""
+        if event.button == 1 and self.hits is not None:
+            key = self.hits.key_at(event.x, event.y)
+            if key is not None:
+                callback(key)
+            
+    def on_render_failed(self, generation, message):
+        """Report a frame that could not be drawn"""
+        self.frame_done()
+        self.failed.emit(message)
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        if self.frame is None:
+            painter.fillRect(self.rect(), Qt.white)
+        else:
+            painter.drawImage(0, 0, self.frame)
+        painter.end()
+
+def format_cell(value):
+    """Display text of a raw cell value"""
+    return "NULL" if pd.isna(value) else str(value)
+
+def format_money(value):
+    """Display text of an amount"""
+    return f"${value:,.2f}"
+
+def format_date(value):
+    """Display text of a date"""
+    return "NaT" if pd.isna(value) else str(value)[:10]
+
+class DataFrameTableModel(QAbstractTableModel):
+    """Table model reading and formatting DataFrame cells on demand
+    
+    Columns are (header, column, formatter) triples, by default every
+    column of the frame is shown with format_cell.
+    """
+    
+    def __init__(self, columns=None, parent=None):
+        super().__init__(parent)
+        self.columns = columns
+        self.frame = pd.DataFrame()
+        self.specs = []
+        self.arrays = []
+        self.sort_column = -1
+        self.sort_order = Qt.AscendingOrder
+        
+    def set_frame(self, df):
+        """Show a new frame, keeping the current sort"""
+        self.beginResetModel()
+        self.frame = df.reset_index(drop=True)
+        self.specs = self.columns or [(str(col), col, format_cell) for col in df.columns]
+        if 0 <= self.sort_column < len(self.specs):
+            self.frame = self.sorted_frame(self.sort_column, self.sort_order)
+        self.arrays = [self.frame[col].to_numpy() for _, col, _ in self.specs]
+        self.endResetModel()
+        
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.frame)
+        
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.specs)
+        
+    def data(self, index, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole or not index.isValid():
+            return None
+        formatter = self.specs[index.column()][2]
+        return formatter(self.arrays[index.column()][index.row()])
+        
+    def append_frame(self, df):
+        """Add rows at the end, re-sorting if a sort is active"""
+        if df.empty:
+            return
+        first = len(self.frame)
+        self.beginInsertRows(QModelIndex(), first, first + len(df) - 1)
+        if first == 0:
+            self.frame = df.reset_index(drop=True)
+        else:
+            self.frame = pd.concat([self.frame, df], ignore_index=True)
+        self.arrays = [self.frame[col].to_numpy() for _, col, _ in self.specs]
+        self.endInsertRows()
+        
+        if 0 <= self.sort_column < len(self.specs):
+            self.sort(self.sort_column, self.sort_order)
+        
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole:
+            return None
+        if orientation == Qt.Horizontal:
+            return self.specs[section][0] if section < len(self.specs) else None
+        return str(section + 1)
+        
+    def sort(self, column, order=Qt.AscendingOrder):
+        """Reorder the whole frame on the raw values of a column"""
+        self.sort_column, self.sort_order = column, order
+        if not 0 <= column < len(self.specs) or self.frame.empty:
+            return
+        self.layoutAboutToBeChanged.emit()
+        self.frame = self.sorted_frame(column, order)
+        self.arrays = [self.frame[col].to_numpy() for _, col, _ in self.specs]
+        self.layoutChanged.emit()
+        
+    def sorted_frame(self, column, order):
+        """Frame ordered on one column, missing values last"""
+        values = self.frame[self.specs[column][1]]
+        ascending = order == Qt.AscendingOrder
+        try:
+            positions = values.sort_values(ascending=ascending, kind='stable', na_position='last').index
+        except TypeError:
+            # Mixed types in an explorer column, compare their text
+            positions = values.astype(str).sort_values(ascending=ascending, kind='stable').index
+        return self.frame.loc[positions].reset_index(drop=True)
+
+class QueryWorker(QThread):
+    """Run an explorer query on its own connection and stream the result set"""
+    
+    columns_ready = pyqtSignal(list)
+    rows_fetched = pyqtSignal(object)
+    failed = pyqtSignal(str)
+    
+    def __init__(self, query, timeout, parent=None, cache=None):
+        super().__init__(parent)
+        self.query = query
+        self.timeout = timeout
+        self.cache = cache
+        self.from_cache = False
+        self.cursor = None
+        self.cancelled = False
+        
+    def run(self):
+        conn = get_db_connection()
+        if conn is None:
+            self.failed.emit("Could not connect to database")
+            return
+        
+        try:
+            conn.timeout = self.timeout  # seconds, 0 waits forever
+            
+            # Results already fetched for this warehouse version are read from disk,
+            # for queries whose result only that version decides
+            version = None
+            if self.cache is not None and cacheable_query(self.query):
+                try:
+                    version = warehouse_version(conn)
+                except DatabaseError:
+                    pass
+            if version is not None:
+                cached = self.cache.get(self.query, version)
+                if cached is not None:
+                    self.from_cache = True
+                    self.columns_ready.emit(list(cached.columns))
+                    self.rows_fetched.emit(cached)
+                    return
+            
+            self.cursor = conn.cursor()
+            self.cursor.execute(self.query)
+            if self.cursor.description is None:
+                self.columns_ready.emit([])
+                return
+            
+            columns = [col[0] for col in self.cursor.description]
+            self.columns_ready.emit(columns)
+            kept = [] if version is not None else None
+            kept_rows = 0
+            while not self.cancelled:
+                rows = self.cursor.fetchmany(EXPLORER_FETCH_ROWS)
+                if not rows:
+                    break
+                chunk = pd.DataFrame.from_records(
+                    [tuple(row) for row in rows], columns=columns, coerce_float=True)
+                self.rows_fetched.emit(chunk)
+                
+                # Results too large to be worth caching are not kept
+                kept_rows += len(chunk)
+                if kept is not None and kept_rows <= QUERY_CACHE_MAX_ROWS:
+                    kept.append(chunk)
+                else:
+                    kept = None
+                    
+            if kept is not None and not self.cancelled:
+                result = pd.concat(kept, ignore_index=True) if kept else pd.DataFrame(columns=columns)
+                self.cache.put(self.query, version, result)
+        except Exception as e:
+            if not self.cancelled:
+                self.failed.emit(str(e))
+        finally:
+            conn.close()
+            
+    def cancel(self):
+        """Stop fetching and cancel the running statement on the server"""
+        self.cancelled = True
+        cursor = self.cursor
+        if cursor is not None:
+            try:
+                cursor.cancel()
+            except DatabaseError:
+                pass
+
+class PageWorker(QueryWorker):
+    """Fetch one page of a paged explorer query"""
+    
+    page_ready = pyqtSignal(int, int, object, object)
+    
+    def __init__(self, query, rows, plan, start, page, generation, timeout, parent=None):
+        super().__init__(query, timeout, parent)
+        self.rows = rows
+        self.plan = plan
+        self.page_start = start
+        self.page = page
+        self.generation = generation
+        
+    def describe(self, sql):
+        """Column names of a query, read without fetching rows"""
+        self.cursor.execute(sql)
+        columns = [col[0] for col in self.cursor.description]
+        self.cursor.fetchall()
+        return columns
+        
+    def run(self):
+        conn = get_db_connection()
+        if conn is None:
+            self.failed.emit("Could not connect to database")
+            return
+        
+        try:
+            conn.timeout = self.timeout
+            self.cursor = conn.cursor()
+            # The first page decides how the query is paged
+            if self.plan is None:
+                self.plan = page_plan(self.query, self.describe)
+            sql, params = paged_query(self.query, self.rows, self.plan, self.page_start)
+            self.cursor.execute(sql, params)
+            columns = [col[0] for col in self.cursor.description]
+            rows = self.cursor.fetchall()
+            page_df = pd.DataFrame.from_records(
+                [tuple(row) for row in rows], columns=columns, coerce_float=True)
+            mode, key = self.plan
+            if mode == 'keyset':
+                next_start = rows[-1][columns.index(key)] if rows else None
+            else:
+                next_start = (self.page_start or 0) + len(rows)
+            self.page_ready.emit(self.generation, self.page, page_df, (self.plan, next_start))
+        except Exception as e:
+            if not self.cancelled:
+                self.failed.emit(str(e))
+        finally:
+            conn.close()
+
+class ExportWorker(QueryWorker):
+    """Stream the rows of an explorer query into a CSV or Excel file"""
+    
+    progress = pyqtSignal(int)
+    
+    def __init__(self, query, filename, file_format, timeout, parent=None):
+        super().__init__(query, timeout, parent)
+        self.filename = filename
+        self.file_format = file_format
+        self.rows_written = 0
+        
+    def run(self):
+        conn = get_db_connection()
+        if conn is None:
+            self.failed.emit("Could not connect to database")
+            return
+        
+        try:
+            conn.timeout = self.timeout
+            self.cursor = conn.cursor()
+            self.cursor.execute(self.query)
+            if self.cursor.description is None:
+                raise ValueError("The query returns no rows to export")
+            columns = [col[0] for col in self.cursor.description]
+            if self.file_format == 'xlsx':
+                self.write_excel(columns)
+            else:
+                self.write_csv(columns)
+        except Exception as e:
+            if not self.cancelled:
+                self.failed.emit(str(e))
+        finally:
+            conn.close()
+            
+    def batches(self):
+        """Yield the result set in fetchmany batches"""
+        while not self.cancelled:
+            rows = self.cursor.fetchmany(EXPLORER_FETCH_ROWS)
+            if not rows:
+                return
+            yield rows
+            self.rows_written += len(rows)
+            self.progress.emit(self.rows_written)
+            
+    def write_csv(self, columns):
+        """Append each batch to the CSV file as soon as it is fetched"""
+        with open(self.filename, 'w', newline='', encoding='utf-8') as f:
+            pd.DataFrame(columns=columns).to_csv(f, index=False)
+            for rows in self.batches():
+                batch = pd.DataFrame.from_records(
+                    [tuple(row) for row in rows], columns=columns, coerce_float=True)
+                batch.to_csv(f, header=False, index=False)
+                
+    def write_excel(self, columns):
+        """Write rows through a write-only workbook, starting a new sheet when one is full"""
+        from openpyxl import Workbook
+        
+        workbook = Workbook(write_only=True)
+        sheet = None
+        sheet_rows = 0
+        for rows in self.batches():
+            for row in rows:
+                if sheet is None or sheet_rows == EXCEL_MAX_ROWS:
+                    sheet = workbook.create_sheet(f"Results {len(workbook.worksheets) + 1}")
+                    sheet.append(columns)
+                    sheet_rows = 1
+                sheet.append(list(row))
+                sheet_rows += 1
+        if sheet is None:
+            workbook.create_sheet("Results 1").append(columns)
+        workbook.save(self.filename)
+
+# Snapshot writes run one at a time, after the frames they save are complete
+SNAPSHOT_POOL = QThreadPool()
+SNAPSHOT_POOL.setMaxThreadCount(1)
+
+class SnapshotTask(QRunnable):
+    """Write the loaded frames to the local snapshot off the GUI thread"""
+    
+    def __init__(self, snapshot, frames, stamp):
+        super().__init__()
+        self.snapshot = snapshot
+        self.frames = frames
+        self.stamp = stamp
+        
+    def run(self):
+        self.snapshot.save(self.frames, snapshot_schema(), self.stamp)
+
+class RefreshWorker(QThread):
+    """Probe the warehouse for changes and fetch the rows appended since the last load
+    
+    changed carries the new warehouse version and table marks with the new
+    rows of each table, or reload=True when the change is not a plain append
+    (deleted or reloaded rows) and everything must be read again.
+    """
+    
+    changed = pyqtSignal(object)
+    unchanged = pyqtSignal()
+    failed = pyqtSignal(str)
+    
+    def __init__(self, version, marks, fact_key, parent=None):
+        super().__init__(parent)
+        self.version = version
+        self.marks = marks
+        self.fact_key = fact_key
+        
+    def run(self):
+        conn = get_db_connection()
+        if conn is None:
+            self.failed.emit("Could not connect to database")
+            return
+        
+        try:
+            version = warehouse_version(conn)
+            if version == self.version:
+                self.unchanged.emit()
+                return
+            if self.marks is None:
+                self.changed.emit({'version': version, 'reload': True})
+                return
+            
+            marks = table_marks(conn, self.fact_key)
+            update = {'version': version, 'marks': marks, 'reload': False}
+            for table, key in refresh_keys(self.fact_key).items():
+                (loaded, last_key), (count, new_key) = self.marks[table], marks[table]
+                rows = read_table(conn, table, f'{key} > ? AND {key} <= ?', [int(last_key), int(new_key)])
+                # Anything but new rows on top of the loaded ones needs a full reload
+                if loaded + len(rows) != count:
+                    self.changed.emit({'version': version, 'reload': True})
+                    return
+                update[table] = rows
+            
+            # Calendar rows of the new orders
+            orders = update['FactOrders']
+            if not orders.empty:
+                update['DimDate'] = read_table(conn, 'DimDate', 'DateKey BETWEEN ? AND ?',
+                                               [int(orders['OrderDateKey'].min()), int(orders['OrderDateKey'].max())])
+            self.changed.emit(update)
+        except Exception as e:
+            self.failed.emit(str(e))
+        finally:
+            conn.close()
+
+# Unique keys of the warehouse tables, the only columns pages are sought on
+TABLE_KEYS = {'factorders': FACT_KEY_COLUMNS, 'dimcustomer': ['CustomerKey'],
+              'dimemployee': ['EmployeeKey'], 'dimdate': ['DateKey']}
+
+# A plain select from one table, the only query shape whose rows a table key identifies
+SINGLE_TABLE_QUERY = re.compile(r"\s*SELECT\s+(?!DISTINCT\b|TOP\b).+?\s+FROM\s+(?:\[?\w+\]?\.)?\[?(\w+)\]?"
+                                r"(?:\s+(?:AS\s+)?(?!WHERE\b)\w+)?(?:\s+WHERE\b.*)?\s*", re.IGNORECASE | re.DOTALL)
+MULTI_ROW_CLAUSES = re.compile(r"\b(?:JOIN|GROUP|HAVING|UNION|EXCEPT|INTERSECT|ORDER)\b", re.IGNORECASE)
+
+def top_level_sql(query):
+    """Query text without its string literals, comments and parenthesized parts"""
+    text = re.sub(r"'(?:[^']|'')*'", "''", query)
+    text = re.sub(r"--[^\n]*|/\*.*?\*/", " ", text, flags=re.DOTALL)
+    previous = None
+    while previous != text:
+        previous, text = text, re.sub(r"\([^()]*\)", "()", text)
+    return text
+
+def keyset_key(query, columns):
+    """Unique key to seek pages on: the key of the single warehouse table the
+    query reads, when the query returns it once, None otherwise"""
+    text = top_level_sql(query)
+    match = SINGLE_TABLE_QUERY.fullmatch(text)
+    if match is None or MULTI_ROW_CLAUSES.search(text) or ',' in text[match.start(1):]:
+        return None
+    return next((col for col in TABLE_KEYS.get(match.group(1).lower(), []) if columns.count(col) == 1), None)
+
+def page_plan(query, describe):
+    """How a query is paged: ('keyset', key) seeks past the last key of the
+    previous page, ('ordered', None) keeps the query's own ORDER BY and
+    ('offset', column count) orders on every column, both skip by OFFSET
+    
+    describe returns the columns of a query. Queries the pager cannot wrap
+    raise ValueError.
+    """
+    query = query.strip().rstrip(';')
+    text = top_level_sql(query)
+    if not re.match(r"\s*(?:SELECT|WITH)\b", text, re.IGNORECASE):
+        raise ValueError("Only SELECT queries can be browsed page by page")
+    with_clause = re.match(r"\s*WITH\b", text, re.IGNORECASE)
+    ordered = re.search(r"\bORDER\s+BY\b", text, re.IGNORECASE)
+    top = re.match(r"\s*SELECT\s+(?:DISTINCT\s+)?TOP\b", text, re.IGNORECASE)
+    # A WITH clause, or an ORDER BY without TOP, cannot go in a subquery
+    if ordered and (with_clause or not top):
+        return ('ordered', None)
+    if with_clause:
+        raise ValueError("Add an ORDER BY to browse a WITH query page by page")
+    columns = describe(f"SELECT * FROM ({query}) AS page_src WHERE 1 = 0")
+    key = keyset_key(query, columns)
+    if key is not None:
+        return ('keyset', key)
+    return ('offset', len(columns))
+
+def paged_query(query, rows, plan, start=None):
+    """SQL and parameters of the page starting after key or at row offset start
+    
+    Keyset pages seek past the last key of the previous page, so the server
+    never skips rows the way OFFSET does. Other queries are ordered on every
+    column, so each row has one place among the pages even with duplicates.
+    """
+    query = query.strip().rstrip(';')
+    mode, value = plan
+    if mode == 'keyset':
+        key = 'page_src.[' + value.replace(']', ']]') + ']'
+        if start is None:
+            return WAREHOUSE.limit(f"SELECT * FROM ({query}) AS page_src ORDER BY {key}", rows), []
+        return WAREHOUSE.limit(f"SELECT * FROM ({query}) AS page_src WHERE {key} > ? ORDER BY {key}", rows), [start]
+    if mode == 'offset':
+        order = ', '.join(str(position) for position in range(1, value + 1))
+        query = f"SELECT * FROM ({query}) AS page_src ORDER BY {order}"
+    return WAREHOUSE.offset(query, rows), [start or 0]
+
+def plain_labels(df):
+    """Turn categorical label columns of a chart-ready frame back into plain text"""
+    for col in df.columns:
+        if isinstance(df[col].dtype, pd.CategoricalDtype):
+            df[col] = df[col].astype(object)
+    return df
+
 class DataWarehouseDashboard(QMainWindow):
-    def __init__(self):
+    def __init__(self, server_aggregation=False, auto_refresh=0, snapshot=True, extract_dir=None):
         super().__init__()
+        # In server-side aggregation mode every widget queries the warehouse
+        # for its chart-ready rows instead of grouping FactOrders locally
+        self.server_aggregation = server_aggregation
+        self.agg_conn = None
+        self.use_agg_tables = False
+        self.agg_months = None
+        
+        # Chart-ready frames keyed by widget, filter state and data version
+        self.agg_cache = AggregationCache(AGG_CACHE_MAX_BYTES)
+        self.data_version = 0
+        
+        # Cross-filter applied to every tab: attribute -> values to keep
+        self.selection = {}
+        self.selection_rollup = None
+        
+        # Running explorer query and the rows it fetched since the last repaint
+        self.query_worker = None
+        self.pending_chunks = []
+        
+        # Explorer results on disk, valid until the warehouse data changes
+        self.query_cache = QueryResultCache()
+        
+        # Last explorer query, exports run it again into the file
+        self.last_query = None
+        self.export_worker = None
+        
+        # Paged explorer query, pages are fetched one at a time by page_worker
+        self.page_worker = None
+        
+        # Cancelled workers whose thread may still be blocked in the driver,
+        # kept until it ends so that closing the window can wait for them
+        self.stopping_workers = []
+        self.page_generation = 0
+        self.page_cache = {}
+        self.page_number = 0
+        
+        # Auto-refresh: every auto_refresh seconds a change probe runs and the
+        # rows the ETL appended since the last load are folded in
+        self.auto_refresh = auto_refresh
+        self.refresh_worker = None
+        self.refresh_version = None
+        self.refresh_marks = None
+        self.fact_key = None
+        
+        # Frames of the last load kept on disk, the next start renders from them
+        # and then checks the warehouse in the background
+        self.snapshot = TableSnapshot() if snapshot and not (server_aggregation or extract_dir) else None
+        self.verifying_snapshot = False
+        
+        # Offline mode: the tables come from the ETL extract files, not the warehouse
+        self.extract_dir = extract_dir
         self.initUI()
-        self.load_data()
+        if not self.load_snapshot():
+            self.load_data()
+        
+        self.refresh_timer = QTimer(self)
+        self.refresh_timer.timeout.connect(self.check_for_changes)
+        if auto_refresh:
+            self.refresh_timer.start(auto_refresh * 1000)
+        if self.verifying_snapshot:
+            QTimer.singleShot(0, self.check_for_changes)
         
     def initUI(self):
         """Initialize the user interface"""
@@ -54,6 +1170,9 @@ class DataWarehouseDashboard(QMainWindow):
         content_layout.setContentsMargins(15, 15, 15, 15)
         content_layout.setSpacing(15)
         
+        # Cross-filters shared by the tabs
+        self.create_filter_bar(content_layout)
+        
         # Create tab widget
         self.tab_widget = QTabWidget()
         self.tab_widget.setDocumentMode(True)
@@ -67,7 +1186,21 @@ class DataWarehouseDashboard(QMainWindow):
         self.create_time_analysis_tab()
         self.create_data_explorer_tab()
         
+        # Tabs are rendered when shown, stale ones are redrawn on their next activation
+        self.tab_updaters = {
+            self.overview_tab: self.update_overview,
+            self.sales_tab: self.update_sales_tab,
+            self.customers_tab: self.update_customers_tab,
+            self.employees_tab: self.update_employees_tab,
+            self.time_tab: self.update_time_analysis,
+        }
+        self.dirty_tabs = set()
+        self.tab_widget.currentChanged.connect(self.render_current_tab)
+        
         main_layout.addWidget(content_widget)
+        for canvas in self.findChildren(AsyncCanvas):
+            canvas.failed.connect(
+                lambda message: self.statusBar().showMessage(f'⚠️ Could not draw a chart: {message}'))
         
         # Status bar
         self.statusBar().showMessage('Ready')
@@ -158,6 +1291,27 @@ class DataWarehouseDashboard(QMainWindow):
         self.timer.timeout.connect(self.update_time)
         self.timer.start(60000)  # Update every minute
         
+    def create_filter_bar(self, parent_layout):
+        """Create the bar listing the cross-filters set by clicking chart items"""
+        self.filter_bar = QFrame()
+        self.filter_bar.setFrameShape(QFrame.StyledPanel)
+        filter_layout = QHBoxLayout(self.filter_bar)
+        filter_layout.setContentsMargins(15, 5, 15, 5)
+        
+        filter_layout.addWidget(QLabel("🔎 Filtering all tabs by"))
+        self.selection_label = QLabel()
+        self.selection_label.setStyleSheet("font-weight: 600; color: #2c3e50;")
+        filter_layout.addWidget(self.selection_label)
+        filter_layout.addStretch()
+        
+        clear_selection_btn = QPushButton("Clear Filters")
+        clear_selection_btn.clicked.connect(self.clear_selection)
+        filter_layout.addWidget(clear_selection_btn)
+        
+        # Shown while a filter is set
+        self.filter_bar.hide()
+        parent_layout.addWidget(self.filter_bar)
+        
     def update_time(self):
         """Update time display"""
         current_time = datetime.now()
@@ -240,7 +1394,7 @@ class DataWarehouseDashboard(QMainWindow):
             }
             
             /* Table styling */
-            QTableWidget {
+            QTableView {
                 background-color: white;
                 border: 1px solid #dee2e6;
                 border-radius: 4px;
@@ -249,13 +1403,13 @@ class DataWarehouseDashboard(QMainWindow):
                 font-size: 11px;
             }
             
-            QTableWidget::item {
+            QTableView::item {
                 padding: 6px;
                 border-right: 1px solid #e9ecef;
                 border-bottom: 1px solid #e9ecef;
             }
             
-            QTableWidget::item:selected {
+            QTableView::item:selected {
                 background-color: #3498db;
                 color: white;
             }
@@ -368,39 +1522,568 @@ class DataWarehouseDashboard(QMainWindow):
         
    
     def load_data(self):
-        """Load all data from database"""
+        """Load the columns listed in TAB_COLUMNS from database"""
+        if self.extract_dir:
+            self.load_extract()
+            return
         try:
             conn = get_db_connection()
             if conn:
-                # Load fact orders
-                self.orders_df = pd.read_sql("SELECT * FROM FactOrders", conn)
-                self.orders_df['OrderDate'] = pd.to_datetime(self.orders_df['OrderDate'])
+                # Probe before reading, rows appended meanwhile are fetched again and force a reload
+                if self.auto_refresh or self.snapshot is not None:
+                    self.probe_warehouse(conn)
                 
                 # Load customers
-                self.customers_df = pd.read_sql("SELECT * FROM DimCustomer", conn)
-                
+                self.customers_df = read_table(conn, 'DimCustomer')
+
                 # Load employees
-                self.employees_df = pd.read_sql("SELECT * FROM DimEmployee", conn)
-                
-                # Load date dimension
-                self.dates_df = pd.read_sql("SELECT * FROM DimDate", conn)
-                self.dates_df['Date'] = pd.to_datetime(self.dates_df['Date'])
-                
+                self.employees_df = read_table(conn, 'DimEmployee')
+
+                # Key -> attribute maps shared by every tab
+                self.build_lookup_indexes()
+
+                # Cached aggregates belong to the previous load
+                self.data_version += 1
+                self.agg_cache.clear()
+
+                if self.server_aggregation:
+                    # Facts stay in the warehouse, widgets query their aggregates
+                    self.use_agg_tables = has_agg_tables(conn)
+                    self.agg_months = None
+                    spending = read_columnar(conn, CUSTOMER_SPENDING_QUERY,
+                                             connection_string=WAREHOUSE.connection_string())
+                    self.customer_segments = spending_segments(
+                        spending.set_index('CustomerKey')['TotalAmount'].astype('float64'))
+                    conn.close()
+                    self.statusBar().showMessage('✅ Dimensions loaded (server-side aggregation)')
+                    self.update_all_tabs()
+                    return
+
+                # Load fact orders
+                orders_df = read_table(conn, 'FactOrders')
+
+                # Load date dimension, limited to the dates the facts cover
+                if not orders_df.empty:
+                    date_range = [int(orders_df['OrderDateKey'].min()),
+                                  int(orders_df['OrderDateKey'].max())]
+                    self.dates_df = read_table(conn, 'DimDate', 'DateKey BETWEEN ? AND ?', date_range)
+                else:
+                    self.dates_df = read_table(conn, 'DimDate', '1 = 0')
+
                 conn.close()
+                
+                # Join once per load, every tab slices this frame
+                self.analysis_df = self.build_analysis_frame(orders_df)
+                self.build_aggregates()
+                if self.refresh_marks is not None:
+                    self.refresh_marks = {'FactOrders': (len(orders_df), self.refresh_marks['FactOrders'][1]),
+                                          'DimCustomer': (len(self.customers_df), self.refresh_marks['DimCustomer'][1]),
+                                          'DimEmployee': (len(self.employees_df), self.refresh_marks['DimEmployee'][1])}
+                self.save_snapshot()
                 self.statusBar().showMessage('✅ Data loaded successfully')
                 
                 # Update all tabs with data
-                self.update_overview()
-                self.update_sales_tab()
-                self.update_customers_tab()
-                self.update_employees_tab()
-                self.update_time_analysis()
+                self.update_all_tabs()
                 
             else:
                 self.statusBar().showMessage('❌ Failed to connect to database')
                 
         except Exception as e:
             self.statusBar().showMessage(f'⚠️ Error loading data: {str(e)}')
+
+    def load_extract(self):
+        """Load the columns listed in TAB_COLUMNS from the extract files, without a database"""
+        try:
+            self.customers_df = read_extract_table(self.extract_dir, 'DimCustomer')
+            self.employees_df = read_extract_table(self.extract_dir, 'DimEmployee')
+            self.build_lookup_indexes()
+            self.data_version += 1
+            self.agg_cache.clear()
+            
+            orders_df = read_extract_table(self.extract_dir, 'FactOrders')
+            
+            # Same date range as the warehouse load reads
+            dates_df = read_extract_table(self.extract_dir, 'DimDate')
+            if not orders_df.empty:
+                dates_df = dates_df[dates_df['DateKey'].between(orders_df['OrderDateKey'].min(),
+                                                                orders_df['OrderDateKey'].max())]
+            else:
+                dates_df = dates_df.iloc[:0]
+            self.dates_df = dates_df.reset_index(drop=True)
+            
+            self.analysis_df = self.build_analysis_frame(orders_df)
+            self.build_aggregates()
+            self.statusBar().showMessage(f'✅ Data loaded from extract {self.extract_dir}')
+            self.update_all_tabs()
+            
+        except Exception as e:
+            self.statusBar().showMessage(f'⚠️ Error loading extract: {str(e)}')
+
+    def build_lookup_indexes(self):
+        """Index customer and employee attributes by their surrogate keys"""
+        customers = self.customers_df.drop_duplicates('CustomerKey').set_index('CustomerKey')
+        self.customer_names = customers['CompanyName']
+        self.customer_countries = customers['Country']
+        
+        employees = self.employees_df.drop_duplicates('EmployeeKey').set_index('EmployeeKey')
+        self.employee_names = employees['FirstName'] + ' ' + employees['LastName']
+        self.employee_titles = employees['Title']
+
+    def load_snapshot(self):
+        """Render from the local snapshot of the last load, False when there is none to use"""
+        if self.snapshot is None:
+            return False
+        snapshot = self.snapshot.load(snapshot_schema())
+        if snapshot is None:
+            return False
+        frames, stamp = snapshot
+        self.customers_df, self.employees_df = frames['customers'], frames['employees']
+        self.dates_df, self.analysis_df = frames['dates'], frames['orders']
+        self.build_lookup_indexes()
+        self.data_version += 1
+        self.agg_cache.clear()
+        self.build_aggregates()
+        
+        # The warehouse state the snapshot was read at, the background check starts from it
+        self.refresh_version, self.fact_key, self.refresh_marks = stamp['version'], stamp['fact_key'], stamp['marks']
+        self.verifying_snapshot = True
+        self.statusBar().showMessage('📦 Data loaded from local snapshot, checking the warehouse for changes...')
+        self.update_all_tabs()
+        return True
+
+    def save_snapshot(self):
+        """Write the loaded frames to the local snapshot in the background"""
+        if self.snapshot is None or self.refresh_version is None:
+            return
+        frames = {'customers': self.customers_df, 'employees': self.employees_df,
+                  'dates': self.dates_df, 'orders': self.analysis_df}
+        stamp = {'version': self.refresh_version, 'fact_key': self.fact_key, 'marks': self.refresh_marks}
+        SNAPSHOT_POOL.start(SnapshotTask(self.snapshot, frames, stamp))
+
+    def build_aggregates(self):
+        """Time rollup, OLAP cube and row indexes of analysis_df"""
+        self.time_rollup = TimeRollup(self.analysis_df)
+        self.cube = OlapCube(self.with_titles(self.analysis_df))
+        self.build_row_indexes()
+
+    def with_titles(self, orders):
+        """Orders with their employee's title, a dimension of the cube"""
+        return orders.assign(Title=orders['EmployeeKey'].map(self.employee_titles))
+
+    def build_row_indexes(self):
+        """Date array, customer segments and bitmaps over the rows of analysis_df"""
+        self.order_dates = self.analysis_df['OrderDate'].to_numpy(dtype='datetime64[ns]')
+        self.customer_segments = self.compute_customer_segments()
+        self.cross_filter = CrossFilter(self.analysis_df.assign(
+            Segment=self.analysis_df['CustomerKey'].map(self.customer_segments)))
+
+    def probe_warehouse(self, conn):
+        """Record the warehouse version and table marks the loaded data starts from"""
+        try:
+            self.refresh_version = warehouse_version(conn)
+            self.fact_key = None if self.server_aggregation else fact_key_column(conn)
+            self.refresh_marks = table_marks(conn, self.fact_key) if self.fact_key else None
+        except DatabaseError:
+            # Without marks every change reloads in full
+            self.refresh_version = None
+            self.refresh_marks = None
+
+    def check_for_changes(self):
+        """Start a change probe, unless the previous one is still running"""
+        if self.refresh_worker is not None:
+            return
+        self.refresh_worker = RefreshWorker(self.refresh_version, self.refresh_marks, self.fact_key, self)
+        self.refresh_worker.changed.connect(self.apply_refresh)
+        self.refresh_worker.unchanged.connect(self.on_warehouse_unchanged)
+        self.refresh_worker.failed.connect(
+            lambda message: self.statusBar().showMessage(f'⚠️ Could not check the warehouse for changes: {message}'))
+        self.refresh_worker.finished.connect(self.on_refresh_finished)
+        self.refresh_worker.start()
+
+    def on_refresh_finished(self):
+        """Release the finished change probe"""
+        self.refresh_worker.deleteLater()
+        self.refresh_worker = None
+        self.verifying_snapshot = False
+
+    def on_warehouse_unchanged(self):
+        """Confirm a snapshot start once the warehouse turned out unchanged"""
+        if self.verifying_snapshot:
+            self.statusBar().showMessage('✅ Data loaded from local snapshot, the warehouse has not changed')
+
+    def apply_refresh(self, update):
+        """Fold the rows a change probe fetched, or reload when they can't be folded"""
+        if update['reload'] or self.server_aggregation or not self.has_data():
+            self.load_data()
+            return
+        self.fold_new_rows(update)
+        self.refresh_version = update['version']
+        self.refresh_marks = update['marks']
+        self.save_snapshot()
+
+    def fold_new_rows(self, update):
+        """Add appended facts and dimension members to the in-memory frames and aggregates"""
+        customers, employees, orders = update['DimCustomer'], update['DimEmployee'], update['FactOrders']
+        if not customers.empty or not employees.empty:
+            self.customers_df = pd.concat([self.customers_df, customers], ignore_index=True)
+            self.employees_df = pd.concat([self.employees_df, employees], ignore_index=True)
+            self.build_lookup_indexes()
+            self.extend_combo(self.country_combo, customers['Country'].dropna().unique())
+            self.extend_combo(self.customer_country_combo, customers['Country'].dropna().unique())
+        
+        if not orders.empty:
+            self.dates_df = pd.concat([self.dates_df, update['DimDate']], ignore_index=True).drop_duplicates('DateKey')
+            new_rows = self.build_analysis_frame(orders)
+            
+            # Aggregates absorb the new rows, row indexes are rebuilt for the merged frame
+            self.cube.add(self.with_titles(new_rows))
+            self.time_rollup.add(new_rows)
+            self.analysis_df = self.merge_sorted_orders(new_rows)
+            self.build_row_indexes()
+            self.extend_combo(self.year_combo, [str(year) for year in sorted(new_rows['Year'].dropna().unique())])
+        
+        self.data_version += 1
+        self.agg_cache.clear()
+        self.statusBar().showMessage(
+            f"🔄 {len(orders):,} new orders loaded at {datetime.now().strftime('%I:%M %p')}")
+        self.update_all_tabs()
+
+    def merge_sorted_orders(self, new_rows):
+        """analysis_df with date-sorted new rows inserted after the orders of the same date"""
+        old_count = len(self.analysis_df)
+        positions = np.searchsorted(self.order_dates, new_rows['OrderDate'].to_numpy(dtype='datetime64[ns]'),
+                                    side='right') + np.arange(len(new_rows))
+        is_new = np.zeros(old_count + len(new_rows), dtype=bool)
+        is_new[positions] = True
+        order = np.empty(len(is_new), dtype=np.int64)
+        order[is_new] = old_count + np.arange(len(new_rows))
+        order[~is_new] = np.arange(old_count)
+        
+        merged = pd.concat([self.analysis_df, new_rows], ignore_index=True).take(order).reset_index(drop=True)
+        # Categories differing between the two frames fall back to object
+        for col in ANALYSIS_CATEGORIES:
+            merged[col] = merged[col].astype('category')
+        return merged
+
+    def extend_combo(self, combo, values):
+        """Add new values to a filter combo once it has been filled"""
+        if combo.count() > 1:
+            existing = {combo.itemText(i) for i in range(combo.count())}
+            combo.addItems([value for value in values if value not in existing])
+
+    def compute_customer_segments(self):
+        """Spending segment of each customer with orders"""
+        return spending_segments(self.cube.roll_up(['CustomerKey']).set_index('CustomerKey')['TotalAmount'])
+
+    def toggle_selection(self, **values):
+        """Filter every tab on a clicked chart item, clicking it again removes the filter"""
+        if self.server_aggregation:
+            self.statusBar().showMessage('ℹ️ Cross-filtering needs the order facts, it is off with server-side aggregation')
+            return
+        clicked = {attr: (value,) for attr, value in values.items()}
+        if all(self.selection.get(attr) == value for attr, value in clicked.items()):
+            for attr in clicked:
+                del self.selection[attr]
+        else:
+            self.selection.update(clicked)
+        self.show_selection()
+        self.update_all_tabs()
+
+    def clear_selection(self):
+        """Remove every cross-filter"""
+        if self.selection:
+            self.selection = {}
+            self.show_selection()
+            self.update_all_tabs()
+
+    def show_selection(self):
+        """List the cross-filters in the filter bar, hidden when there are none"""
+        parts = []
+        for attr, values in self.selection.items():
+            if attr == 'EmployeeKey':
+                attr, values = 'Employee', [self.employee_names.get(value, value) for value in values]
+            parts.append(f"{attr}: {', '.join(str(value) for value in values)}")
+        self.selection_label.setText('   •   '.join(parts))
+        self.filter_bar.setVisible(bool(parts))
+
+    def selection_key(self):
+        """Hashable form of the cross-filter, part of the widget cache keys"""
+        return tuple(sorted(self.selection.items()))
+
+    def selected_cube(self):
+        """The order cube diced to the cross-filter, segments become their customers"""
+        filters = {attr: list(values) for attr, values in self.selection.items() if attr != 'Segment'}
+        if 'Segment' in self.selection:
+            segments = self.customer_segments
+            filters['CustomerKey'] = list(segments.index[segments.isin(self.selection['Segment'])])
+        return self.cube.dice(**filters) if filters else self.cube
+
+    def selected_orders(self):
+        """Rows of analysis_df matching the cross-filter"""
+        if not self.selection:
+            return self.analysis_df
+        return self.analysis_df.iloc[self.cross_filter.rows(self.selection)]
+
+    def selected_time_rollup(self):
+        """Time rollup of the cross-filtered orders, built once per selection"""
+        if not self.selection:
+            return self.time_rollup
+        key = (self.data_version, self.selection_key())
+        if self.selection_rollup is None or self.selection_rollup[0] != key:
+            self.selection_rollup = (key, TimeRollup(self.selected_orders()))
+        return self.selection_rollup[1]
+
+    def update_all_tabs(self):
+        """Mark every dashboard tab stale and render the visible one"""
+        self.dirty_tabs = set(self.tab_updaters)
+        self.render_current_tab()
+
+    def render_current_tab(self):
+        """Render the visible tab if new data arrived since it was last drawn"""
+        tab = self.tab_widget.currentWidget()
+        if tab in self.dirty_tabs:
+            self.dirty_tabs.discard(tab)
+            self.tab_updaters[tab]()
+
+    def has_data(self):
+        """Return True once the data the widgets aggregate is available"""
+        if self.server_aggregation:
+            return hasattr(self, 'customers_df')
+        return hasattr(self, 'analysis_df')
+
+    def get_widget_data(self, widget, *params):
+        """Return the chart-ready rows of a widget for the given filters
+        
+        Results are memoized per filter state and data version, callers must
+        not modify the returned frame in place.
+        """
+        key = (widget,) + params + (self.data_version, self.selection_key())
+        df = self.agg_cache.get(key)
+        if df is None:
+            if self.server_aggregation:
+                df = self.query_aggregate(widget, *params)
+            else:
+                df = plain_labels(getattr(self, f'compute_{widget}')(*params))
+            self.agg_cache.put(key, df)
+        return df
+
+    def query_aggregate(self, widget, *params):
+        """Run the aggregate query of a widget on the warehouse"""
+        if self.agg_conn is None:
+            self.agg_conn = get_db_connection()
+            if self.agg_conn is None:
+                raise ConnectionError('Could not connect to database')
+        sql, sql_params = self.agg_table_query(widget, *params) or self.build_aggregate_query(widget, *params)
+        df = read_columnar(self.agg_conn, sql, sql_params, connection_string=WAREHOUSE.connection_string())
+        
+        for col in AGGREGATE_MEASURES:
+            if col in df.columns:
+                df[col] = df[col].astype('float64')
+        for col in ['Date', 'OrderDate']:
+            if col in df.columns:
+                df[col] = pd.to_datetime(df[col])
+        
+        if widget == 'customer_summary':
+            df = self.filter_segment(df, params[2])
+        return df
+
+    def agg_table_query(self, widget, *params):
+        """SQL and parameters reading a summary table for the widget, or None if the filters need the facts"""
+        if not self.use_agg_tables or widget not in AGG_TABLE_QUERIES:
+            return None
+        if widget == 'country_sales':
+            start_date, end_date, country = params
+            if country or not self.covers_all_months(start_date, end_date):
+                return None
+        return limit_rows(widget, AGG_TABLE_QUERIES[widget], params), []
+
+    def covers_all_months(self, start_date, end_date):
+        """Return True if the date range contains every month of the loaded orders"""
+        if self.agg_months is None:
+            cursor = self.agg_conn.cursor()
+            self.agg_months = tuple(cursor.execute(AGG_MONTHS_QUERY).fetchone())
+            cursor.close()
+        first, last = self.agg_months
+        if first is None:
+            return True
+        first_day = pd.Timestamp(year=first // 100, month=first % 100, day=1)
+        last_day = pd.Timestamp(year=last // 100, month=last % 100, day=1) + pd.offsets.MonthEnd(0)
+        return pd.Timestamp(start_date) <= first_day and pd.Timestamp(end_date) >= last_day
+
+    def build_aggregate_query(self, widget, *params):
+        """Build the SQL text and parameters of a widget aggregate query"""
+        conditions = []
+        sql_params = []
+        query_name = widget
+        
+        if widget in ('country_sales', 'daily_sales', 'sales_rows'):
+            start_date, end_date, country = params[:3]
+            conditions.append('f.OrderDate BETWEEN ? AND ?')
+            sql_params += [start_date, end_date]
+            if widget == 'country_sales':
+                conditions.append('c.Country IS NOT NULL')
+            if country:
+                conditions.append('c.Country = ?')
+                sql_params.append(country)
+                
+        elif widget == 'customer_summary':
+            country, min_orders = params[:2]
+            if country:
+                conditions.append('c.Country = ?')
+                sql_params.append(country)
+            sql_params.append(min_orders)  # HAVING COUNT(...) >= ?
+            
+        elif widget in ('time_series', 'day_of_week'):
+            year = params[-1]
+            if widget == 'time_series':
+                query_name = f'time_series_{params[0]}'
+            if year:
+                conditions.append('d.Year = ?')
+                sql_params.append(year)
+        
+        where = ' AND '.join(conditions) if conditions else '1 = 1'
+        sql = AGGREGATE_QUERIES[query_name].format(where=where, week_start=WAREHOUSE.week_start('d.Date'))
+        return limit_rows(widget, sql, params), sql_params
+
+    def closeEvent(self, event):
+        """Close the aggregate query connection with the window"""
+        self.refresh_timer.stop()
+        for worker in (self.query_worker, self.page_worker, self.export_worker):
+            if worker is not None:
+                worker.cancel()
+                worker.wait()
+        for worker in self.stopping_workers:
+            worker.wait()
+        if self.refresh_worker is not None:
+            self.refresh_worker.wait()
+        SNAPSHOT_POOL.waitForDone()
+        RENDER_POOL.waitForDone()
+        if self.agg_conn is not None:
+            self.agg_conn.close()
+            self.agg_conn = None
+        super().closeEvent(event)
+
+    def build_analysis_frame(self, orders_df):
+        """Denormalize facts with the date, customer and employee attributes the tabs use"""
+        df = orders_df.merge(
+            self.dates_df[['DateKey', 'Date', 'Year', 'Quarter', 'Month', 'MonthName', 'DayOfWeek']],
+            left_on='OrderDateKey',
+            right_on='DateKey',
+            how='left'
+        ).drop(columns='DateKey')
+        
+        df['CompanyName'] = df['CustomerKey'].map(self.customer_names)
+        df['Country'] = df['CustomerKey'].map(self.customer_countries)
+        df['EmployeeName'] = df['EmployeeKey'].map(self.employee_names)
+        
+        # Low-cardinality labels are stored once per distinct value
+        for col in ANALYSIS_CATEGORIES:
+            df[col] = df[col].astype('category')
+        
+        # Sorted by date, so date ranges are contiguous row slices
+        return df.sort_values('OrderDate', kind='stable', ignore_index=True)
+
+    def order_date_range(self, start_date, end_date):
+        """Positions [start, stop) of the orders dated from start_date to end_date, by binary search"""
+        start = np.searchsorted(self.order_dates, np.datetime64(start_date), side='left')
+        stop = np.searchsorted(self.order_dates, np.datetime64(end_date), side='right')
+        return start, stop
+
+    # Client-side counterparts of AGGREGATE_QUERIES, computed from analysis_df
+    def compute_overview_kpis(self):
+        """Order count, revenue, average order and deliveries"""
+        totals = self.selected_cube().roll_up().iloc[0]
+        return pd.DataFrame([{
+            'TotalOrders': totals['OrderCount'],
+            'TotalRevenue': totals['TotalAmount'],
+            'AvgOrder': totals['TotalAmount'] / totals['OrderCount'] if totals['OrderCount'] else np.nan,
+            'DeliveredOrders': totals['DeliveredCount']
+        }])
+
+    def compute_monthly_revenue(self):
+        """Revenue per calendar month"""
+        monthly_revenue = self.selected_cube().roll_up(['Year', 'Month'])[['Year', 'Month', 'TotalAmount']]
+        month_names = self.dates_df.drop_duplicates('Month').set_index('Month')['MonthName']
+        monthly_revenue.insert(2, 'MonthName', monthly_revenue['Month'].map(month_names))
+        return monthly_revenue
+
+    def compute_top_customers(self, n):
+        """The n customers with the highest revenue"""
+        top_customers = self.selected_cube().top('CustomerKey', n)[['CustomerKey', 'TotalAmount']]
+        top_customers.insert(1, 'CompanyName', top_customers['CustomerKey'].map(self.customer_names))
+        return top_customers
+
+    def filter_sales_orders(self, start_date, end_date, country):
+        """Cross-filtered orders in the date range, optionally restricted to one country"""
+        start, stop = self.order_date_range(start_date, end_date)
+        if not self.selection and not country:
+            return self.analysis_df.iloc[start:stop]
+        
+        # Matching rows are ascending positions, the date range cuts a slice of them
+        rows = self.cross_filter.rows(self.selection, {'Country': [country]} if country else {})
+        return self.analysis_df.iloc[rows[np.searchsorted(rows, start):np.searchsorted(rows, stop)]]
+
+    def compute_country_sales(self, start_date, end_date, country):
+        """Top 10 countries by revenue among the filtered orders"""
+        df = self.filter_sales_orders(start_date, end_date, country)
+        country_sales = df.groupby('Country', observed=True)['TotalAmount'].sum().reset_index()
+        return country_sales.sort_values('TotalAmount', ascending=False).head(10)
+
+    def compute_daily_sales(self, start_date, end_date, country):
+        """Revenue per day among the filtered orders"""
+        df = self.filter_sales_orders(start_date, end_date, country)
+        daily_sales = df.groupby('OrderDate')['TotalAmount'].sum().reset_index()
+        daily_sales.columns = ['Date', 'Revenue']
+        return daily_sales.sort_values('Date')
+
+    def compute_sales_rows(self, start_date, end_date, country, limit):
+        """First filtered orders by OrderID, as the server query lists them"""
+        return self.filter_sales_orders(start_date, end_date, country).nsmallest(limit, 'OrderID')
+
+    def compute_customer_summary(self, country, min_orders, segment):
+        """Order count and spending per customer"""
+        customer_orders = self.selected_cube().roll_up(['CustomerKey'])[['CustomerKey', 'OrderCount', 'TotalAmount']]
+        customer_orders.columns = ['CustomerKey', 'OrderCount', 'TotalSpent']
+        
+        # Merge with customer data
+        customers_full = self.customers_df.merge(
+            customer_orders,
+            on='CustomerKey',
+            how='left'
+        )
+        customers_full['OrderCount'] = customers_full['OrderCount'].fillna(0)
+        customers_full['TotalSpent'] = customers_full['TotalSpent'].fillna(0)
+        
+        if country:
+            customers_full = customers_full[customers_full['Country'] == country]
+        customers_full = customers_full[customers_full['OrderCount'] >= min_orders]
+        return self.filter_segment(customers_full, segment)
+
+    def filter_segment(self, customers, segment):
+        """Add the Segment column of the customers and keep those of a segment"""
+        # Customers without orders spend the least
+        customers = customers.assign(Segment=customers['CustomerKey'].map(self.customer_segments).fillna('Low'))
+        if segment == "All":
+            return customers
+        return customers[customers['Segment'] == segment]
+
+    def compute_employee_performance(self):
+        """Order count and revenue per employee"""
+        employee_perf = self.selected_cube().roll_up(['EmployeeKey'])[['EmployeeKey', 'OrderCount', 'TotalAmount']]
+        employee_perf.columns = ['EmployeeKey', 'OrderCount', 'TotalRevenue']
+        return self.employees_df.merge(employee_perf, on='EmployeeKey', how='left')
+
+    def compute_time_series(self, period, year):
+        """Revenue per period bucket"""
+        return self.selected_time_rollup().series(period, year)
+
+    def compute_day_of_week(self, year):
+        """Average, total and count of order revenue per weekday"""
+        return self.selected_time_rollup().day_of_week(year)
+
+    def compute_order_years(self):
+        """Years covered by the loaded orders"""
+        return pd.DataFrame({'Year': sorted(self.dates_df['Year'].dropna().unique())})
             
     def create_overview_tab(self):
         """Create Overview tab with key metrics"""
@@ -458,9 +2141,12 @@ class DataWarehouseDashboard(QMainWindow):
         """)
         revenue_layout.addWidget(revenue_label)
         
-        self.revenue_canvas = FigureCanvas(Figure(figsize=(6, 3)))
+        self.revenue_canvas = AsyncCanvas(Figure(figsize=(6, 3)))
         self.revenue_canvas.setMinimumHeight(250)
         revenue_layout.addWidget(self.revenue_canvas)
+        self.revenue_chart = self.revenue_canvas.chart(BarChart, 'Monthly Revenue Trend',
+                                                       xlabel='Month', ylabel='Revenue ($)', cmap=plt.cm.Blues)
+        self.revenue_chart.on_select(lambda month: self.toggle_selection(Year=month[0], Month=month[1]))
         
         charts_layout.addWidget(revenue_container)
         
@@ -479,9 +2165,12 @@ class DataWarehouseDashboard(QMainWindow):
         """)
         customers_layout.addWidget(customers_label)
         
-        self.customers_canvas = FigureCanvas(Figure(figsize=(6, 3)))
+        self.customers_canvas = AsyncCanvas(Figure(figsize=(6, 3)))
         self.customers_canvas.setMinimumHeight(250)
         customers_layout.addWidget(self.customers_canvas)
+        self.customers_chart = self.customers_canvas.chart(BarChart, 'Top 10 Customers by Revenue',
+                                                           xlabel='Total Revenue ($)', cmap=plt.cm.Greens,
+                                                           horizontal=True)
         
         charts_layout.addWidget(customers_container)
         
@@ -549,38 +2238,29 @@ class DataWarehouseDashboard(QMainWindow):
         
     def update_overview(self):
         """Update overview tab with data"""
-        if hasattr(self, 'orders_df'):
+        if self.has_data():
             # Calculate metrics
-            total_orders = len(self.orders_df)
-            total_revenue = self.orders_df['TotalAmount'].sum()
+            kpis = self.get_widget_data('overview_kpis').iloc[0]
+            total_orders = int(kpis['TotalOrders'])
+            total_revenue = kpis['TotalRevenue'] if pd.notna(kpis['TotalRevenue']) else 0
             total_customers = self.customers_df['CustomerID'].nunique() if hasattr(self, 'customers_df') else 0
-            avg_order = self.orders_df['TotalAmount'].mean()
-            delivered_orders = self.orders_df['IsDelivered'].sum() if 'IsDelivered' in self.orders_df.columns else 0
+            avg_order = kpis['AvgOrder'] if pd.notna(kpis['AvgOrder']) else 0
+            delivered_orders = int(kpis['DeliveredOrders']) if pd.notna(kpis['DeliveredOrders']) else 0
             pending_orders = total_orders - delivered_orders
             
             # Find top customer
-            if hasattr(self, 'orders_df') and hasattr(self, 'customers_df'):
-                customer_revenue = self.orders_df.groupby('CustomerKey')['TotalAmount'].sum()
-                if not customer_revenue.empty:
-                    top_customer_id = customer_revenue.idxmax()
-                    top_customer = self.customers_df[self.customers_df['CustomerKey'] == top_customer_id]['CompanyName'].iloc[0]
-                else:
-                    top_customer = 'N/A'
+            top_customers = self.get_widget_data('top_customers', 10)
+            if not top_customers.empty:
+                top_customer_id = top_customers['CustomerKey'].iloc[0]
+                top_customer = self.customer_names.get(top_customer_id, 'N/A')
             else:
                 top_customer = 'N/A'
             
             # Find top employee
-            if hasattr(self, 'orders_df') and hasattr(self, 'employees_df'):
-                employee_revenue = self.orders_df.groupby('EmployeeKey')['TotalAmount'].sum()
-                if not employee_revenue.empty:
-                    top_employee_id = employee_revenue.idxmax()
-                    top_employee = self.employees_df[self.employees_df['EmployeeKey'] == top_employee_id]
-                    if not top_employee.empty:
-                        top_employee_name = f"{top_employee['FirstName'].iloc[0]} {top_employee['LastName'].iloc[0]}"
-                    else:
-                        top_employee_name = 'N/A'
-                else:
-                    top_employee_name = 'N/A'
+            employee_revenue = self.get_widget_data('employee_performance').set_index('EmployeeKey')['TotalRevenue']
+            if not employee_revenue.empty and employee_revenue.max() > 0:
+                top_employee_id = employee_revenue.idxmax()
+                top_employee_name = self.employee_names.get(top_employee_id, 'N/A')
             else:
                 top_employee_name = 'N/A'
             
@@ -602,129 +2282,23 @@ class DataWarehouseDashboard(QMainWindow):
             
             # Update charts with enhanced styling
             self.update_revenue_chart()
-            self.update_top_customers_chart()
+            self.update_top_customers_chart(top_customers)
             
     def update_revenue_chart(self):
         """Update monthly revenue chart with enhanced styling"""
-        if hasattr(self, 'orders_df') and hasattr(self, 'dates_df'):
-            # Merge orders with dates
-            merged_df = self.orders_df.merge(
-                self.dates_df[['DateKey', 'Year', 'Month', 'MonthName']],
-                left_on='OrderDateKey',
-                right_on='DateKey',
-                how='left'
-            )
-            
-            # Group by month
-            monthly_revenue = merged_df.groupby(['Year', 'Month', 'MonthName'])['TotalAmount'].sum().reset_index()
-            monthly_revenue = monthly_revenue.sort_values(['Year', 'Month'])
-            monthly_revenue['Period'] = monthly_revenue['MonthName'] + ' ' + monthly_revenue['Year'].astype(str)
-            
-            # Create chart with enhanced styling
-            fig = self.revenue_canvas.figure
-            fig.clf()
-            ax = fig.add_subplot(111)
-            
-            # Use a colormap for gradient bars
-            colors = plt.cm.Blues(np.linspace(0.4, 0.8, len(monthly_revenue)))
-            bars = ax.bar(range(len(monthly_revenue)), monthly_revenue['TotalAmount'], 
-                         color=colors, edgecolor='white', linewidth=1.0)
-            
-            # Enhance chart appearance
-            ax.set_facecolor('#f8f9fa')
-            fig.patch.set_facecolor('white')
-            
-            # Customize labels and titles
-            ax.set_xlabel('Month', fontsize=10, fontweight='medium', color='#495057')
-            ax.set_ylabel('Revenue ($)', fontsize=10, fontweight='medium', color='#495057')
-            ax.set_title('Monthly Revenue Trend', fontsize=12, fontweight='bold', color='#2c3e50', pad=10)
-            
-            ax.set_xticks(range(len(monthly_revenue)))
-            ax.set_xticklabels(monthly_revenue['Period'], rotation=45, ha='right', fontsize=8)
-            
-            # Format y-axis
-            ax.yaxis.set_major_formatter(plt.FuncFormatter(lambda x, p: f'${x:,.0f}'))
-            ax.tick_params(axis='both', colors='#6c757d', labelsize=8)
-            
-            # Add grid
-            ax.grid(True, axis='y', alpha=0.2, linestyle='--', linewidth=0.5)
-            
-            # Remove top and right spines
-            ax.spines['top'].set_visible(False)
-            ax.spines['right'].set_visible(False)
-            ax.spines['left'].set_color('#dee2e6')
-            ax.spines['bottom'].set_color('#dee2e6')
-            
-            # Add value labels on bars
-            for bar in bars:
-                height = bar.get_height()
-                if height > 0:  # Only add label if height > 0
-                    ax.text(bar.get_x() + bar.get_width()/2., height + (height * 0.01),
-                           f'${height:,.0f}', ha='center', va='bottom', 
-                           fontsize=7, fontweight='medium', color='#2c3e50')
-            
-            fig.tight_layout(pad=1.0)
-            self.revenue_canvas.draw()
-            
-    def update_top_customers_chart(self):
+        if self.has_data():
+            # Revenue grouped by month
+            monthly_revenue = self.get_widget_data('monthly_revenue')
+            periods = monthly_revenue['MonthName'] + ' ' + monthly_revenue['Year'].astype(str)
+            self.revenue_chart.update(periods, monthly_revenue['TotalAmount'],
+                                      keys=list(zip(monthly_revenue['Year'], monthly_revenue['Month'])))
+            
+    def update_top_customers_chart(self, top_customers):
         """Update top customers chart with enhanced styling"""
-        if hasattr(self, 'orders_df') and hasattr(self, 'customers_df'):
-            # Merge and get top customers
-            customer_revenue = self.orders_df.groupby('CustomerKey')['TotalAmount'].sum().reset_index()
-            customer_revenue = customer_revenue.merge(
-                self.customers_df[['CustomerKey', 'CompanyName']],
-                on='CustomerKey',
-                how='left'
-            )
-            
-            top_customers = customer_revenue.nlargest(10, 'TotalAmount')
-            
-            # Create chart with enhanced styling
-            fig = self.customers_canvas.figure
-            fig.clf()
-            ax = fig.add_subplot(111)
-            
-            # Use gradient colors
-            colors = plt.cm.Greens(np.linspace(0.4, 0.8, len(top_customers)))
-            bars = ax.barh(range(len(top_customers)), top_customers['TotalAmount'], 
-                          color=colors, edgecolor='white', linewidth=1.0)
-            
-            # Enhance chart appearance
-            ax.set_facecolor('#f8f9fa')
-            fig.patch.set_facecolor('white')
-            
-            # Customize labels and titles
-            ax.set_xlabel('Total Revenue ($)', fontsize=10, fontweight='medium', color='#495057')
-            ax.set_title('Top 10 Customers by Revenue', fontsize=12, fontweight='bold', color='#2c3e50', pad=10)
-            
-            ax.set_yticks(range(len(top_customers)))
-            ax.set_yticklabels([name[:20] + ('...' if len(name) > 20 else '') 
-                               for name in top_customers['CompanyName']], fontsize=8)
-            
-            # Format x-axis
-            ax.xaxis.set_major_formatter(plt.FuncFormatter(lambda x, p: f'${x:,.0f}'))
-            ax.tick_params(axis='both', colors='#6c757d', labelsize=8)
-            
-            # Add grid
-            ax.grid(True, axis='x', alpha=0.2, linestyle='--', linewidth=0.5)
-            
-            # Remove spines
-            ax.spines['top'].set_visible(False)
-            ax.spines['right'].set_visible(False)
-            ax.spines['left'].set_color('#dee2e6')
-            ax.spines['bottom'].set_color('#dee2e6')
-            
-            # Add value labels
-            for bar in bars:
-                width = bar.get_width()
-                if width > 0:  # Only add label if width > 0
-                    ax.text(width + (width * 0.01), bar.get_y() + bar.get_height()/2.,
-                           f'${width:,.0f}', ha='left', va='center', 
-                           fontsize=7, fontweight='medium', color='#2c3e50')
-            
-            ax.invert_yaxis()  # Highest value on top
-            fig.tight_layout(pad=1.0)
-            self.customers_canvas.draw()
+        if not top_customers.empty:
+            names = [name[:20] + ('...' if len(name) > 20 else '') 
+                     for name in top_customers['CompanyName']]
+            self.customers_chart.update(names, top_customers['TotalAmount'])
             
     def create_sales_tab(self):
         """Create Sales Analytics tab"""
@@ -776,16 +2350,22 @@ class DataWarehouseDashboard(QMainWindow):
         charts_layout.setContentsMargins(10, 10, 10, 10)
         
         # Sales by country chart
-        self.country_chart_canvas = FigureCanvas(Figure(figsize=(6, 4)))
+        self.country_chart_canvas = AsyncCanvas(Figure(figsize=(6, 4)))
         self.country_chart_canvas.setMinimumWidth(400)
         self.country_chart_canvas.setMinimumHeight(300)
         charts_layout.addWidget(self.country_chart_canvas)
+        self.country_chart = self.country_chart_canvas.chart(BarChart, 'Top 10 Countries by Revenue',
+                                                             xlabel='Country', ylabel='Revenue ($)',
+                                                             cmap=plt.cm.Set3, color_range=(0, 1))
+        self.country_chart.on_select(lambda country: self.toggle_selection(Country=country))
         
         # Daily sales chart
-        self.daily_chart_canvas = FigureCanvas(Figure(figsize=(6, 4)))
+        self.daily_chart_canvas = AsyncCanvas(Figure(figsize=(6, 4)))
         self.daily_chart_canvas.setMinimumWidth(400)
         self.daily_chart_canvas.setMinimumHeight(300)
         charts_layout.addWidget(self.daily_chart_canvas)
+        self.daily_chart = self.daily_chart_canvas.chart(LineChart, 'Daily Sales Trend',
+                                                         xlabel='Date', ylabel='Revenue ($)', date_format='%m-%d')
         
         layout.addWidget(charts_frame)
         
@@ -795,10 +2375,14 @@ class DataWarehouseDashboard(QMainWindow):
         table_layout = QVBoxLayout(table_frame)
         table_layout.setContentsMargins(5, 5, 5, 5)
         
-        self.sales_table = QTableWidget()
-        self.sales_table.setColumnCount(7)
-        self.sales_table.setHorizontalHeaderLabels([
-            'Order ID', 'Date', 'Customer', 'Country', 'Amount', 'Freight', 'Status'
+        self.sales_table = self.create_frame_table([
+            ('Order ID', 'OrderID', str),
+            ('Date', 'OrderDate', format_date),
+            ('Customer', 'CompanyName', str),
+            ('Country', 'Country', str),
+            ('Amount', 'TotalAmount', format_money),
+            ('Freight', 'Freight', format_money),
+            ('Status', 'Status', str)
         ])
         table_layout.addWidget(self.sales_table)
         
@@ -806,22 +2390,16 @@ class DataWarehouseDashboard(QMainWindow):
         
     def update_sales_tab(self):
         """Update sales tab with filtered data"""
-        if hasattr(self, 'orders_df'):
+        if self.has_data():
             # Apply filters
             start_date = self.start_date_edit.date().toString('yyyy-MM-dd')
             end_date = self.end_date_edit.date().toString('yyyy-MM-dd')
             
-            filtered_df = self.orders_df[
-                (self.orders_df['OrderDate'] >= start_date) & 
-                (self.orders_df['OrderDate'] <= end_date)
-            ]
-            
             # Filter by country if selected
             country = self.country_combo.currentText()
-            if country != "All Countries" and hasattr(self, 'customers_df'):
-                customer_countries = self.customers_df[['CustomerKey', 'Country']]
-                filtered_df = filtered_df.merge(customer_countries, on='CustomerKey', how='left')
-                filtered_df = filtered_df[filtered_df['Country'] == country]
+            if country == "All Countries":
+                country = None
+            filters = (start_date, end_date, country)
             
             # Update country combo box
             if hasattr(self, 'customers_df') and self.country_combo.count() == 1:
@@ -829,139 +2407,46 @@ class DataWarehouseDashboard(QMainWindow):
                 self.country_combo.addItems(countries)
             
             # Update charts
-            self.update_country_chart(filtered_df)
-            self.update_daily_sales_chart(filtered_df)
+            self.update_country_chart(self.get_widget_data('country_sales', *filters))
+            self.update_daily_sales_chart(self.get_widget_data('daily_sales', *filters))
             
             # Update table
-            self.update_sales_table(filtered_df)
+            self.update_sales_table(self.get_widget_data('sales_rows', *filters, SALES_TABLE_ROWS))
             
-    def update_country_chart(self, df):
+    def update_country_chart(self, country_sales):
         """Update sales by country chart"""
-        if hasattr(self, 'customers_df'):
-            # Merge with customer data to get countries
-            df_with_country = df.merge(
-                self.customers_df[['CustomerKey', 'Country']],
-                on='CustomerKey',
-                how='left'
-            )
-            
-            country_sales = df_with_country.groupby('Country')['TotalAmount'].sum().reset_index()
-            country_sales = country_sales.sort_values('TotalAmount', ascending=False).head(10)
-            
-            fig = self.country_chart_canvas.figure
-            fig.clf()
-            ax = fig.add_subplot(111)
-            
-            colors = plt.cm.Set3(np.linspace(0, 1, len(country_sales)))
-            bars = ax.bar(country_sales['Country'], country_sales['TotalAmount'], 
-                         color=colors, edgecolor='white', linewidth=1.0)
-            
-            # Enhance chart appearance
-            ax.set_facecolor('#f8f9fa')
-            fig.patch.set_facecolor('white')
-            
-            ax.set_xlabel('Country', fontsize=10, color='#495057')
-            ax.set_ylabel('Revenue ($)', fontsize=10, color='#495057')
-            ax.set_title('Top 10 Countries by Revenue', fontsize=12, fontweight='bold', color='#2c3e50', pad=10)
-            ax.set_xticklabels(country_sales['Country'], rotation=45, ha='right', fontsize=8)
-            
-            # Format y-axis
-            ax.yaxis.set_major_formatter(plt.FuncFormatter(lambda x, p: f'${x:,.0f}'))
-            ax.tick_params(axis='both', colors='#6c757d', labelsize=8)
-            
-            # Add grid
-            ax.grid(True, axis='y', alpha=0.2, linestyle='--', linewidth=0.5)
+        if country_sales is not None:
+            self.country_chart.update(country_sales['Country'], country_sales['TotalAmount'])
             
-            # Remove spines
-            ax.spines['top'].set_visible(False)
-            ax.spines['right'].set_visible(False)
-            ax.spines['left'].set_color('#dee2e6')
-            ax.spines['bottom'].set_color('#dee2e6')
-            
-            # Add value labels
-            for bar in bars:
-                height = bar.get_height()
-                if height > 0:
-                    ax.text(bar.get_x() + bar.get_width()/2., height + (height * 0.01),
-                           f'${height:,.0f}', ha='center', va='bottom', 
-                           fontsize=7, fontweight='medium', color='#2c3e50')
-            
-            fig.tight_layout(pad=1.0)
-            self.country_chart_canvas.draw()
-            
-    def update_daily_sales_chart(self, df):
+    def update_daily_sales_chart(self, daily_sales):
         """Update daily sales chart"""
-        if not df.empty:
-            daily_sales = df.groupby(df['OrderDate'].dt.date)['TotalAmount'].sum().reset_index()
-            daily_sales.columns = ['Date', 'Revenue']
-            daily_sales = daily_sales.sort_values('Date')
-            
-            fig = self.daily_chart_canvas.figure
-            fig.clf()
-            ax = fig.add_subplot(111)
-            
-            ax.plot(daily_sales['Date'], daily_sales['Revenue'], 
-                   color='#3498db', linewidth=2.0, marker='o', markersize=4)
-            
-            # Enhance chart appearance
-            ax.set_facecolor('#f8f9fa')
-            fig.patch.set_facecolor('white')
-            
-            ax.set_xlabel('Date', fontsize=10, color='#495057')
-            ax.set_ylabel('Revenue ($)', fontsize=10, color='#495057')
-            ax.set_title('Daily Sales Trend', fontsize=12, fontweight='bold', color='#2c3e50', pad=10)
-            ax.grid(True, alpha=0.2, linestyle='--')
-            
-            # Format axes
-            ax.yaxis.set_major_formatter(plt.FuncFormatter(lambda x, p: f'${x:,.0f}'))
-            ax.xaxis.set_major_formatter(plt.matplotlib.dates.DateFormatter('%m-%d'))
-            ax.xaxis.set_major_locator(plt.matplotlib.dates.AutoDateLocator())
-            ax.tick_params(axis='both', colors='#6c757d', labelsize=8)
-            
-            # Remove spines
-            ax.spines['top'].set_visible(False)
-            ax.spines['right'].set_visible(False)
-            ax.spines['left'].set_color('#dee2e6')
-            ax.spines['bottom'].set_color('#dee2e6')
-            
-            fig.tight_layout(pad=1.0)
-            self.daily_chart_canvas.draw()
+        if not daily_sales.empty:
+            self.daily_chart.update(daily_sales['Date'], daily_sales['Revenue'])
             
     def update_sales_table(self, df):
         """Update sales data table"""
-        self.sales_table.setRowCount(min(100, len(df)))  # Show max 100 rows
-        
-        for i, row in df.head(100).iterrows():
-            # Get customer name
-            customer_name = "Unknown"
-            if hasattr(self, 'customers_df'):
-                customer = self.customers_df[self.customers_df['CustomerKey'] == row['CustomerKey']]
-                if not customer.empty:
-                    customer_name = customer['CompanyName'].iloc[0]
-            
-            # Get country
-            country = "Unknown"
-            if hasattr(self, 'customers_df'):
-                customer = self.customers_df[self.customers_df['CustomerKey'] == row['CustomerKey']]
-                if not customer.empty:
-                    country = customer['Country'].iloc[0]
-            
-            # Populate table
-            items = [
-                str(row['OrderID']),
-                str(row['OrderDate'])[:10],
-                customer_name,
-                country,
-                f"${row['TotalAmount']:,.2f}",
-                f"${row['Freight']:,.2f}" if pd.notna(row['Freight']) else "$0.00",
-                "Delivered" if row.get('IsDelivered', 0) == 1 else "Pending"
-            ]
-            
-            for j, item in enumerate(items):
-                self.sales_table.setItem(i, j, QTableWidgetItem(item))
+        rows = df.head(SALES_TABLE_ROWS)
+        
+        # Names and countries come from the key indexes, cells are formatted when shown
+        self.sales_table.model().set_frame(rows.assign(
+            CompanyName=rows['CustomerKey'].map(self.customer_names).fillna('Unknown'),
+            Country=rows['CustomerKey'].map(self.customer_countries).fillna('Unknown'),
+            Freight=rows['Freight'].fillna(0),
+            Status=np.where(rows['IsDelivered'] == 1, 'Delivered', 'Pending')
+        ))
         
         self.sales_table.resizeColumnsToContents()
         
+    def create_frame_table(self, columns=None):
+        """Create a sortable table view backed by a DataFrameTableModel"""
+        table = QTableView()
+        table.setModel(DataFrameTableModel(columns, table))
+        
+        # No sort until a header is clicked, rows keep the order of their frame
+        table.horizontalHeader().setSortIndicator(-1, Qt.AscendingOrder)
+        table.setSortingEnabled(True)
+        return table
+        
     def create_customers_tab(self):
         """Create Customer Insights tab"""
         self.customers_tab = QWidget()
@@ -979,7 +2464,7 @@ class DataWarehouseDashboard(QMainWindow):
         
         filters_layout.addWidget(QLabel("Segment:"))
         self.segment_combo = QComboBox()
-        self.segment_combo.addItems(["All", "High Value", "Medium", "Low"])
+        self.segment_combo.addItems(["All"] + SEGMENTS[::-1])
         filters_layout.addWidget(self.segment_combo)
         
         filters_layout.addWidget(QLabel("Min Orders:"))
@@ -1009,16 +2494,23 @@ class DataWarehouseDashboard(QMainWindow):
         charts_layout.setContentsMargins(10, 10, 10, 10)
         
         # Customer segmentation chart
-        self.segmentation_canvas = FigureCanvas(Figure(figsize=(5, 4)))
+        self.segmentation_canvas = AsyncCanvas(Figure(figsize=(5, 4)))
         self.segmentation_canvas.setMinimumWidth(350)
         self.segmentation_canvas.setMinimumHeight(300)
         charts_layout.addWidget(self.segmentation_canvas)
+        self.segmentation_chart = self.segmentation_canvas.chart(PieChart, 'Customer Segmentation by Spending',
+                                                                 ['#FF9800', '#4CAF50', '#2196F3'])
+        self.segmentation_chart.on_select(lambda segment: self.toggle_selection(Segment=segment))
         
         # Country distribution chart
-        self.customer_country_canvas = FigureCanvas(Figure(figsize=(5, 4)))
+        self.customer_country_canvas = AsyncCanvas(Figure(figsize=(5, 4)))
         self.customer_country_canvas.setMinimumWidth(350)
         self.customer_country_canvas.setMinimumHeight(300)
         charts_layout.addWidget(self.customer_country_canvas)
+        self.customer_country_chart = self.customer_country_canvas.chart(
+            BarChart, 'Top 10 Countries by Customer Count', xlabel='Country', ylabel='Number of Customers',
+            cmap=plt.cm.Purples, value_format='{:,.0f}', money_axis=False)
+        self.customer_country_chart.on_select(lambda country: self.toggle_selection(Country=country))
         
         layout.addWidget(charts_frame)
         
@@ -1028,10 +2520,13 @@ class DataWarehouseDashboard(QMainWindow):
         table_layout = QVBoxLayout(table_frame)
         table_layout.setContentsMargins(5, 5, 5, 5)
         
-        self.customers_table = QTableWidget()
-        self.customers_table.setColumnCount(6)
-        self.customers_table.setHorizontalHeaderLabels([
-            'Company', 'Country', 'City', 'Contact', 'Orders', 'Total Spent'
+        self.customers_table = self.create_frame_table([
+            ('Company', 'CompanyName', str),
+            ('Country', 'Country', str),
+            ('City', 'City', str),
+            ('Contact', 'ContactName', str),
+            ('Orders', 'OrderCount', str),
+            ('Total Spent', 'TotalSpent', format_money)
         ])
         table_layout.addWidget(self.customers_table)
         
@@ -1039,49 +2534,16 @@ class DataWarehouseDashboard(QMainWindow):
         
     def update_customers_tab(self):
         """Update customers tab"""
-        if hasattr(self, 'customers_df') and hasattr(self, 'orders_df'):
-            # Calculate customer metrics
-            customer_orders = self.orders_df.groupby('CustomerKey').agg({
-                'OrderID': 'count',
-                'TotalAmount': 'sum'
-            }).reset_index()
-            customer_orders.columns = ['CustomerKey', 'OrderCount', 'TotalSpent']
-            
-            # Merge with customer data
-            customers_full = self.customers_df.merge(
-                customer_orders,
-                on='CustomerKey',
-                how='left'
-            )
-            customers_full['OrderCount'] = customers_full['OrderCount'].fillna(0)
-            customers_full['TotalSpent'] = customers_full['TotalSpent'].fillna(0)
-            
-            # Apply filters
-            filtered_customers = customers_full.copy()
-            
-            # Country filter
+        if hasattr(self, 'customers_df') and self.has_data():
+            # Filters are applied with the customer metrics
             country = self.customer_country_combo.currentText()
-            if country != "All":
-                filtered_customers = filtered_customers[filtered_customers['Country'] == country]
-            
-            # Min orders filter
+            if country == "All":
+                country = None
             min_orders = self.min_orders_spin.value()
-            filtered_customers = filtered_customers[filtered_customers['OrderCount'] >= min_orders]
             
-            # Segment filter
             segment = self.segment_combo.currentText()
-            if segment != "All":
-                # Create segments based on spending
-                percentiles = filtered_customers['TotalSpent'].quantile([0.33, 0.67])
-                if segment == "High Value":
-                    filtered_customers = filtered_customers[filtered_customers['TotalSpent'] > percentiles.iloc[1]]
-                elif segment == "Medium":
-                    filtered_customers = filtered_customers[
-                        (filtered_customers['TotalSpent'] > percentiles.iloc[0]) & 
-                        (filtered_customers['TotalSpent'] <= percentiles.iloc[1])
-                    ]
-                else:  # Low
-                    filtered_customers = filtered_customers[filtered_customers['TotalSpent'] <= percentiles.iloc[0]]
+            
+            filtered_customers = self.get_widget_data('customer_summary', country, min_orders, segment).copy()
             
             # Update country combo box
             if self.customer_country_combo.count() == 1:
@@ -1098,89 +2560,18 @@ class DataWarehouseDashboard(QMainWindow):
     def update_segmentation_chart(self, df):
         """Update customer segmentation chart"""
         if not df.empty:
-            # Create segments
-            df['Segment'] = pd.qcut(df['TotalSpent'], q=3, labels=['Low', 'Medium', 'High'])
-            segment_counts = df['Segment'].value_counts()
-            
-            fig = self.segmentation_canvas.figure
-            fig.clf()
-            ax = fig.add_subplot(111)
-            
-            colors = ['#FF9800', '#4CAF50', '#2196F3']
-            wedges, texts, autotexts = ax.pie(
-                segment_counts.values, 
-                labels=segment_counts.index,
-                colors=colors,
-                autopct='%1.1f%%',
-                startangle=90
-            )
-            
-            ax.set_title('Customer Segmentation by Spending', fontsize=12, fontweight='bold', color='#2c3e50', pad=10)
-            ax.axis('equal')
-            
-            fig.patch.set_facecolor('white')
-            fig.tight_layout(pad=1.0)
-            self.segmentation_canvas.draw()
+            segment_counts = df['Segment'].value_counts().reindex(SEGMENTS).dropna().astype(int)
+            self.segmentation_chart.update(segment_counts.index, segment_counts.values)
             
     def update_customer_country_chart(self, df):
         """Update customer country distribution chart"""
         if not df.empty and 'Country' in df.columns:
             country_counts = df['Country'].value_counts().head(10)
-            
-            fig = self.customer_country_canvas.figure
-            fig.clf()
-            ax = fig.add_subplot(111)
-            
-            colors = plt.cm.Purples(np.linspace(0.4, 0.8, len(country_counts)))
-            bars = ax.bar(range(len(country_counts)), country_counts.values, 
-                         color=colors, edgecolor='white', linewidth=1.0)
-            
-            # Enhance chart appearance
-            ax.set_facecolor('#f8f9fa')
-            fig.patch.set_facecolor('white')
-            
-            ax.set_xlabel('Country', fontsize=10, color='#495057')
-            ax.set_ylabel('Number of Customers', fontsize=10, color='#495057')
-            ax.set_title('Top 10 Countries by Customer Count', fontsize=12, fontweight='bold', color='#2c3e50', pad=10)
-            ax.set_xticks(range(len(country_counts)))
-            ax.set_xticklabels(country_counts.index, rotation=45, ha='right', fontsize=8)
-            
-            ax.tick_params(axis='both', colors='#6c757d', labelsize=8)
-            ax.grid(True, axis='y', alpha=0.2, linestyle='--', linewidth=0.5)
-            
-            # Remove spines
-            ax.spines['top'].set_visible(False)
-            ax.spines['right'].set_visible(False)
-            ax.spines['left'].set_color('#dee2e6')
-            ax.spines['bottom'].set_color('#dee2e6')
-            
-            # Add value labels
-            for bar in bars:
-                height = bar.get_height()
-                if height > 0:
-                    ax.text(bar.get_x() + bar.get_width()/2., height + (height * 0.01),
-                           f'{int(height)}', ha='center', va='bottom', 
-                           fontsize=7, fontweight='medium', color='#2c3e50')
-            
-            fig.tight_layout(pad=1.0)
-            self.customer_country_canvas.draw()
+            self.customer_country_chart.update(country_counts.index, country_counts.values)
             
     def update_customers_table(self, df):
         """Update customers table"""
-        self.customers_table.setRowCount(min(100, len(df)))
-        
-        for i, row in df.head(100).iterrows():
-            items = [
-                str(row.get('CompanyName', '')),
-                str(row.get('Country', '')),
-                str(row.get('City', '')),
-                str(row.get('ContactName', '')),
-                str(int(row.get('OrderCount', 0))),
-                f"${row.get('TotalSpent', 0):,.2f}"
-            ]
-            
-            for j, item in enumerate(items):
-                self.customers_table.setItem(i, j, QTableWidgetItem(item))
+        self.customers_table.model().set_frame(df.assign(OrderCount=df['OrderCount'].astype(int)))
         
         self.customers_table.resizeColumnsToContents()
         
@@ -1244,8 +2635,12 @@ class DataWarehouseDashboard(QMainWindow):
         """)
         left_layout.addWidget(perf_label)
         
-        self.employee_perf_canvas = FigureCanvas(Figure(figsize=(5, 4)))
+        self.employee_perf_canvas = AsyncCanvas(Figure(figsize=(5, 4)))
         left_layout.addWidget(self.employee_perf_canvas)
+        self.employee_perf_chart = self.employee_perf_canvas.chart(
+            ScatterChart, 'Employee Performance Analysis', 'Number of Orders',
+            'Total Revenue ($)', 'Average Order Value ($)')
+        self.employee_perf_chart.on_select(lambda employee: self.toggle_selection(EmployeeKey=employee))
         
         splitter.addWidget(left_chart_container)
         
@@ -1263,8 +2658,11 @@ class DataWarehouseDashboard(QMainWindow):
         """)
         right_layout.addWidget(title_label)
         
-        self.title_perf_canvas = FigureCanvas(Figure(figsize=(5, 4)))
+        self.title_perf_canvas = AsyncCanvas(Figure(figsize=(5, 4)))
         right_layout.addWidget(self.title_perf_canvas)
+        self.title_perf_chart = self.title_perf_canvas.chart(BarChart, 'Performance by Job Title',
+                                                             xlabel='Average Revenue ($)', cmap=plt.cm.Greens,
+                                                             horizontal=True)
         
         splitter.addWidget(right_chart_container)
         
@@ -1286,10 +2684,13 @@ class DataWarehouseDashboard(QMainWindow):
         """)
         table_layout.addWidget(table_label)
         
-        self.employees_table = QTableWidget()
-        self.employees_table.setColumnCount(6)
-        self.employees_table.setHorizontalHeaderLabels([
-            'Name', 'Title', 'Country', 'Orders', 'Revenue', 'Avg Order'
+        self.employees_table = self.create_frame_table([
+            ('Name', 'EmployeeName', str),
+            ('Title', 'Title', str),
+            ('Country', 'Country', str),
+            ('Orders', 'OrderCount', str),
+            ('Revenue', 'TotalRevenue', format_money),
+            ('Avg Order', 'AvgOrder', format_money)
         ])
         
         # Make table headers resizable
@@ -1297,9 +2698,6 @@ class DataWarehouseDashboard(QMainWindow):
         header.setSectionResizeMode(QHeaderView.Interactive)
         header.setStretchLastSection(True)
         
-        # Enable sorting
-        self.employees_table.setSortingEnabled(True)
-        
         table_layout.addWidget(self.employees_table)
         layout.addWidget(table_container, 2)  # Stretch factor 2 for table
         
@@ -1372,20 +2770,11 @@ class DataWarehouseDashboard(QMainWindow):
     
     def update_employees_tab(self):
         """Update employees tab with dynamic content"""
-        if hasattr(self, 'employees_df') and hasattr(self, 'orders_df'):
+        if hasattr(self, 'employees_df') and self.has_data():
             # Calculate employee performance
-            employee_perf = self.orders_df.groupby('EmployeeKey').agg({
-                'OrderID': 'count',
-                'TotalAmount': 'sum'
-            }).reset_index()
-            employee_perf.columns = ['EmployeeKey', 'OrderCount', 'TotalRevenue']
-            employee_perf['AvgOrder'] = employee_perf['TotalRevenue'] / employee_perf['OrderCount']
-            
-            # Merge with employee data
-            employees_full = self.employees_df.merge(
-                employee_perf,
-                on='EmployeeKey',
-                how='left'
+            employee_perf = self.get_widget_data('employee_performance')
+            employees_full = employee_perf.assign(
+                AvgOrder=employee_perf['TotalRevenue'] / employee_perf['OrderCount']
             ).fillna(0)
             
             # Update metrics with dynamic text
@@ -1420,9 +2809,6 @@ class DataWarehouseDashboard(QMainWindow):
             
             # Update table
             self.update_employees_table(employees_full)
-            
-            # Update charts when tab is resized
-            self.employees_tab.resizeEvent = lambda event: self.on_employees_tab_resize(event, employees_full)
     
     def adjust_metric_font_sizes(self):
         """Dynamically adjust font sizes based on content length"""
@@ -1449,35 +2835,13 @@ class DataWarehouseDashboard(QMainWindow):
             label.setStyleSheet(new_style)
             label.setWordWrap(length > 15)  # Enable word wrap for longer texts
     
-    def on_employees_tab_resize(self, event, df):
-        """Handle tab resize events"""
-        QWidget.resizeEvent(self.employees_tab, event)
-        
-        # Redraw charts with updated dimensions
-        self.update_employee_performance_chart(df)
-        self.update_title_performance_chart(df)
-        
-        # Adjust table column widths
-        self.employees_table.resizeColumnsToContents()
-        
-        # Adjust metric font sizes
-        self.adjust_metric_font_sizes()
-    
     def update_employee_performance_chart(self, df):
         """Update employee performance chart with dynamic sizing"""
         if not df.empty:
-            fig = self.employee_perf_canvas.figure
-            fig.clf()
-            
             # Get current canvas size
             canvas_width = self.employee_perf_canvas.width() / 100  # Convert to inches
             canvas_height = self.employee_perf_canvas.height() / 100
             
-            # Adjust figure size based on canvas
-            fig.set_size_inches(max(4, canvas_width * 0.9), max(3, canvas_height * 0.9))
-            
-            ax = fig.add_subplot(111)
-            
             # Filter out zeros for better visualization
             plot_df = df[(df['OrderCount'] > 0) & (df['TotalRevenue'] > 0)]
             
@@ -1486,69 +2850,33 @@ class DataWarehouseDashboard(QMainWindow):
                 max_avg = plot_df['AvgOrder'].max() if plot_df['AvgOrder'].max() > 0 else 100
                 point_sizes = 50 + (plot_df['AvgOrder'] / max_avg * 150)
                 
-                scatter = ax.scatter(
-                    plot_df['OrderCount'], 
-                    plot_df['TotalRevenue'],
-                    s=point_sizes,
-                    c=plot_df['AvgOrder'],
-                    cmap='viridis',
-                    alpha=0.7,
-                    edgecolors='white',
-                    linewidth=0.5
-                )
-                
                 # Dynamic font sizing based on chart size
                 title_font_size = max(10, min(14, int(canvas_height * 2)))
                 label_font_size = max(8, min(12, int(canvas_height * 1.5)))
                 tick_font_size = max(7, min(10, int(canvas_height * 1.2)))
-                
-                ax.set_xlabel('Number of Orders', fontsize=label_font_size, color='#495057')
-                ax.set_ylabel('Total Revenue ($)', fontsize=label_font_size, color='#495057')
-                ax.set_title('Employee Performance Analysis', fontsize=title_font_size, 
-                           fontweight='bold', color='#2c3e50', pad=10)
-                
-                ax.grid(True, alpha=0.2, linestyle='--')
-                ax.tick_params(axis='both', colors='#6c757d', labelsize=tick_font_size)
-                
-                # Format y-axis
-                ax.yaxis.set_major_formatter(plt.FuncFormatter(lambda x, p: f'${x:,.0f}'))
-                
-                # Remove spines
-                for spine in ['top', 'right']:
-                    ax.spines[spine].set_visible(False)
-                for spine in ['left', 'bottom']:
-                    ax.spines[spine].set_color('#dee2e6')
-                
-                # Add colorbar with dynamic size
-                cbar = plt.colorbar(scatter, ax=ax, pad=0.01)
-                cbar.set_label('Average Order Value ($)', fontsize=label_font_size - 1)
+                self.employee_perf_chart.set_font_sizes(title_font_size, label_font_size, tick_font_size)
                 
                 # Dynamic annotation - only show if there's enough space
+                annotations = []
                 if canvas_width > 5:  # Only annotate if chart is wide enough
                     top_5 = plot_df.nlargest(min(5, len(plot_df)), 'TotalRevenue')
-                    for _, row in top_5.iterrows():
-                        ax.annotate(
-                            f"{row['FirstName'][0]}.{row['LastName']}",
-                            (row['OrderCount'], row['TotalRevenue']),
-                            fontsize=max(6, int(tick_font_size * 0.8)),
-                            ha='center',
-                            bbox=dict(boxstyle="round,pad=0.3", facecolor="white", 
-                                    edgecolor="#dee2e6", alpha=0.9)
-                        )
+                    annotations = [
+                        (f"{first[0]}.{last}", (orders, revenue))
+                        for first, last, orders, revenue in zip(
+                            top_5['FirstName'], top_5['LastName'], top_5['OrderCount'], top_5['TotalRevenue'])
+                    ]
+                
+                self.employee_perf_chart.update(
+                    plot_df['OrderCount'], 
+                    plot_df['TotalRevenue'],
+                    point_sizes,
+                    plot_df['AvgOrder'],
+                    annotations,
+                    keys=plot_df['EmployeeKey']
+                )
             else:
                 # No data message
-                ax.text(0.5, 0.5, 'No performance data available', 
-                       ha='center', va='center', transform=ax.transAxes,
-                       fontsize=12, color='#6c757d')
-                ax.set_xticks([])
-                ax.set_yticks([])
-                for spine in ax.spines.values():
-                    spine.set_visible(False)
-            
-            ax.set_facecolor('#f8f9fa')
-            fig.patch.set_facecolor('white')
-            fig.tight_layout(pad=1.0)
-            self.employee_perf_canvas.draw()
+                self.employee_perf_chart.show_message('No performance data available')
     
     def update_title_performance_chart(self, df):
         """Update performance by job title chart with dynamic sizing"""
@@ -1561,31 +2889,18 @@ class DataWarehouseDashboard(QMainWindow):
             title_perf = title_perf[title_perf['TotalRevenue'] > 0]
             
             if not title_perf.empty:
-                fig = self.title_perf_canvas.figure
-                fig.clf()
-                
                 # Get current canvas size
                 canvas_width = self.title_perf_canvas.width() / 100
                 canvas_height = self.title_perf_canvas.height() / 100
                 
-                # Adjust figure size based on canvas
-                fig.set_size_inches(max(4, canvas_width * 0.9), max(3, canvas_height * 0.9))
-                
-                ax = fig.add_subplot(111)
-                
                 # Sort by revenue for better display
-                title_perf = title_perf.sort_values('TotalRevenue', ascending=True)
-                
-                colors = plt.cm.Greens(np.linspace(0.4, 0.8, len(title_perf)))
-                bars = ax.barh(range(len(title_perf)), title_perf['TotalRevenue'], 
-                             color=colors, edgecolor='white', linewidth=1.0)
+                title_perf = title_perf.sort_values('TotalRevenue', ascending=False)
                 
                 # Dynamic font sizing
                 title_font_size = max(10, min(14, int(canvas_height * 2)))
                 label_font_size = max(8, min(12, int(canvas_height * 1.5)))
                 tick_font_size = max(7, min(10, int(canvas_height * 1.2)))
-                
-                ax.set_yticks(range(len(title_perf)))
+                self.title_perf_chart.set_font_sizes(title_font_size, label_font_size, tick_font_size)
                 
                 # Truncate long titles if needed
                 y_labels = []
@@ -1595,72 +2910,24 @@ class DataWarehouseDashboard(QMainWindow):
                     else:
                         y_labels.append(title)
                 
-                ax.set_yticklabels(y_labels, fontsize=tick_font_size)
-                ax.set_xlabel('Average Revenue ($)', fontsize=label_font_size, color='#495057')
-                ax.set_title('Performance by Job Title', fontsize=title_font_size, 
-                           fontweight='bold', color='#2c3e50', pad=10)
-                
-                ax.invert_yaxis()  # Highest value on top
-                ax.xaxis.set_major_formatter(plt.FuncFormatter(lambda x, p: f'${x:,.0f}'))
-                ax.tick_params(axis='both', colors='#6c757d', labelsize=tick_font_size)
-                ax.grid(True, axis='x', alpha=0.2, linestyle='--', linewidth=0.5)
-                
-                # Remove spines
-                for spine in ['top', 'right']:
-                    ax.spines[spine].set_visible(False)
-                for spine in ['left', 'bottom']:
-                    ax.spines[spine].set_color('#dee2e6')
-                
                 # Dynamic value labels - only show if there's enough space
-                if canvas_width > 4:
-                    for bar in bars:
-                        width = bar.get_width()
-                        if width > 0:
-                            ax.text(width + (width * 0.01), bar.get_y() + bar.get_height()/2.,
-                                   f'${width:,.0f}', ha='left', va='center', 
-                                   fontsize=max(6, int(tick_font_size * 0.8)), 
-                                   fontweight='medium', color='#2c3e50')
+                self.title_perf_chart.update(y_labels, title_perf['TotalRevenue'], show_values=canvas_width > 4)
             else:
                 # No data message
-                fig = self.title_perf_canvas.figure
-                fig.clf()
-                ax = fig.add_subplot(111)
-                ax.text(0.5, 0.5, 'No title performance data', 
-                       ha='center', va='center', transform=ax.transAxes,
-                       fontsize=12, color='#6c757d')
-                ax.set_xticks([])
-                ax.set_yticks([])
-                for spine in ax.spines.values():
-                    spine.set_visible(False)
-            
-            ax.set_facecolor('#f8f9fa')
-            fig.patch.set_facecolor('white')
-            fig.tight_layout(pad=1.0)
-            self.title_perf_canvas.draw()
+                self.title_perf_chart.show_message('No title performance data')
     
     def update_employees_table(self, df):
         """Update employees table with dynamic column widths"""
-        df = df.sort_values('TotalRevenue', ascending=False)
-        self.employees_table.setRowCount(min(50, len(df)))
-        
-        for i, row in df.head(50).iterrows():
-            items = [
-                f"{row.get('FirstName', '')} {row.get('LastName', '')}",
-                str(row.get('Title', '')),
-                str(row.get('Country', '')),
-                str(int(row.get('OrderCount', 0))),
-                f"${row.get('TotalRevenue', 0):,.2f}",
-                f"${row.get('AvgOrder', 0):,.2f}"
-            ]
-            
-            for j, item in enumerate(items):
-                self.employees_table.setItem(i, j, QTableWidgetItem(item))
+        self.employees_table.model().set_frame(df.sort_values('TotalRevenue', ascending=False).assign(
+            EmployeeName=df['EmployeeKey'].map(self.employee_names),
+            OrderCount=df['OrderCount'].astype(int)
+        ))
         
         # Adjust column widths based on content
         self.employees_table.resizeColumnsToContents()
         
         # Set minimum column widths
-        for col in range(self.employees_table.columnCount()):
+        for col in range(self.employees_table.model().columnCount()):
             current_width = self.employees_table.columnWidth(col)
             min_width = 80 if col < 3 else 100
             if current_width < min_width:
@@ -1715,14 +2982,19 @@ class DataWarehouseDashboard(QMainWindow):
         charts_layout.setContentsMargins(10, 10, 10, 10)
         
         # Time series chart
-        self.time_series_canvas = FigureCanvas(Figure(figsize=(10, 4)))
+        self.time_series_canvas = AsyncCanvas(Figure(figsize=(10, 4)))
         self.time_series_canvas.setMinimumHeight(300)
         charts_layout.addWidget(self.time_series_canvas)
+        self.time_series_chart = self.time_series_canvas.chart(LineChart, 'Monthly Sales Trend',
+                                                               xlabel='Period', ylabel='Revenue ($)', rotation=45)
         
         # Day of week analysis
-        self.dow_canvas = FigureCanvas(Figure(figsize=(10, 4)))
+        self.dow_canvas = AsyncCanvas(Figure(figsize=(10, 4)))
         self.dow_canvas.setMinimumHeight(300)
         charts_layout.addWidget(self.dow_canvas)
+        self.dow_chart = self.dow_canvas.chart(BarChart, 'Average Revenue by Day of Week',
+                                               xlabel='Day of Week', ylabel='Average Revenue ($)',
+                                               cmap=plt.cm.Set3, color_range=(0, 1), rotation=0)
         
         layout.addWidget(charts_frame)
         
@@ -1736,152 +3008,38 @@ class DataWarehouseDashboard(QMainWindow):
         self.update_time_analysis()
     def update_time_analysis(self):
         """Update time analysis tab"""
-        if hasattr(self, 'orders_df') and hasattr(self, 'dates_df'):
-            # Merge data
-            df = self.orders_df.merge(
-                self.dates_df,
-                left_on='OrderDateKey',
-                right_on='DateKey',
-                how='left'
-            )
-            
+        if self.has_data():
             # Filter by year if selected
             year = self.year_combo.currentText()
-            if year != "All Years":
-                df = df[df['Year'] == int(year)]
+            year = int(year) if year != "All Years" else None
             
             # Update year combo box
             if self.year_combo.count() == 1:
-                years = sorted(self.dates_df['Year'].dropna().unique())
+                years = self.get_widget_data('order_years')['Year']
                 self.year_combo.addItems([str(y) for y in years])
             
             # Update charts based on period
             period = self.period_combo.currentText()
-            self.update_time_series_chart(df, period)
-            self.update_dow_chart(df)
+            self.update_time_series_chart(self.get_widget_data('time_series', period, year), period)
+            self.update_dow_chart(self.get_widget_data('day_of_week', year))
             
-    def update_time_series_chart(self, df, period):
+    def update_time_series_chart(self, time_data, period):
         """Update time series chart based on period"""
-        if not df.empty:
-            fig = self.time_series_canvas.figure
-            fig.clf()
-            ax = fig.add_subplot(111)
-            
-            if period == "Daily":
-                time_data = df.groupby('Date')['TotalAmount'].sum().reset_index()
-                time_data = time_data.sort_values('Date')
-                x = time_data['Date']
-                title = 'Daily Sales'
-                
-            elif period == "Weekly":
-                df['Week'] = df['Date'].dt.isocalendar().week
-                time_data = df.groupby(['Year', 'Week'])['TotalAmount'].sum().reset_index()
-                time_data = time_data.sort_values(['Year', 'Week'])
-                time_data['Period'] = time_data['Year'].astype(str) + '-W' + time_data['Week'].astype(str)
-                x = time_data['Period']
-                title = 'Weekly Sales'
-                
-            elif period == "Monthly":
-                time_data = df.groupby(['Year', 'Month', 'MonthName'])['TotalAmount'].sum().reset_index()
-                time_data = time_data.sort_values(['Year', 'Month'])
-                time_data['Period'] = time_data['MonthName'] + ' ' + time_data['Year'].astype(str)
-                x = time_data['Period']
-                title = 'Monthly Sales'
-                
-            elif period == "Quarterly":
-                time_data = df.groupby(['Year', 'Quarter'])['TotalAmount'].sum().reset_index()
-                time_data = time_data.sort_values(['Year', 'Quarter'])
-                time_data['Period'] = 'Q' + time_data['Quarter'].astype(str) + ' ' + time_data['Year'].astype(str)
-                x = time_data['Period']
-                title = 'Quarterly Sales'
-                
-            else:  # Yearly
-                time_data = df.groupby('Year')['TotalAmount'].sum().reset_index()
-                time_data = time_data.sort_values('Year')
-                x = time_data['Year'].astype(str)
-                title = 'Yearly Sales'
-            
-            # Create enhanced line chart
-            ax.plot(x, time_data['TotalAmount'], color='#3498db', linewidth=2.0, 
-                   marker='o', markersize=4)
-            
-            # Enhance chart appearance
-            ax.set_facecolor('#f8f9fa')
-            fig.patch.set_facecolor('white')
-            
-            ax.set_xlabel('Period', fontsize=10, color='#495057')
-            ax.set_ylabel('Revenue ($)', fontsize=10, color='#495057')
-            ax.set_title(f'{title} Trend', fontsize=12, fontweight='bold', color='#2c3e50', pad=10)
-            ax.grid(True, alpha=0.2, linestyle='--')
-            
-            # Format y-axis
-            ax.yaxis.set_major_formatter(plt.FuncFormatter(lambda x, p: f'${x:,.0f}'))
-            ax.tick_params(axis='both', colors='#6c757d', labelsize=8)
-            
-            # Remove spines
-            ax.spines['top'].set_visible(False)
-            ax.spines['right'].set_visible(False)
-            ax.spines['left'].set_color('#dee2e6')
-            ax.spines['bottom'].set_color('#dee2e6')
-            
-            # Rotate x labels for better readability
-            plt.setp(ax.xaxis.get_majorticklabels(), rotation=45, ha='right')
-            
-            fig.tight_layout(pad=1.0)
-            self.time_series_canvas.draw()
-            
-    def update_dow_chart(self, df):
+        if not time_data.empty:
+            # Buckets sit at their first day on a date axis, the chart thins them to its width
+            dates = period_start_dates(time_data, period)
+            self.time_series_chart.set_title(f'{period} Sales Trend')
+            self.time_series_chart.update(dates, time_data['TotalAmount'],
+                                          tick_format=PERIOD_TICK_FORMATS[period])
+            
+    def update_dow_chart(self, dow_analysis):
         """Update day of week analysis chart"""
-        if not df.empty and 'DayOfWeek' in df.columns:
-            dow_mapping = {
-                'Monday': 0, 'Tuesday': 1, 'Wednesday': 2, 
-                'Thursday': 3, 'Friday': 4, 'Saturday': 5, 'Sunday': 6
-            }
-            df['DOW_Num'] = df['DayOfWeek'].map(dow_mapping)
-            
-            dow_analysis = df.groupby(['DayOfWeek', 'DOW_Num']).agg({
-                'TotalAmount': ['mean', 'sum', 'count']
-            }).reset_index()
-            dow_analysis = dow_analysis.sort_values('DOW_Num')
-            
-            fig = self.dow_canvas.figure
-            fig.clf()
-            ax = fig.add_subplot(111)
-            
-            colors = plt.cm.Set3(np.linspace(0, 1, len(dow_analysis)))
-            bars = ax.bar(dow_analysis['DayOfWeek'], dow_analysis[('TotalAmount', 'mean')], 
-                         color=colors, edgecolor='white', linewidth=1.0)
-            
-            # Enhance chart appearance
-            ax.set_facecolor('#f8f9fa')
-            fig.patch.set_facecolor('white')
-            
-            ax.set_xlabel('Day of Week', fontsize=10, color='#495057')
-            ax.set_ylabel('Average Revenue ($)', fontsize=10, color='#495057')
-            ax.set_title('Average Revenue by Day of Week', fontsize=12, fontweight='bold', color='#2c3e50', pad=10)
-            
-            ax.grid(True, axis='y', alpha=0.2, linestyle='--', linewidth=0.5)
-            ax.tick_params(axis='both', colors='#6c757d', labelsize=8)
-            
-            # Format y-axis
-            ax.yaxis.set_major_formatter(plt.FuncFormatter(lambda x, p: f'${x:,.0f}'))
-            
-            # Remove spines
-            ax.spines['top'].set_visible(False)
-            ax.spines['right'].set_visible(False)
-            ax.spines['left'].set_color('#dee2e6')
-            ax.spines['bottom'].set_color('#dee2e6')
-            
-            # Add value labels
-            for bar in bars:
-                height = bar.get_height()
-                if height > 0:
-                    ax.text(bar.get_x() + bar.get_width()/2., height + (height * 0.01),
-                           f'${height:,.0f}', ha='center', va='bottom', 
-                           fontsize=7, fontweight='medium', color='#2c3e50')
-            
-            fig.tight_layout(pad=1.0)
-            self.dow_canvas.draw()
+        if not dow_analysis.empty:
+            # Monday first, names outside DAY_ORDER (another locale, NULL) after Sunday
+            dow_analysis = dow_analysis.sort_values(
+                'DayOfWeek', key=lambda days: days.map(DAY_POSITIONS), na_position='last', kind='stable'
+            )
+            self.dow_chart.update(dow_analysis['DayOfWeek'], dow_analysis['Mean'])
             
     def create_data_explorer_tab(self):
         """Create Data Explorer tab"""
@@ -1908,7 +3066,7 @@ class DataWarehouseDashboard(QMainWindow):
         sample_queries = QComboBox()
         sample_queries.addItems([
             "Select a sample query...",
-            "SELECT TOP 100 * FROM FactOrders",
+            WAREHOUSE.limit("SELECT * FROM FactOrders", 100),
             "SELECT * FROM DimCustomer",
             "SELECT * FROM DimEmployee",
             "SELECT * FROM DimDate",
@@ -1926,6 +3084,11 @@ class DataWarehouseDashboard(QMainWindow):
         self.execute_btn.clicked.connect(self.execute_query)
         button_layout.addWidget(self.execute_btn)
         
+        self.cancel_query_btn = QPushButton("Cancel")
+        self.cancel_query_btn.setEnabled(False)
+        self.cancel_query_btn.clicked.connect(self.cancel_query)
+        button_layout.addWidget(self.cancel_query_btn)
+        
         self.export_csv_btn = QPushButton("Export to CSV")
         self.export_csv_btn.clicked.connect(self.export_to_csv)
         button_layout.addWidget(self.export_csv_btn)
@@ -1935,6 +3098,43 @@ class DataWarehouseDashboard(QMainWindow):
         button_layout.addWidget(self.export_excel_btn)
         
         button_layout.addStretch()
+        
+        # Results of warehouse table queries are reused until the next ETL load
+        self.cache_check = QCheckBox("Use cache")
+        self.cache_check.setChecked(True)
+        button_layout.addWidget(self.cache_check)
+        
+        # Paged browsing of large results
+        self.paged_check = QCheckBox("Paged")
+        button_layout.addWidget(self.paged_check)
+        
+        self.page_size_spin = QSpinBox()
+        self.page_size_spin.setRange(100, 100000)
+        self.page_size_spin.setSingleStep(100)
+        self.page_size_spin.setSuffix(" rows")
+        self.page_size_spin.setValue(EXPLORER_PAGE_ROWS)
+        button_layout.addWidget(self.page_size_spin)
+        
+        self.prev_page_btn = QPushButton("◀")
+        self.prev_page_btn.setEnabled(False)
+        self.prev_page_btn.clicked.connect(lambda: self.request_page(self.page_number - 1))
+        button_layout.addWidget(self.prev_page_btn)
+        
+        self.page_label = QLabel("")
+        button_layout.addWidget(self.page_label)
+        
+        self.next_page_btn = QPushButton("▶")
+        self.next_page_btn.setEnabled(False)
+        self.next_page_btn.clicked.connect(lambda: self.request_page(self.page_number + 1))
+        button_layout.addWidget(self.next_page_btn)
+        
+        button_layout.addWidget(QLabel("Timeout:"))
+        self.query_timeout_spin = QSpinBox()
+        self.query_timeout_spin.setRange(0, 3600)
+        self.query_timeout_spin.setSuffix(" s")
+        self.query_timeout_spin.setSpecialValueText("None")
+        self.query_timeout_spin.setValue(EXPLORER_TIMEOUT_SECONDS)
+        button_layout.addWidget(self.query_timeout_spin)
         query_layout.addWidget(button_frame)
         
         layout.addWidget(query_frame)
@@ -1945,7 +3145,7 @@ class DataWarehouseDashboard(QMainWindow):
         table_layout = QVBoxLayout(table_frame)
         table_layout.setContentsMargins(5, 5, 5, 5)
         
-        self.results_table = QTableWidget()
+        self.results_table = self.create_frame_table()
         table_layout.addWidget(self.results_table)
         
         layout.addWidget(table_frame)
@@ -1955,116 +3155,300 @@ class DataWarehouseDashboard(QMainWindow):
         self.results_label.setStyleSheet("color: #6c757d; font-size: 11px; padding: 5px;")
         layout.addWidget(self.results_label)
         
+        # Rows and elapsed time are refreshed while a query runs
+        self.query_clock = QElapsedTimer()
+        self.query_progress_timer = QTimer(self)
+        self.query_progress_timer.setInterval(250)
+        self.query_progress_timer.timeout.connect(self.show_query_progress)
+        
     def load_sample_query(self, query):
         """Load sample query into editor"""
         if query and "Select a sample query..." not in query:
             self.query_text.setText(query)
             
     def execute_query(self):
-        """Execute SQL query and display results"""
+        """Start the SQL query on a worker thread, rows are shown as they arrive"""
         query = self.query_text.toPlainText().strip()
         if not query:
             QMessageBox.warning(self, "Warning", "Please enter a SQL query")
             return
-            
-        try:
-            conn = get_db_connection()
-            if conn:
-                df = pd.read_sql(query, conn)
-                conn.close()
-                
-                self.display_query_results(df)
-                self.results_label.setText(f"Query executed successfully. {len(df)} rows returned.")
-            else:
-                QMessageBox.critical(self, "Error", "Could not connect to database")
+        if self.query_worker is not None:
+            return
+        self.last_query = query
+        if self.paged_check.isChecked():
+            self.start_paged_query(query)
+            return
+        # Pages of a previous paged query would replace these results
+        self.page_generation += 1
+        if self.page_worker is not None:
+            self.stop_worker(self.page_worker)
+            self.page_worker = None
+        
+        self.prev_page_btn.setEnabled(False)
+        self.next_page_btn.setEnabled(False)
+        self.page_label.setText("")
+        self.pending_chunks = []
+        self.query_rows = 0
+        self.query_error = None
+        self.display_query_results(pd.DataFrame())
+        
+        self.query_worker = QueryWorker(query, self.query_timeout_spin.value(), self,
+                                        cache=self.query_cache if self.cache_check.isChecked() else None)
+        self.query_worker.columns_ready.connect(self.on_query_columns)
+        self.query_worker.rows_fetched.connect(self.on_query_rows)
+        self.query_worker.failed.connect(self.on_query_failed)
+        self.query_worker.finished.connect(self.on_query_finished)
+        
+        self.execute_btn.setEnabled(False)
+        self.cancel_query_btn.setEnabled(True)
+        self.results_label.setText("Executing query...")
+        self.query_clock.start()
+        self.query_progress_timer.start()
+        self.query_worker.start()
+        
+    def cancel_query(self):
+        """Cancel the running explorer query"""
+        if self.query_worker is not None:
+            self.query_worker.cancel()
+            self.results_label.setText("Cancelling query...")
+            
+    def on_query_columns(self, columns):
+        """Show the headers of a new result set"""
+        self.display_query_results(pd.DataFrame(columns=columns))
+        
+    def on_query_rows(self, chunk):
+        """Queue fetched rows until the next progress tick"""
+        self.pending_chunks.append(chunk)
+        self.query_rows += len(chunk)
+        
+    def on_query_failed(self, message):
+        """Remember why the query stopped"""
+        self.query_error = message
+        
+    def flush_query_rows(self):
+        """Append the queued rows to the results table"""
+        if self.pending_chunks:
+            chunks, self.pending_chunks = self.pending_chunks, []
+            self.results_table.model().append_frame(pd.concat(chunks, ignore_index=True))
+            
+    def show_query_progress(self):
+        """Show the rows fetched so far and the elapsed time"""
+        self.flush_query_rows()
+        elapsed = self.query_clock.elapsed() / 1000
+        self.results_label.setText(f"Executing query... {self.query_rows:,} rows, {elapsed:.1f}s")
+        
+    def on_query_finished(self):
+        """Show the final state of the query once the worker stops"""
+        self.query_progress_timer.stop()
+        self.flush_query_rows()
+        elapsed = self.query_clock.elapsed() / 1000
+        cancelled = self.query_worker.cancelled
+        from_cache = self.query_worker.from_cache
+        self.query_worker.deleteLater()
+        self.query_worker = None
+        
+        self.execute_btn.setEnabled(True)
+        self.cancel_query_btn.setEnabled(False)
+        
+        if cancelled:
+            self.results_label.setText(f"Query cancelled after {elapsed:.1f}s. {self.query_rows:,} rows fetched.")
+        elif self.query_error is not None:
+            self.results_label.setText(f"Query failed after {elapsed:.1f}s.")
+            QMessageBox.critical(self, "Error", f"Query execution failed: {self.query_error}")
+        elif from_cache:
+            self.results_label.setText(f"Query served from cache. {self.query_rows:,} rows returned in {elapsed:.1f}s.")
+        else:
+            self.results_label.setText(f"Query executed successfully. {self.query_rows:,} rows returned in {elapsed:.1f}s.")
+            
+    def start_paged_query(self, query):
+        """Browse a query page by page, the next page is fetched in the background"""
+        self.page_generation += 1
+        self.paged_source = query
+        self.page_rows = self.page_size_spin.value()
+        self.page_plan = None  # decided by the first page
+        self.page_keys = [None]  # key after which, or row offset at which, each page starts
+        self.page_cache = {}
+        self.page_number = 0
+        self.wanted_page = 0
+        self.page_failed = False
+        self.display_query_results(pd.DataFrame())
+        self.page_label.setText("")
+        self.prev_page_btn.setEnabled(False)
+        self.next_page_btn.setEnabled(False)
+        self.results_label.setText("Loading page 1...")
+        self.fetch_page(0)
+        
+    def fetch_page(self, page):
+        """Start fetching a page on a worker thread"""
+        if self.page_worker is not None:
+            self.stop_worker(self.page_worker)
+        self.page_worker = PageWorker(self.paged_source, self.page_rows, self.page_plan, self.page_keys[page],
+                                      page, self.page_generation, self.query_timeout_spin.value(), self)
+        self.page_worker.page_ready.connect(self.on_page_ready)
+        self.page_worker.failed.connect(self.on_page_failed)
+        self.page_worker.finished.connect(self.on_page_worker_finished)
+        self.page_worker.start()
+        
+    def stop_worker(self, worker):
+        """Cancel a worker being replaced, keeping it until its thread ends"""
+        worker.cancel()
+        self.stopping_workers.append(worker)
+        worker.finished.connect(self.release_stopped_workers)
+        self.release_stopped_workers()
+        
+    def release_stopped_workers(self):
+        """Delete the stopped workers whose thread has ended"""
+        for worker in [worker for worker in self.stopping_workers if worker.isFinished()]:
+            self.stopping_workers.remove(worker)
+            worker.deleteLater()
+        
+    def request_page(self, page):
+        """Show a page, from the prefetched ones when available"""
+        if page < 0 or page >= len(self.page_keys):
+            return
+        self.wanted_page = page
+        self.page_failed = False
+        if page in self.page_cache:
+            self.show_page(page)
+        else:
+            self.results_label.setText(f"Loading page {page + 1}...")
+            if self.page_worker is None:
+                self.fetch_page(page)
                 
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"Query execution failed: {str(e)}")
+    def on_page_ready(self, generation, page, page_df, position):
+        """Keep a fetched page, showing it if it is the one asked for"""
+        if generation != self.page_generation:
+            return
+        self.page_plan, next_start = position
+        if len(page_df) == self.page_rows:
+            del self.page_keys[page + 1:]
+            self.page_keys.append(next_start)
+        self.page_cache[page] = page_df
+        if page == self.wanted_page:
+            self.show_page(page)
+            
+    def on_page_failed(self, message):
+        """Report a page that could not be fetched"""
+        if self.sender().generation == self.page_generation:
+            self.page_failed = True
+            self.results_label.setText("Page query failed.")
+            QMessageBox.critical(self, "Error", f"Query execution failed: {message}")
+            
+    def on_page_worker_finished(self):
+        """Fetch the page asked for while another one was loading"""
+        if self.sender() is not self.page_worker:
+            return
+        self.page_worker.deleteLater()
+        self.page_worker = None
+        if self.page_failed:
+            return
+        if self.wanted_page not in self.page_cache and self.wanted_page < len(self.page_keys):
+            self.fetch_page(self.wanted_page)
+        else:
+            self.prefetch_next_page()
+            
+    def show_page(self, page):
+        """Display a cached page and keep only it and the next one in memory"""
+        self.page_number = page
+        self.page_cache = {n: df for n, df in self.page_cache.items() if n in (page, page + 1)}
+        page_df = self.page_cache[page]
+        self.display_query_results(page_df)
+        
+        first_row = page * self.page_rows
+        mode, key = self.page_plan
+        paging = f"paged on {key}" if mode == 'keyset' else "paged by row offset"
+        self.page_label.setText(f"Page {page + 1}")
+        self.results_label.setText(f"Rows {first_row + 1:,} to {first_row + len(page_df):,}, {paging}.")
+        self.prev_page_btn.setEnabled(page > 0)
+        self.next_page_btn.setEnabled(page + 1 < len(self.page_keys))
+        self.prefetch_next_page()
+        
+    def prefetch_next_page(self):
+        """Fetch the page after the displayed one while it is read"""
+        following = self.page_number + 1
+        if (self.page_worker is None and following < len(self.page_keys)
+                and following not in self.page_cache):
+            self.fetch_page(following)
             
     def display_query_results(self, df):
         """Display query results in table"""
-        self.results_table.setRowCount(len(df))
-        self.results_table.setColumnCount(len(df.columns))
-        self.results_table.setHorizontalHeaderLabels(df.columns)
-        
-        for i, row in df.iterrows():
-            for j, col in enumerate(df.columns):
-                value = str(row[col])
-                if pd.isna(row[col]):
-                    value = "NULL"
-                self.results_table.setItem(i, j, QTableWidgetItem(value))
+        self.results_table.model().set_frame(df)
         
         self.results_table.resizeColumnsToContents()
         
     def export_to_csv(self):
-        """Export current results to CSV"""
-        if self.results_table.rowCount() == 0:
-            QMessageBox.warning(self, "Warning", "No data to export")
-            return
-            
-        filename, _ = QFileDialog.getSaveFileName(
-            self, "Save CSV File", "", "CSV Files (*.csv)")
+        """Export the full results of the last query to CSV"""
+        self.export_results("Save CSV File", "CSV Files (*.csv)", 'csv')
         
-        if filename:
-            try:
-                data = []
-                for i in range(self.results_table.rowCount()):
-                    row = []
-                    for j in range(self.results_table.columnCount()):
-                        item = self.results_table.item(i, j)
-                        row.append(item.text() if item else "")
-                    data.append(row)
-                
-                headers = []
-                for j in range(self.results_table.columnCount()):
-                    headers.append(self.results_table.horizontalHeaderItem(j).text())
-                
-                df = pd.DataFrame(data, columns=headers)
-                df.to_csv(filename, index=False)
-                QMessageBox.information(self, "Success", f"Data exported to {filename}")
-                
-            except Exception as e:
-                QMessageBox.critical(self, "Error", f"Export failed: {str(e)}")
-                
     def export_to_excel(self):
-        """Export current results to Excel"""
-        if self.results_table.rowCount() == 0:
+        """Export the full results of the last query to Excel"""
+        self.export_results("Save Excel File", "Excel Files (*.xlsx)", 'xlsx')
+        
+    def export_results(self, caption, file_filter, file_format):
+        """Run the last query again and stream its rows into a file"""
+        if self.last_query is None:
             QMessageBox.warning(self, "Warning", "No data to export")
             return
+        if self.export_worker is not None:
+            QMessageBox.warning(self, "Warning", "An export is already running")
+            return
             
-        filename, _ = QFileDialog.getSaveFileName(
-            self, "Save Excel File", "", "Excel Files (*.xlsx)")
-        
+        filename, _ = QFileDialog.getSaveFileName(self, caption, "", file_filter)
         if filename:
-            try:
-                data = []
-                for i in range(self.results_table.rowCount()):
-                    row = []
-                    for j in range(self.results_table.columnCount()):
-                        item = self.results_table.item(i, j)
-                        row.append(item.text() if item else "")
-                    data.append(row)
-                
-                headers = []
-                for j in range(self.results_table.columnCount()):
-                    headers.append(self.results_table.horizontalHeaderItem(j).text())
-                
-                df = pd.DataFrame(data, columns=headers)
-                df.to_excel(filename, index=False)
-                QMessageBox.information(self, "Success", f"Data exported to {filename}")
-                
-            except Exception as e:
-                QMessageBox.critical(self, "Error", f"Export failed: {str(e)}")
+            self.export_worker = ExportWorker(self.last_query, filename, file_format,
+                                              self.query_timeout_spin.value(), self)
+            self.export_worker.progress.connect(
+                lambda rows: self.statusBar().showMessage(f"Exporting... {rows:,} rows written"))
+            self.export_worker.failed.connect(self.on_export_failed)
+            self.export_worker.finished.connect(self.on_export_finished)
+            
+            self.export_error = None
+            self.export_csv_btn.setEnabled(False)
+            self.export_excel_btn.setEnabled(False)
+            self.statusBar().showMessage(f"Exporting to {filename}...")
+            self.export_worker.start()
+            
+    def on_export_failed(self, message):
+        """Remember why the export stopped"""
+        self.export_error = message
+        
+    def on_export_finished(self):
+        """Report the exported rows once the file is written"""
+        worker, self.export_worker = self.export_worker, None
+        worker.deleteLater()
+        self.export_csv_btn.setEnabled(True)
+        self.export_excel_btn.setEnabled(True)
+        
+        if self.export_error is not None:
+            self.statusBar().showMessage('⚠️ Export failed')
+            QMessageBox.critical(self, "Error", f"Export failed: {self.export_error}")
+        else:
+            self.statusBar().showMessage(f"✅ Exported {worker.rows_written:,} rows to {worker.filename}")
 
 def main():
-    app = QApplication(sys.argv)
+    parser = argparse.ArgumentParser(description='Data Warehouse Dashboard')
+    parser.add_argument('--server-aggregation', action='store_true',
+                        help='aggregate every widget on the warehouse instead of loading FactOrders')
+    parser.add_argument('--auto-refresh', type=int, nargs='?', const=AUTO_REFRESH_SECONDS, default=0,
+                        metavar='SECONDS', help='poll the warehouse for new data every SECONDS and fold it in')
+    parser.add_argument('--no-snapshot', action='store_true',
+                        help='read every table from the warehouse, without the local snapshot of the last load')
+    parser.add_argument('--extract', nargs='?', const=EXTRACT_DIR, metavar='DIR',
+                        help='run offline on the CSV extract the ETL publishes (default: %(const)s)')
+    args, qt_args = parser.parse_known_args()
+    if args.extract and (args.server_aggregation or args.auto_refresh):
+        parser.error('--extract reads local files, it can not be combined with --server-aggregation or --auto-refresh')
+    
+    app = QApplication(sys.argv[:1] + qt_args)
     app.setStyle('Fusion')
     
     # Set application font
     font = QFont("Segoe UI", 9)
     app.setFont(font)
     
-    dashboard = DataWarehouseDashboard()
+    dashboard = DataWarehouseDashboard(server_aggregation=args.server_aggregation,
+                                       auto_refresh=args.auto_refresh, snapshot=not args.no_snapshot,
+                                       extract_dir=args.extract)
     dashboard.show()
     
     sys.exit(app.exec_())
@@ -0,0 +1,102 @@
+# bench_charts.py
+"""Frame time of the dashboard charts, rebuilt from scratch or updated in place
+
+py scripts/bench_charts.py --frames 50
+"""
+import argparse
+import time
+import numpy as np
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from charts import BarChart, LineChart, ScatterChart
+
+def new_figure(size):
+    """Figure on an Agg canvas, as large as a dashboard chart"""
+    figure = Figure(figsize=size)
+    FigureCanvasAgg(figure)
+    return figure
+
+def bar_frame(rng, count):
+    """Random values for a bar chart"""
+    names = [f'Category {i}' for i in range(count)]
+    return names, rng.uniform(20000, 120000, count)
+
+def drifting_bars(rng, count):
+    """Values moving by a few percent, the usual effect of a narrow filter change"""
+    base = rng.uniform(20000, 120000, count)
+    names = [f'Category {i}' for i in range(count)]
+    return lambda: (names, base * rng.uniform(0.98, 1.02, count))
+
+def line_frame(rng, count):
+    """Daily revenue over count days"""
+    dates = np.datetime64('1996-07-04') + np.arange(count).astype('timedelta64[D]')
+    return dates, rng.gamma(2.0, 800.0, count)
+
+def scatter_frame(rng, count):
+    """Orders, revenue, point sizes and colors of count employees"""
+    orders = rng.integers(40, 160, count)
+    revenue = orders * rng.uniform(1200, 1700, count)
+    avg = revenue / orders
+    return orders, revenue, 50 + avg / avg.max() * 150, avg
+
+CHARTS = {
+    'monthly bars': (lambda fig: BarChart(fig, 'Monthly Revenue Trend', 'Month', 'Revenue ($)'),
+                     (6, 3), lambda rng: bar_frame(rng, 23), lambda rng: drifting_bars(rng, 23)),
+    'top 10 barh': (lambda fig: BarChart(fig, 'Top 10 Customers', 'Total Revenue ($)', cmap=plt.cm.Greens,
+                                         horizontal=True),
+                    (6, 3), lambda rng: bar_frame(rng, 10), lambda rng: drifting_bars(rng, 10)),
+    'daily line': (lambda fig: LineChart(fig, 'Daily Sales Trend', 'Date', 'Revenue ($)', date_format='%m-%d'),
+                   (6, 4), lambda rng: line_frame(rng, 480), None),
+    'daily line 10y': (lambda fig: LineChart(fig, 'Daily Sales Trend', 'Date', 'Revenue ($)', date_format='%m-%d'),
+                       (6, 4), lambda rng: line_frame(rng, 3650), None),
+    'employee scatter': (lambda fig: ScatterChart(fig, 'Employee Performance Analysis', 'Number of Orders',
+                                                  'Total Revenue ($)', 'Average Order Value ($)'),
+                         (5, 4), lambda rng: scatter_frame(rng, 9), None),
+}
+
+def time_frames(frames, render):
+    """Milliseconds per call of render"""
+    timings = []
+    for _ in range(frames):
+        start = time.perf_counter()
+        render()
+        timings.append((time.perf_counter() - start) * 1000)
+    return np.array(timings)
+
+def main():
+    parser = argparse.ArgumentParser(description='Chart frame time benchmark')
+    parser.add_argument('--frames', type=int, default=50, help='frames timed per scenario')
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    print(f"{'chart':<18}{'scenario':<26}{'mean ms':>10}{'p95 ms':>10}")
+    for name, (make_chart, size, new_data, drift) in CHARTS.items():
+        # Former behaviour: clear the figure and build every artist again
+        figure = new_figure(size)
+        def rebuild():
+            chart = make_chart(figure)
+            chart.update(*new_data(rng))
+            figure.canvas.mpl_disconnect(chart.draw_cid)
+        scenarios = [('rebuild (fig.clf)', time_frames(args.frames, rebuild))]
+
+        # Same artists, new data
+        chart = make_chart(new_figure(size))
+        chart.update(*new_data(rng))
+        scenarios.append(('update in place', time_frames(
+            args.frames, lambda: chart.update(*new_data(rng)))))
+
+        # Small changes keep the limits, only the data artists are blitted
+        if drift is not None:
+            next_frame = drift(rng)
+            chart.update(*next_frame())
+            scenarios.append(('update, blitted', time_frames(
+                args.frames, lambda: chart.update(*next_frame()))))
+
+        for scenario, timings in scenarios:
+            print(f"{name:<18}{scenario:<26}{timings.mean():>10.2f}{np.percentile(timings, 95):>10.2f}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+# bench_fetch.py
+"""Rows per second of the warehouse reads, through pd.read_sql or the columnar fetch
+
+py scripts/bench_fetch.py --repeat 5
+"""
+import argparse
+import time
+import warnings
+import numpy as np
+import pandas as pd
+import columnar_fetch
+from columnar_fetch import read_columnar
+from warehouse import warehouse_backend
+
+# The dashboard loads and the ETL key pulls, as they hit the warehouse
+QUERIES = {
+    'FactOrders': """
+        SELECT OrderID, CustomerKey, EmployeeKey, OrderDateKey, OrderDate, TotalAmount,
+               Freight, IsDelivered, SourceSystem
+        FROM FactOrders
+    """,
+    'DimCustomer': "SELECT CustomerKey, CustomerID, CompanyName, Country, City, ContactName FROM DimCustomer",
+    'DimEmployee': "SELECT EmployeeKey, FirstName, LastName, Title, Country FROM DimEmployee",
+    'DimDate': "SELECT DateKey, Date, Year, Quarter, Month, MonthName, DayOfWeek FROM DimDate",
+    'order keys': "SELECT OrderID, SourceSystem FROM FactOrders",
+}
+
+def time_reads(repeat, read):
+    """Rows read and seconds per call of read, best of repeat"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        rows = len(read())
+        timings.append(time.perf_counter() - start)
+    return rows, np.array(timings)
+
+def main():
+    parser = argparse.ArgumentParser(description='Warehouse fetch throughput benchmark')
+    parser.add_argument('--repeat', type=int, default=5, help='reads timed per query and method')
+    parser.add_argument('--warehouse', help="'sqlserver' or 'sqlite:<path>', DW_WAREHOUSE by default")
+    parser.add_argument('--batch-rows', type=int, default=columnar_fetch.COLUMNAR_BATCH_ROWS,
+                        help='rows per fetchmany call of the columnar fetch')
+    args = parser.parse_args()
+
+    warehouse = warehouse_backend(args.warehouse)
+    conn = warehouse.connect()
+    connection_string = warehouse.connection_string()
+    # pandas warns on every read through a raw DBAPI connection other than sqlite3
+    warnings.filterwarnings('ignore', message='pandas only supports SQLAlchemy')
+
+    methods = {
+        'pd.read_sql': lambda query: pd.read_sql(query, conn),
+        'fetchmany columnar': lambda query: read_columnar(conn, query, batch_rows=args.batch_rows),
+    }
+    if connection_string and columnar_fetch.read_arrow_batches_from_odbc is not None:
+        methods['arrow-odbc'] = lambda query: read_columnar(conn, query, connection_string=connection_string,
+                                                            batch_rows=args.batch_rows)
+
+    print(f"warehouse {warehouse.spec}")
+    print(f"{'query':<14}{'method':<22}{'rows':>10}{'best ms':>10}{'rows/s':>14}{'speedup':>9}")
+    for name, query in QUERIES.items():
+        baseline = None
+        for method, read in methods.items():
+            rows, timings = time_reads(args.repeat, lambda: read(query))
+            best = timings.min()
+            baseline = baseline or best
+            print(f"{name:<14}{method:<22}{rows:>10}{best * 1000:>10.1f}{rows / best:>14,.0f}{baseline / best:>8.2f}x")
+    conn.close()
+
+if __name__ == '__main__':
+    main()
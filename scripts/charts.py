@@ -0,0 +1,599 @@
+# charts.py
+import numpy as np
+import matplotlib.pyplot as plt
+import matplotlib.dates as mdates
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+from matplotlib.ticker import FixedLocator, FuncFormatter, MaxNLocator
+
+# Axes pixels per drawn line point, per marker, and per tick label on period axes
+POINT_SPACING_PX = 2
+MARKER_SPACING_PX = 8
+TICK_SPACING_PX = 70
+
+def money_formatter():
+    """Axis formatter for amounts"""
+    return FuncFormatter(lambda x, p: f'${x:,.0f}')
+
+def nice_limit(value):
+    """Round an axis maximum up to a tick, so small data changes keep the same axes"""
+    if not np.isfinite(value) or value <= 0:
+        return 1.0
+    return float(MaxNLocator(nbins=6).tick_values(0, value)[-1])
+
+def nice_range(low, high, margin=0.05):
+    """Axis range around [low, high] with a margin, snapped to ticks"""
+    if not (np.isfinite(low) and np.isfinite(high)):
+        return (0.0, 1.0)
+    pad = (high - low) * margin or abs(high) * margin or 1.0
+    ticks = MaxNLocator(nbins=6).tick_values(low - pad, high + pad)
+    # Amounts that are never negative keep zero as their floor
+    floor = max(float(ticks[0]), 0.0) if low >= 0 else float(ticks[0])
+    return (floor, float(ticks[-1]))
+
+def lttb(x, y, threshold):
+    """Indexes of the points Largest-Triangle-Three-Buckets keeps out of sorted x
+
+    The first and last points are kept; every bucket in between keeps the
+    point forming the largest triangle with the point kept before it and the
+    mean of the next bucket, which preserves peaks and troughs.
+    """
+    count = len(x)
+    if threshold >= count or threshold < 3:
+        return np.arange(count)
+    edges = np.linspace(1, count - 1, threshold - 1).astype(int)
+    keep = np.empty(threshold, dtype=int)
+    keep[0], keep[-1] = 0, count - 1
+    kept = 0
+    for i in range(threshold - 2):
+        start, end = edges[i], edges[i + 1]
+        after = edges[i + 2] if i + 2 < len(edges) else count
+        next_x, next_y = x[end:after].mean(), y[end:after].mean()
+        area = np.abs((x[kept] - next_x) * (y[start:end] - y[kept])
+                      - (x[kept] - x[start:end]) * (next_y - y[kept]))
+        kept = start + int(np.argmax(area))
+        keep[i + 1] = kept
+    return keep
+
+class HitMap:
+    """Where the items of a drawn chart are, to find the one under a click
+
+    It only holds copies, so the thread drawing the chart can hand it to the
+    thread receiving the clicks. find gets the click in display pixels and
+    in data coordinates and returns the index of the item, or None.
+    """
+
+    def __init__(self, keys, bbox, transform, find):
+        self.keys = keys
+        self.bbox = bbox
+        self.to_data = transform.inverted()
+        self.find = find
+
+    def key_at(self, x, y):
+        """Key of the item at display pixel (x, y), None when there is none"""
+        if not self.bbox.contains(x, y):
+            return None
+        xdata, ydata = self.to_data.transform((x, y))
+        index = self.find(x, y, xdata, ydata)
+        return None if index is None else self.keys[index]
+
+class Chart:
+    """Axes built once, whose data artists are then updated in place
+
+    Data artists are animated when the canvas can blit: a draw that only
+    moves them restores the saved background and redraws just those
+    artists. Changes of ticks, limits or fonts set needs_layout and go
+    through a full draw.
+
+    Each drawn item has a key; on_select reports the key of a clicked item.
+    """
+
+    def __init__(self, figure, title, xlabel=None, ylabel=None):
+        self.figure = figure
+        self.title = title
+        self.xlabel = xlabel
+        self.ylabel = ylabel
+        self.blit = figure.canvas.supports_blit
+        self.background = None
+        self.font_sizes = None
+        self.batching = False
+        self.draw_cid = figure.canvas.mpl_connect('draw_event', self.on_draw)
+        self.setup()
+
+    def setup(self):
+        """Create the axes with their static styling"""
+        self.figure.clf()
+        self.figure.patch.set_facecolor('white')
+        self.ax = self.figure.add_subplot(111)
+        self.animated = []
+        self.keys = []
+        self.message = None
+        self.needs_layout = True
+        self.style_axes()
+        if self.font_sizes is not None:
+            sizes, self.font_sizes = self.font_sizes, None
+            self.set_font_sizes(*sizes)
+
+    def style_axes(self):
+        """Titles, colors and spines shared by the dashboard charts"""
+        ax = self.ax
+        ax.set_facecolor('#f8f9fa')
+        if self.xlabel:
+            ax.set_xlabel(self.xlabel, fontsize=10, color='#495057')
+        if self.ylabel:
+            ax.set_ylabel(self.ylabel, fontsize=10, color='#495057')
+        ax.set_title(self.title, fontsize=12, fontweight='bold', color='#2c3e50', pad=10)
+        ax.tick_params(axis='both', colors='#6c757d', labelsize=8)
+
+        # Remove top and right spines
+        ax.spines['top'].set_visible(False)
+        ax.spines['right'].set_visible(False)
+        ax.spines['left'].set_color('#dee2e6')
+        ax.spines['bottom'].set_color('#dee2e6')
+
+    def set_title(self, title):
+        """Change the title text, keeping its style"""
+        if title != self.title:
+            self.title = title
+            self.ax.title.set_text(title)
+            self.needs_layout = True
+
+    def set_font_sizes(self, title_size, label_size, tick_size):
+        """Scale the chart text"""
+        sizes = (title_size, label_size, tick_size)
+        if sizes == self.font_sizes:
+            return
+        self.font_sizes = sizes
+        self.ax.title.set_fontsize(title_size)
+        self.ax.xaxis.label.set_fontsize(label_size)
+        self.ax.yaxis.label.set_fontsize(label_size)
+        self.ax.tick_params(axis='both', labelsize=tick_size)
+        self.needs_layout = True
+
+    def show_message(self, text):
+        """Replace the chart with a centered message"""
+        self.setup()
+        self.ax.text(0.5, 0.5, text, ha='center', va='center', transform=self.ax.transAxes,
+                     fontsize=12, color='#6c757d')
+        self.ax.set_xticks([])
+        self.ax.set_yticks([])
+        for spine in self.ax.spines.values():
+            spine.set_visible(False)
+        self.message = text
+        self.render()
+
+    def clear_message(self):
+        """Rebuild the axes if a message replaced the chart"""
+        if self.message is not None:
+            self.setup()
+
+    def on_select(self, callback):
+        """Call callback with the key of each clicked item"""
+        self.figure.canvas.mpl_connect('button_press_event', lambda event: self.on_click(event, callback))
+
+    def on_click(self, event, callback):
+        """Report the item under a left click"""
+        hits = self.hit_map()
+        if event.button == 1 and hits is not None:
+            key = hits.key_at(event.x, event.y)
+            if key is not None:
+                callback(key)
+
+    def hit_map(self):
+        """HitMap of the items as last drawn, None when none can be clicked"""
+        find = self.item_finder() if self.message is None else None
+        if find is None or not self.keys:
+            return None
+        return HitMap(list(self.keys), self.ax.bbox.frozen(), self.ax.transData.frozen(), find)
+
+    def item_finder(self):
+        """Function finding the clicked item for a HitMap, None when items cannot be selected"""
+        return None
+
+    def resized(self):
+        """Lay the chart out again for a new figure size"""
+        self.needs_layout = True
+
+    def apply(self, calls):
+        """Make the (method name, args, kwargs) calls, then draw once"""
+        self.batching = True
+        try:
+            for name, args, kwargs in calls:
+                getattr(self, name)(*args, **kwargs)
+        finally:
+            self.batching = False
+        self.render()
+
+    def on_draw(self, event):
+        """Keep the static background and draw the data artists over it"""
+        if self.blit:
+            self.background = self.figure.canvas.copy_from_bbox(self.figure.bbox)
+            for artist in self.animated:
+                self.ax.draw_artist(artist)
+
+    def render(self):
+        """Redraw the figure, blitting when only data artists changed"""
+        if self.batching:
+            return
+        canvas = self.figure.canvas
+        if self.needs_layout or self.background is None or not self.blit:
+            self.needs_layout = False
+            self.figure.tight_layout(pad=1.0)
+            canvas.draw()
+        else:
+            canvas.restore_region(self.background)
+            for artist in self.animated:
+                self.ax.draw_artist(artist)
+            canvas.blit(self.figure.bbox)
+
+class BarChart(Chart):
+    """Bars with value labels, one per category"""
+
+    def __init__(self, figure, title, xlabel=None, ylabel=None, cmap=plt.cm.Blues,
+                 color_range=(0.4, 0.8), horizontal=False, value_format='${:,.0f}',
+                 money_axis=True, rotation=45):
+        self.cmap = cmap
+        self.color_range = color_range
+        self.horizontal = horizontal
+        self.value_format = value_format
+        self.money_axis = money_axis
+        self.rotation = rotation
+        self.value_size = 7
+        super().__init__(figure, title, xlabel, ylabel)
+
+    def setup(self):
+        self.bars = None
+        self.value_labels = []
+        self.names = None
+        self.limit = None
+        super().setup()
+        self.ax.grid(True, axis='x' if self.horizontal else 'y', alpha=0.2, linestyle='--', linewidth=0.5)
+        if self.money_axis:
+            value_axis = self.ax.xaxis if self.horizontal else self.ax.yaxis
+            value_axis.set_major_formatter(money_formatter())
+
+    def set_font_sizes(self, title_size, label_size, tick_size):
+        super().set_font_sizes(title_size, label_size, tick_size)
+        self.value_size = max(6, int(tick_size * 0.8))
+        for label in self.value_labels:
+            label.set_fontsize(self.value_size)
+
+    def create_bars(self, count):
+        """Replace the bars and their labels when the number of categories changes"""
+        if self.bars is not None:
+            self.bars.remove()
+        for label in self.value_labels:
+            label.remove()
+
+        colors = self.cmap(np.linspace(*self.color_range, count))
+        draw = self.ax.barh if self.horizontal else self.ax.bar
+        self.bars = draw(range(count), np.zeros(count), color=colors, edgecolor='white',
+                         linewidth=1.0, animated=self.blit)
+        ha, va = ('left', 'center') if self.horizontal else ('center', 'bottom')
+        self.value_labels = [
+            self.ax.text(0, 0, '', ha=ha, va=va, fontsize=self.value_size, fontweight='medium',
+                         color='#2c3e50', animated=self.blit)
+            for _ in range(count)
+        ]
+        self.animated = list(self.bars) + self.value_labels
+
+        # Highest value on top for horizontal bars
+        if self.horizontal:
+            self.ax.set_ylim(count - 0.4, -0.6)
+        else:
+            self.ax.set_xlim(-0.6, count - 0.4)
+        self.needs_layout = True
+
+    def update(self, names, values, show_values=True, keys=None):
+        """Show new values, only the changed artists are touched; keys default to the names"""
+        self.clear_message()
+        names = [str(name) for name in names]
+        values = np.asarray(values, dtype=float)
+        self.keys = list(keys) if keys is not None else names
+
+        if self.bars is None or len(self.bars) != len(values):
+            self.create_bars(len(values))
+        if names != self.names:
+            self.names = names
+            if self.horizontal:
+                self.ax.set_yticks(range(len(names)))
+                self.ax.set_yticklabels(names)
+            else:
+                self.ax.set_xticks(range(len(names)))
+                self.ax.set_xticklabels(names, rotation=self.rotation,
+                                        ha='right' if self.rotation else 'center')
+            self.needs_layout = True
+
+        for bar, label, value in zip(self.bars, self.value_labels, values):
+            if self.horizontal:
+                bar.set_width(value)
+                label.set_position((value + value * 0.01, bar.get_y() + bar.get_height() / 2.))
+            else:
+                bar.set_height(value)
+                label.set_position((bar.get_x() + bar.get_width() / 2., value + value * 0.01))
+            label.set_text(self.value_format.format(value))
+            label.set_visible(show_values and value > 0)
+
+        # Headroom for the value labels
+        limit = nice_limit(values.max() * 1.1 if len(values) else 0)
+        if limit != self.limit:
+            self.limit = limit
+            if self.horizontal:
+                self.ax.set_xlim(0, limit)
+            else:
+                self.ax.set_ylim(0, limit)
+            self.needs_layout = True
+        self.render()
+
+    def item_finder(self):
+        """Bar whose category slot holds the click"""
+        count, horizontal = len(self.keys), self.horizontal
+
+        def find(x, y, xdata, ydata):
+            position = ydata if horizontal else xdata
+            index = int(round(position))
+            if 0 <= index < count and abs(position - index) <= 0.4:
+                return index
+            return None
+        return find
+
+class LineChart(Chart):
+    """Line over a date axis, thinned to the points the axes width can show
+
+    The full series is kept; what is drawn is an LTTB sample of about one
+    point per POINT_SPACING_PX of axes width, taken again when the canvas
+    is resized, so a draw costs the same for one month or ten years.
+    """
+
+    def __init__(self, figure, title, xlabel=None, ylabel=None, date_format=None, rotation=0):
+        self.date_format = date_format
+        self.rotation = rotation
+        self.xdata = np.empty(0)
+        self.values = np.empty(0)
+        self.tick_format = None
+        super().__init__(figure, title, xlabel, ylabel)
+        figure.canvas.mpl_connect('resize_event', self.on_resize)
+
+    def setup(self):
+        self.limits = None
+        self.ticks = None
+        super().setup()
+        self.ax.grid(True, alpha=0.2, linestyle='--')
+        self.ax.yaxis.set_major_formatter(money_formatter())
+        self.line, = self.ax.plot([], [], color='#3498db', linewidth=2.0, marker='o', markersize=4,
+                                  animated=self.blit)
+        self.animated = [self.line]
+        self.ax.xaxis_date()
+        self.set_tick_format(self.tick_format)
+
+    def set_tick_format(self, tick_format):
+        """Automatic date ticks, or ticks on the points labelled by a strftime format or function"""
+        self.tick_format = tick_format
+        self.ticks = None
+        if tick_format is None:
+            locator = mdates.AutoDateLocator()
+            self.ax.xaxis.set_major_locator(locator)
+            self.ax.xaxis.set_major_formatter(
+                mdates.DateFormatter(self.date_format) if self.date_format else mdates.AutoDateFormatter(locator))
+        elif callable(tick_format):
+            self.ax.xaxis.set_major_formatter(FuncFormatter(lambda x, p: tick_format(mdates.num2date(x))))
+        else:
+            self.ax.xaxis.set_major_formatter(mdates.DateFormatter(tick_format))
+
+    def update(self, dates, values, tick_format=None):
+        """Show a new series; tick_format puts the ticks on the points (period buckets)"""
+        if self.message is not None:
+            self.setup()
+        if tick_format != self.tick_format:
+            self.set_tick_format(tick_format)
+            self.needs_layout = True
+
+        xdata = mdates.date2num(np.asarray(dates, dtype='datetime64[ns]'))
+        values = np.asarray(values, dtype=float)
+        order = np.argsort(xdata, kind='stable')
+        self.xdata, self.values = xdata[order], values[order]
+
+        if len(xdata):
+            span = (xdata.max() - xdata.min()) * 0.05 or 1.0
+            limits = ((xdata.min() - span, xdata.max() + span),
+                      nice_range(np.nanmin(values), np.nanmax(values)))
+        else:
+            limits = ((0.0, 1.0), (0.0, 1.0))
+        if limits != self.limits:
+            self.limits = limits
+            self.ax.set_xlim(*limits[0])
+            self.ax.set_ylim(*limits[1])
+            self.needs_layout = True
+        self.fit_to_width()
+        self.render()
+
+    def fit_to_width(self):
+        """Sample the series and place the ticks for the current axes width"""
+        width = max(self.ax.bbox.width, 1.0)
+        keep = lttb(self.xdata, self.values, int(width / POINT_SPACING_PX))
+        self.line.set_data(self.xdata[keep], self.values[keep])
+        # Markers only while they stay apart
+        self.line.set_marker('o' if len(keep) * MARKER_SPACING_PX <= width else 'None')
+
+        if self.tick_format is not None:
+            step = max(1, int(np.ceil(len(self.xdata) * TICK_SPACING_PX / width)))
+            ticks = tuple(self.xdata[::step])
+            if ticks != self.ticks:
+                self.ticks = ticks
+                self.ax.xaxis.set_major_locator(FixedLocator(ticks))
+                self.needs_layout = True
+        if self.rotation:
+            plt.setp(self.ax.get_xticklabels(), rotation=self.rotation, ha='right')
+
+    def on_resize(self, event):
+        """Resample for the new width, the canvas redraws after resizing"""
+        self.resized()
+
+    def resized(self):
+        super().resized()
+        if self.message is None and len(self.xdata):
+            self.fit_to_width()
+
+class PieChart(Chart):
+    """Pie with percentage labels"""
+
+    def __init__(self, figure, title, colors):
+        self.colors = colors
+        super().__init__(figure, title)
+
+    def setup(self):
+        self.wedges = []
+        self.slices = []
+        super().setup()
+
+    def style_axes(self):
+        self.ax.set_title(self.title, fontsize=12, fontweight='bold', color='#2c3e50', pad=10)
+
+    def update(self, labels, values):
+        """Replace the wedges, the axes and title are kept"""
+        self.clear_message()
+        for artist in self.wedges:
+            artist.remove()
+        wedges, texts, autotexts = self.ax.pie(
+            values,
+            labels=labels,
+            colors=self.colors,
+            autopct='%1.1f%%',
+            startangle=90
+        )
+        self.wedges = wedges + texts + autotexts
+        self.slices = wedges
+        self.keys = list(labels)
+        self.ax.axis('equal')
+        self.needs_layout = True
+        self.render()
+
+    def item_finder(self):
+        """Wedge whose angle range holds the click, inside the unit circle"""
+        angles = [(wedge.theta1, wedge.theta2) for wedge in self.slices]
+
+        def find(x, y, xdata, ydata):
+            if np.hypot(xdata, ydata) > 1:
+                return None
+            angle = np.degrees(np.arctan2(ydata, xdata))
+            for index, (theta1, theta2) in enumerate(angles):
+                if (angle - theta1) % 360 < theta2 - theta1:
+                    return index
+            return None
+        return find
+
+class ScatterChart(Chart):
+    """Scatter whose point colors are explained by a colorbar"""
+
+    def __init__(self, figure, title, xlabel, ylabel, colorbar_label, cmap='viridis'):
+        self.colorbar_label = colorbar_label
+        self.cmap = cmap
+        self.annotation_size = 7
+        super().__init__(figure, title, xlabel, ylabel)
+
+    def setup(self):
+        self.scatter = None
+        self.colorbar = None
+        self.annotations = []
+        self.limits = None
+        super().setup()
+        self.ax.grid(True, alpha=0.2, linestyle='--')
+        self.ax.yaxis.set_major_formatter(money_formatter())
+
+    def set_font_sizes(self, title_size, label_size, tick_size):
+        super().set_font_sizes(title_size, label_size, tick_size)
+        self.annotation_size = max(6, int(tick_size * 0.8))
+        if self.colorbar is not None:
+            self.colorbar.set_label(self.colorbar_label, fontsize=label_size - 1)
+
+    def update(self, x, y, sizes, colors, annotations=(), keys=None):
+        """Move the points and replace the (text, (x, y)) annotations; keys default to positions"""
+        self.clear_message()
+        self.keys = list(keys) if keys is not None else list(range(len(x)))
+        x = np.asarray(x, dtype=float)
+        y = np.asarray(y, dtype=float)
+        colors = np.asarray(colors, dtype=float)
+
+        if self.scatter is None:
+            self.scatter = self.ax.scatter(x, y, s=sizes, c=colors, cmap=self.cmap, alpha=0.7,
+                                           edgecolors='white', linewidth=0.5, animated=self.blit)
+            self.colorbar = self.figure.colorbar(self.scatter, ax=self.ax, pad=0.01)
+            label_size = self.font_sizes[1] - 1 if self.font_sizes else 9
+            self.colorbar.set_label(self.colorbar_label, fontsize=label_size)
+            self.needs_layout = True
+        else:
+            self.scatter.set_offsets(np.column_stack([x, y]))
+            self.scatter.set_sizes(np.asarray(sizes, dtype=float))
+            self.scatter.set_array(colors)
+            clim = (colors.min(), colors.max())
+            if clim != self.scatter.get_clim():
+                self.scatter.set_clim(*clim)
+                self.needs_layout = True
+
+        for annotation in self.annotations:
+            annotation.remove()
+        self.annotations = [
+            self.ax.annotate(
+                text, point,
+                fontsize=self.annotation_size,
+                ha='center',
+                bbox=dict(boxstyle="round,pad=0.3", facecolor="white",
+                          edgecolor="#dee2e6", alpha=0.9),
+                animated=self.blit
+            )
+            for text, point in annotations
+        ]
+        self.animated = [self.scatter] + self.annotations
+
+        limits = (nice_range(x.min(), x.max(), margin=0.1), nice_range(y.min(), y.max(), margin=0.1))
+        if limits != self.limits:
+            self.limits = limits
+            self.ax.set_xlim(*limits[0])
+            self.ax.set_ylim(*limits[1])
+            self.needs_layout = True
+        self.render()
+
+    def item_finder(self):
+        """Nearest point, if the click falls on its marker"""
+        if self.scatter is None:
+            return None
+        points = self.ax.transData.transform(self.scatter.get_offsets())
+        # Marker sizes are areas in points squared
+        sizes = self.scatter.get_sizes()
+        radii = np.sqrt(np.resize(sizes, len(points))) / 2 * self.figure.dpi / 72
+
+        def find(x, y, xdata, ydata):
+            distances = np.hypot(points[:, 0] - x, points[:, 1] - y)
+            index = int(np.argmin(distances))
+            return index if distances[index] <= max(radii[index], 5) else None
+        return find
+
+class OffscreenChart:
+    """A chart on an Agg figure of its own, for a single render thread
+
+    The chart and its figure are built on the first draw and then kept, so
+    only the thread drawing them ever touches them. Each draw gets the
+    chart calls recorded since the last one and the size to draw at, and
+    returns the figure pixels and the HitMap of the frame.
+    """
+
+    def __init__(self, chart_class, *args, **kwargs):
+        self.chart_class = chart_class
+        self.args = args
+        self.kwargs = kwargs
+        self.chart = None
+
+    def draw(self, calls, size_inches, dpi):
+        """RGBA buffer of the figure after the calls, and its HitMap"""
+        if self.chart is None:
+            figure = Figure(figsize=size_inches, dpi=dpi)
+            FigureCanvasAgg(figure)
+            self.chart = self.chart_class(figure, *self.args, **self.kwargs)
+        else:
+            figure = self.chart.figure
+            if dpi != figure.dpi or tuple(size_inches) != tuple(figure.get_size_inches()):
+                figure.set_dpi(dpi)
+                figure.set_size_inches(size_inches, forward=False)
+                self.chart.resized()
+        self.chart.apply(calls)
+        return figure.canvas.get_renderer().buffer_rgba(), self.chart.hit_map()
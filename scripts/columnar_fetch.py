@@ -0,0 +1,158 @@
+# columnar_fetch.py
+from decimal import Decimal
+from operator import itemgetter
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+try:
+    from arrow_odbc import read_arrow_batches_from_odbc
+except ImportError:  # optional, reads straight into Arrow buffers without pyodbc rows
+    read_arrow_batches_from_odbc = None
+
+# Rows per fetchmany call, or per Arrow batch read through arrow-odbc
+COLUMNAR_BATCH_ROWS = 20000
+
+def numeric_chunk(array):
+    """Arrow DECIMAL and MONEY columns as doubles, as pd.read_sql coerces Decimal values
+
+    Through text, which rounds each value to the nearest double as float()
+    does; Arrow's direct decimal cast can be off by one unit in the last place.
+    """
+    if pa.types.is_decimal(array.type):
+        return array.cast(pa.string()).cast(pa.float64())
+    return array
+
+def object_chunk(values):
+    """Object array of Python values"""
+    chunk = np.empty(len(values), dtype=object)
+    chunk[:] = values
+    return chunk
+
+def column_chunk(values):
+    """Arrow array of the values of one column of a batch
+
+    Columns whose values mix types, as SQLite allows, stay an object array.
+    Decimal values become doubles through float(), as pd.read_sql converts
+    them and much faster than building an Arrow decimal array from them.
+    """
+    first = next((value for value in values if value is not None), None)
+    try:
+        if isinstance(first, Decimal):
+            return pa.array([None if value is None else float(value) for value in values], type=pa.float64())
+        return pa.array(values)
+    except (pa.ArrowInvalid, pa.ArrowTypeError, TypeError, ValueError):
+        return object_chunk(values)
+
+def cursor_batches(conn, query, params, batch_rows):
+    """Column names and column chunks of each fetchmany batch of a query"""
+    cursor = conn.cursor()
+    try:
+        if params:
+            cursor.execute(query, params)
+        else:
+            cursor.execute(query)
+        names = [column[0] for column in cursor.description]
+        yield names, None
+        while True:
+            rows = cursor.fetchmany(batch_rows)
+            if not rows:
+                break
+            # One list per column, each converted by Arrow in a single call
+            yield names, [column_chunk(list(map(itemgetter(i), rows))) for i in range(len(names))]
+    finally:
+        cursor.close()
+
+def odbc_batches(connection_string, query, params, batch_rows):
+    """Column names and column chunks of each batch arrow-odbc reads"""
+    reader = read_arrow_batches_from_odbc(
+        query=query, connection_string=connection_string, batch_size=batch_rows,
+        parameters=list(params) if params else None)
+    names = reader.schema.names
+    yield names, None
+    for batch in reader:
+        yield names, [numeric_chunk(column) for column in batch.columns]
+
+def text_params(params):
+    """Whether every parameter is text or NULL, the only values arrow-odbc binds"""
+    return all(value is None or isinstance(value, str) for value in params or [])
+
+def query_batches(conn, query, params=None, connection_string=None, batch_rows=COLUMNAR_BATCH_ROWS):
+    """Batches of a query, from the cursor of conn or through arrow-odbc
+
+    arrow-odbc is used when it is installed, connection_string is the one
+    conn was opened with and the parameters are text, as it binds them all
+    as VARCHAR; dates and numbers go through the cursor with their types.
+    It reads on a connection of its own, so it only sees what conn has
+    committed. The first batch has no chunks, it only carries the column names.
+    """
+    if connection_string and read_arrow_batches_from_odbc is not None and text_params(params):
+        return odbc_batches(connection_string, query, params, batch_rows)
+    return cursor_batches(conn, query, params, batch_rows)
+
+def column_array(chunks):
+    """Chunked Arrow array of one column, None when its chunks do not share a type"""
+    if not all(isinstance(chunk, pa.Array) for chunk in chunks):
+        return None
+    types = {chunk.type for chunk in chunks} - {pa.null()}
+    # SQLite may return whole numbers in one batch and reals in the next
+    if len(types) > 1 and all(pa.types.is_integer(t) or pa.types.is_floating(t) for t in types):
+        types = {pa.float64()}
+    if len(types) > 1:
+        return None
+    target = types.pop() if types else pa.null()
+    return pa.chunked_array([chunk.cast(target) for chunk in chunks], type=target)
+
+def object_series(chunks):
+    """One frame column of Python objects, as read_sql returns mixed columns"""
+    values = [chunk if isinstance(chunk, np.ndarray) else object_chunk(chunk.to_pylist()) for chunk in chunks]
+    return pd.Series(np.concatenate(values), dtype=object)
+
+def batches_frame(names, columns, parse_dates=None):
+    """DataFrame of column chunks, dates of parse_dates converted as read_sql does"""
+    if columns is None:
+        df = pd.DataFrame(columns=names)
+    else:
+        arrays = [column_array(chunks) for chunks in columns]
+        if all(array is not None for array in arrays):
+            # A single conversion of the whole table to pandas blocks
+            df = pa.Table.from_arrays(arrays, names=names).to_pandas()
+        else:
+            df = pd.concat([array.to_pandas() if array is not None else object_series(chunks)
+                            for array, chunks in zip(arrays, columns)], axis=1)
+            df.columns = names
+    for col in parse_dates or []:
+        df[col] = pd.to_datetime(df[col])
+    return df
+
+def read_columnar(conn, query, params=None, parse_dates=None, connection_string=None,
+                  batch_rows=COLUMNAR_BATCH_ROWS):
+    """Result of a query as a DataFrame, like pd.read_sql but filled column by column
+
+    Each fetchmany batch is transposed and converted to typed Arrow arrays,
+    so pandas never boxes the rows again; with arrow-odbc the driver fills
+    the buffers and no row object is created at all.
+    """
+    columns = None
+    for names, chunks in query_batches(conn, query, params, connection_string, batch_rows):
+        if chunks is None:
+            continue
+        if columns is None:
+            columns = [[] for _ in names]
+        for column, chunk in zip(columns, chunks):
+            column.append(chunk)
+    return batches_frame(names, columns, parse_dates)
+
+def iter_columnar(conn, query, params=None, parse_dates=None, connection_string=None,
+                  batch_rows=COLUMNAR_BATCH_ROWS):
+    """Result of a query as one DataFrame per batch, like pd.read_sql with chunksize
+
+    An empty result still gives one empty frame with the column names.
+    """
+    empty = True
+    for names, chunks in query_batches(conn, query, params, connection_string, batch_rows):
+        if chunks is not None:
+            empty = False
+            yield batches_frame(names, [[chunk] for chunk in chunks], parse_dates)
+    if empty:
+        yield batches_frame(names, None, parse_dates)
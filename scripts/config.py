@@ -4,17 +4,12 @@ import pandas as pd
 from sqlalchemy import create_engine
 import warnings
 warnings.filterwarnings('ignore')
-from connect import connect_sql_server, connect_data_werehouse
+from connect import (connect_sql_server, connect_data_werehouse, access_connection_string,
+                     NORTHWIND_CONNECTION_STRING, ACCESS_DB_PATH)
 
 class DatabaseConfig:
     # Configuration SQL Server Northwind (source)
-    SQL_SERVER = pyodbc.connect(
-        'DRIVER={ODBC Driver 18 for SQL Server};'
-        'SERVER=localhost;'
-        'DATABASE=Northwind;'
-        'Trusted_Connection=yes;'
-        'Encrypt=no;'
-    )
+    SQL_SERVER_CONNECTION_STRING = NORTHWIND_CONNECTION_STRING
     
     # Configuration SQL Server Data Warehouse (destination)
     DW_SERVER = {
@@ -25,8 +20,8 @@ class DatabaseConfig:
         'Encrypt': 'no'
     }
     
-    # Configuration Access (si n�cessaire)
-    ACCESS_DB_PATH = r'C:\\Users\\Sos\\Desktop\\BI PROject\\Northwind 2012.accdb'  # � adapter
+    # Configuration Access (si nécessaire)
+    ACCESS_DB_PATH = ACCESS_DB_PATH  # à adapter dans connect.py
 
 def create_sql_connection():
     return connect_sql_server()
@@ -2,17 +2,23 @@ import pandas as pd
 import pyodbc
 import matplotlib.pyplot as plt
 import seaborn as sns
+from warehouse import warehouse_backend
+from columnar_fetch import read_columnar
 
 # 1. CONNEXION SQL SERVER
+# Chaînes ODBC des sources, aussi reprises par config.py et par les lectures arrow-odbc de l'ETL
+NORTHWIND_CONNECTION_STRING = (
+    'DRIVER={ODBC Driver 18 for SQL Server};'
+    'SERVER=localhost;'
+    'DATABASE=Northwind;'
+    'Trusted_Connection=yes;'
+    'Encrypt=no;'
+)
+ACCESS_DB_PATH = r"C:\\Users\\Sos\\Desktop\\BI PROject\\Northwind 2012.accdb"
+
 def connect_sql_server():
     try:
-        conn_sql = pyodbc.connect(
-        'DRIVER={ODBC Driver 18 for SQL Server};'
-        'SERVER=localhost;'
-        'DATABASE=Northwind;'
-        'Trusted_Connection=yes;'
-        'Encrypt=no;'
-        )
+        conn_sql = pyodbc.connect(NORTHWIND_CONNECTION_STRING)
         print("Connexion SQL Server (Northwind) reussie")
         return conn_sql
     except Exception as e:
@@ -21,14 +27,9 @@ def connect_sql_server():
     
 def connect_data_werehouse():
     try:
-        conn_sql = pyodbc.connect(
-        'DRIVER={ODBC Driver 18 for SQL Server};'
-        'SERVER=localhost;'
-        'DATABASE=DataWareHouse;'
-        'Trusted_Connection=yes;'
-        'Encrypt=no;'
-        )
-        print("Connexion SQL Server r�ussie")
+        warehouse = warehouse_backend()
+        conn_sql = warehouse.connect()
+        print(f"Connexion data warehouse réussie ({warehouse.spec})")
         return conn_sql
     except Exception as e:
         print(f"Erreur SQL Server: {e}")
@@ -47,7 +48,7 @@ def load_excel_files():
     for name, file in excel_files.items():
         try:
             dataframes[name] = pd.read_excel(file)
-            print(f"Fichier {file} charg�")
+            print(f"Fichier {file} chargé")
         except Exception as e:
             print(f"Erreur chargement {file}: {e}")
     
@@ -55,25 +56,24 @@ def load_excel_files():
 
 
 
-def get_access_connection():
-    access_file_path = r"C:\\Users\\Sos\\Desktop\\BI PROject\\Northwind 2012.accdb"
+def access_connection_string(access_file_path=ACCESS_DB_PATH):
+    if access_file_path.endswith('.accdb'):
+        return (
+            r'DRIVER={Microsoft Access Driver (*.mdb, *.accdb)};'
+            r'DBQ=' + access_file_path + ';'
+        )
+    elif access_file_path.endswith('.mdb'):
+        return (
+            r'DRIVER={Microsoft Access Driver (*.mdb)};'
+            r'DBQ=' + access_file_path + ';'
+        )
+    raise ValueError("Format de fichier non supporté. Utilisez .accdb ou .mdb")
+
+def get_access_connection(access_file_path=ACCESS_DB_PATH):
     try:
-        if access_file_path.endswith('.accdb'):
-            conn_str = (
-                r'DRIVER={Microsoft Access Driver (*.mdb, *.accdb)};'
-                r'DBQ=' + access_file_path + ';'
-            )
-        
-        elif access_file_path.endswith('.mdb'):
-            conn_str = (
-                r'DRIVER={Microsoft Access Driver (*.mdb)};'
-                r'DBQ=' + access_file_path + ';'
-            )
-        else:
-            raise ValueError("Format de fichier non support�. Utilisez .accdb ou .mdb")
-        
+        conn_str = access_connection_string(access_file_path)
         connection = pyodbc.connect(conn_str)
-        print(f"Connexion r�ussie � : {access_file_path}")
+        print(f"Connexion réussie à : {access_file_path}")
         return connection
         
     except pyodbc.Error as e:
@@ -86,7 +86,7 @@ def extract_table(source_type: str, table_name: str) -> pd.DataFrame:
             sql_engine = connect_sql_server()
             print(f"Extraction SQL: {table_name}")
             query = f"SELECT * FROM [{table_name}]"
-            df = pd.read_sql(query, sql_engine)
+            df = read_columnar(sql_engine, query, connection_string=NORTHWIND_CONNECTION_STRING)
             print(f"{len(df)} lignes extraites de {table_name} (SQL)")
             return df
             
@@ -94,12 +94,12 @@ def extract_table(source_type: str, table_name: str) -> pd.DataFrame:
             access_conn = get_access_connection()
             print(f"Extraction Access: {table_name}")
             query = f"SELECT * FROM [{table_name}]"
-            df = pd.read_sql(query, access_conn)
+            df = read_columnar(access_conn, query, connection_string=access_connection_string())
             print(f"{len(df)} lignes extraites de {table_name} (Access)")
             return df
             
         else:
-            raise ValueError("Type de source doit �tre 'sql' ou 'access'")
+            raise ValueError("Type de source doit être 'sql' ou 'access'")
             
     except Exception as e:
         print(f"Erreur extraction {table_name} depuis {source_type}: {e}")
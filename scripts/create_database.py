@@ -1,26 +1,22 @@
 ﻿# create_database.py
-from config import DatabaseConfig
-import pyodbc
+from warehouse import warehouse_backend
 
 def create_datawarehouse():
     """Crée la base de données du data warehouse si elle n'existe pas"""
     try:
+        warehouse = warehouse_backend()
+        if warehouse.embedded:
+            print(f"ℹ️ Data warehouse embarqué {warehouse.spec}, le fichier est créé à la connexion.")
+            return
+        
         print("Tentative de création de la base de données NEWW...")
         
         # Connexion au serveur master sans base spécifique
-        master_conn_str = (
-            'DRIVER={ODBC Driver 18 for SQL Server};'
-            'SERVER=localhost;'
-            'DATABASE=master;'
-            'Trusted_Connection=yes;'
-            'Encrypt=no;'
-        )
-        
-        conn = pyodbc.connect(master_conn_str, autocommit=True)  # IMPORTANT: autocommit=True
+        conn = warehouse.connect('master', autocommit=True)  # IMPORTANT: autocommit=True
         cursor = conn.cursor()
         
         # Vérifier si la base existe
-        db_name = DatabaseConfig.DW_SERVER['database']
+        db_name = warehouse.database
         cursor.execute(f"SELECT name FROM sys.databases WHERE name = '{db_name}'")
         exists = cursor.fetchone()
         
@@ -43,25 +39,14 @@ def create_dw_schema():
         print("\nTentative de connexion à la base NEWW pour créer le schéma...")
         
         # Connexion directe à la base NEWW
-        neww_conn_str = (
-            'DRIVER={ODBC Driver 18 for SQL Server};'
-            'SERVER=localhost;'
-            'DATABASE=DataWareHouse;'
-            'Trusted_Connection=yes;'
-            'Encrypt=no;'
-        )
-        
-        conn = pyodbc.connect(neww_conn_str)
+        warehouse = warehouse_backend()
+        conn = warehouse.connect()
         cursor = conn.cursor()
         print("✅ Connexion à NEWW établie.")
         
         # 1. Table DimDate
         print("Création de DimDate...")
-        cursor.execute("""
-            IF NOT EXISTS (SELECT * FROM INFORMATION_SCHEMA.TABLES 
-                          WHERE TABLE_SCHEMA = 'dbo' AND TABLE_NAME = 'DimDate')
-            BEGIN
-                CREATE TABLE DimDate (
+        cursor.execute(warehouse.create_table('DimDate', """
                     DateKey INT PRIMARY KEY,
                     Date DATE NOT NULL,
                     Year INT NOT NULL,
@@ -72,20 +57,13 @@ def create_dw_schema():
                     DayOfWeek VARCHAR(20),
                     IsWeekend BIT,
                     UNIQUE(Date)
-                );
-                PRINT 'Table DimDate créée.';
-            END
-        """)
+        """))
         print("✅ DimDate vérifiée/créée.")
         
         # 2. Table DimCustomer
         print("Création de DimCustomer...")
-        cursor.execute("""
-            IF NOT EXISTS (SELECT * FROM INFORMATION_SCHEMA.TABLES 
-                          WHERE TABLE_SCHEMA = 'dbo' AND TABLE_NAME = 'DimCustomer')
-            BEGIN
-                CREATE TABLE DimCustomer (
-                    CustomerKey INT IDENTITY(1,1) PRIMARY KEY,
+        cursor.execute(warehouse.create_table('DimCustomer', """
+                    CustomerKey {identity},
                     CustomerID VARCHAR(10) NOT NULL,
                     CompanyName VARCHAR(100) NOT NULL,
                     ContactName VARCHAR(100),
@@ -98,19 +76,13 @@ def create_dw_schema():
                     Phone VARCHAR(30),
                     SourceSystem VARCHAR(20),
                     UNIQUE(CustomerID, SourceSystem)
-                );
-            END
-        """)
+        """))
         print("✅ DimCustomer vérifiée/créée.")
         
         # 3. Table DimEmployee
         print("Création de DimEmployee...")
-        cursor.execute("""
-            IF NOT EXISTS (SELECT * FROM INFORMATION_SCHEMA.TABLES 
-                          WHERE TABLE_SCHEMA = 'dbo' AND TABLE_NAME = 'DimEmployee')
-            BEGIN
-                CREATE TABLE DimEmployee (
-                    EmployeeKey INT IDENTITY(1,1) PRIMARY KEY,
+        cursor.execute(warehouse.create_table('DimEmployee', """
+                    EmployeeKey {identity},
                     EmployeeID INT NOT NULL,
                     LastName VARCHAR(50) NOT NULL,
                     FirstName VARCHAR(50) NOT NULL,
@@ -127,19 +99,13 @@ def create_dw_schema():
                     ReportsTo INT,
                     SourceSystem VARCHAR(20),
                     UNIQUE(EmployeeID, SourceSystem)
-                );
-            END
-        """)
+        """))
         print("✅ DimEmployee vérifiée/créée.")
         
         # 4. Table FactOrders (sans contraintes de clé étrangère d'abord)
         print("Création de FactOrders...")
-        cursor.execute("""
-            IF NOT EXISTS (SELECT * FROM INFORMATION_SCHEMA.TABLES 
-                          WHERE TABLE_SCHEMA = 'dbo' AND TABLE_NAME = 'FactOrders')
-            BEGIN
-                CREATE TABLE FactOrders (
-                    OrderKey INT IDENTITY(1,1) PRIMARY KEY,
+        cursor.execute(warehouse.create_table('FactOrders', """
+                    FactOrderKey {identity},
                     OrderID INT NOT NULL,
                     CustomerKey INT NOT NULL,
                     EmployeeKey INT NOT NULL,
@@ -161,63 +127,43 @@ def create_dw_schema():
                     DeliveryDelayDays INT,
                     TotalAmount DECIMAL(15,2),
                     SourceSystem VARCHAR(20)
-                );
-            END
-        """)
+        """))
         print("✅ FactOrders créée (contraintes FK à ajouter plus tard).")
         
         # Ajouter les contraintes de clé étrangère APRÈS la création des tables
         print("\nAjout des contraintes de clés étrangères...")
         
         # Vérifier et ajouter les FK une par une
-        try:
-            cursor.execute("""
-                IF NOT EXISTS (SELECT * FROM INFORMATION_SCHEMA.TABLE_CONSTRAINTS 
-                              WHERE CONSTRAINT_NAME = 'FK_FactOrders_DimCustomer')
-                BEGIN
-                    ALTER TABLE FactOrders 
-                    ADD CONSTRAINT FK_FactOrders_DimCustomer 
-                    FOREIGN KEY (CustomerKey) REFERENCES DimCustomer(CustomerKey);
-                END
-            """)
-            print("✅ FK vers DimCustomer ajoutée.")
-        except Exception as e:
-            print(f"⚠️ FK DimCustomer non ajoutée: {e}")
-            
-        try:
-            cursor.execute("""
-                IF NOT EXISTS (SELECT * FROM INFORMATION_SCHEMA.TABLE_CONSTRAINTS 
-                              WHERE CONSTRAINT_NAME = 'FK_FactOrders_DimEmployee')
-                BEGIN
-                    ALTER TABLE FactOrders 
-                    ADD CONSTRAINT FK_FactOrders_DimEmployee 
-                    FOREIGN KEY (EmployeeKey) REFERENCES DimEmployee(EmployeeKey);
-                END
-            """)
-            print("✅ FK vers DimEmployee ajoutée.")
-        except Exception as e:
-            print(f"⚠️ FK DimEmployee non ajoutée: {e}")
+        if warehouse.embedded:
+            # SQLite n'ajoute pas de contrainte à une table existante
+            print("ℹ️ Clés étrangères non ajoutées sur un data warehouse embarqué.")
+        else:
+            for dimension, key in [('DimCustomer', 'CustomerKey'), ('DimEmployee', 'EmployeeKey')]:
+                try:
+                    cursor.execute(f"""
+                        IF NOT EXISTS (SELECT * FROM INFORMATION_SCHEMA.TABLE_CONSTRAINTS 
+                                      WHERE CONSTRAINT_NAME = 'FK_FactOrders_{dimension}')
+                        BEGIN
+                            ALTER TABLE FactOrders 
+                            ADD CONSTRAINT FK_FactOrders_{dimension} 
+                            FOREIGN KEY ({key}) REFERENCES {dimension}({key});
+                        END
+                    """)
+                    print(f"✅ FK vers {dimension} ajoutée.")
+                except Exception as e:
+                    print(f"⚠️ FK {dimension} non ajoutée: {e}")
         
         # Créer des index pour améliorer les performances
         print("\nCréation des index...")
         try:
-            cursor.execute("""
-                IF NOT EXISTS (SELECT * FROM sys.indexes WHERE name = 'IX_FactOrders_Dates')
-                BEGIN
-                    CREATE INDEX IX_FactOrders_Dates ON FactOrders (OrderDateKey, RequiredDateKey, ShippedDateKey);
-                END
-            """)
+            cursor.execute(warehouse.create_index('IX_FactOrders_Dates', 'FactOrders',
+                                                  'OrderDateKey, RequiredDateKey, ShippedDateKey'))
             print("✅ Index IX_FactOrders_Dates créé.")
         except Exception as e:
             print(f"⚠️ Index dates non créé: {e}")
             
         try:
-            cursor.execute("""
-                IF NOT EXISTS (SELECT * FROM sys.indexes WHERE name = 'IX_FactOrders_Customer')
-                BEGIN
-                    CREATE INDEX IX_FactOrders_Customer ON FactOrders (CustomerKey);
-                END
-            """)
+            cursor.execute(warehouse.create_index('IX_FactOrders_Customer', 'FactOrders', 'CustomerKey'))
             print("✅ Index IX_FactOrders_Customer créé.")
         except Exception as e:
             print(f"⚠️ Index customer non créé: {e}")
@@ -0,0 +1,64 @@
+# cross_filter.py
+import numpy as np
+import pandas as pd
+
+# Fact attributes the dashboard can cross-filter on
+FILTER_ATTRIBUTES = ['Country', 'Year', 'Month', 'EmployeeKey', 'Segment']
+
+class BitmapIndex:
+    """One packed bitmap of the fact rows per distinct value of a column"""
+
+    def __init__(self, values):
+        codes, uniques = pd.factorize(values, sort=True)
+        self.labels = pd.Index(uniques)
+        self.size = len(codes)
+
+        # Each row sets one bit, in the bitmap of its value (big-endian bits, as packbits)
+        self.bitmaps = np.zeros((len(self.labels), (self.size + 7) // 8), dtype=np.uint8)
+        rows = np.flatnonzero(codes >= 0)
+        offsets = codes[rows].astype(np.int64) * self.bitmaps.shape[1] + (rows >> 3)
+        np.bitwise_or.at(self.bitmaps.reshape(-1), offsets, (0x80 >> (rows & 7)).astype(np.uint8))
+
+    def lookup(self, values):
+        """Bitmap of the rows holding any of the values"""
+        codes = self.labels.get_indexer(pd.Index(values))
+        codes = codes[codes >= 0]
+        if not len(codes):
+            return np.zeros(self.bitmaps.shape[1], dtype=np.uint8)
+        return np.bitwise_or.reduce(self.bitmaps[codes], axis=0)
+
+class CrossFilter:
+    """Bitmap indexes over the fact rows, ANDed to answer any filter combination
+
+    Built once per data load. A selection maps attributes to the values to
+    keep; values of one attribute are ORed and attributes are ANDed, a few
+    byte-wise operations over n/8 bytes whatever the number of filters.
+    """
+
+    def __init__(self, facts, attributes=FILTER_ATTRIBUTES):
+        self.size = len(facts)
+        self.indexes = {attr: BitmapIndex(facts[attr]) for attr in attributes}
+
+    def bitmap(self, *selections):
+        """Packed bitmap of the rows matching every selection, None when nothing is filtered"""
+        result = None
+        for selection in selections:
+            for attr, values in selection.items():
+                bits = self.indexes[attr].lookup(values)
+                result = bits if result is None else result & bits
+        return result
+
+    def mask(self, *selections):
+        """Boolean mask of the matching rows"""
+        bits = self.bitmap(*selections)
+        if bits is None:
+            return np.ones(self.size, dtype=bool)
+        return np.unpackbits(bits, count=self.size).view(bool)
+
+    def rows(self, *selections):
+        """Positions of the matching rows, in fact order"""
+        return np.flatnonzero(self.mask(*selections))
+
+    def values(self, attr):
+        """Distinct values of an attribute"""
+        return self.indexes[attr].labels
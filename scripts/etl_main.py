@@ -1,11 +1,119 @@
 # etl_main.py - VERSION COMPLÈTE CORRIGÉE
+import os
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
 import pyodbc
 from sqlalchemy import create_engine, text
-from config import DatabaseConfig, create_sql_connection, create_datawere_connection
+from config import DatabaseConfig, create_sql_connection, create_datawere_connection, access_connection_string
 import create_database
+from warehouse import warehouse_backend
+from columnar_fetch import read_columnar, iter_columnar
+
+# Extrait publié pour le mode hors ligne du dashboard : une table du DW par fichier CSV
+EXTRACT_DIR = os.path.join('data', 'extract')
+EXTRACT_TABLES = ['DimDate', 'DimCustomer', 'DimEmployee', 'FactOrders']
+EXTRACT_CHUNK_ROWS = 50000
+
+# Clé auto-incrémentée de FactOrders : FactOrderKey, ou OrderKey dans les DW créés par une ancienne version de create_database.py
+FACT_KEY_COLUMNS = ['FactOrderKey', 'OrderKey']
+
+# Tables de synthèse lues par le dashboard, mises à jour après chaque chargement des faits.
+# 'source' donne une ligne par fait avec FactOrderKey, les clés et les valeurs à agréger ;
+# {fact_key} y est remplacé par la clé réelle de FactOrders.
+# Les tables 'rebuild' sont recalculées entièrement à chaque exécution : une ligne client ou
+# employé modifiée y change des groupes qu'aucun nouveau fait ne touche.
+# Elles ont une ligne par client, employé ou pays ; AggMonthlyRevenue ne dépend que de DimDate.
+AGGREGATE_TABLES = {
+    'AggMonthlyRevenue': {
+        'columns': """
+            Year INT NOT NULL,
+            Month INT NOT NULL,
+            MonthName VARCHAR(20),
+            Revenue DECIMAL(18,2) NOT NULL,
+            OrderCount INT NOT NULL,
+            DeliveredCount INT NOT NULL,
+            PRIMARY KEY (Year, Month)
+        """,
+        'keys': ['Year', 'Month'],
+        'source': """
+            SELECT f.{fact_key} AS FactOrderKey, d.Year, d.Month, d.MonthName, f.TotalAmount, f.IsDelivered
+            FROM FactOrders f
+            JOIN DimDate d ON f.OrderDateKey = d.DateKey
+        """,
+        'measures': {
+            'MonthName': 'MAX(s.MonthName)',
+            'Revenue': 'COALESCE(SUM(s.TotalAmount), 0)',
+            'OrderCount': 'COUNT(*)',
+            'DeliveredCount': 'COALESCE(SUM(CAST(s.IsDelivered AS INT)), 0)',
+        },
+    },
+    'AggCustomerRevenue': {
+        'columns': """
+            CustomerKey INT PRIMARY KEY,
+            Revenue DECIMAL(18,2) NOT NULL,
+            OrderCount INT NOT NULL
+        """,
+        'keys': ['CustomerKey'],
+        'rebuild': True,
+        'source': """
+            SELECT f.{fact_key} AS FactOrderKey, f.CustomerKey, f.TotalAmount
+            FROM FactOrders f
+            WHERE f.CustomerKey IS NOT NULL
+        """,
+        'measures': {
+            'Revenue': 'COALESCE(SUM(s.TotalAmount), 0)',
+            'OrderCount': 'COUNT(*)',
+        },
+    },
+    'AggEmployeePerformance': {
+        'columns': """
+            EmployeeKey INT PRIMARY KEY,
+            Revenue DECIMAL(18,2) NOT NULL,
+            OrderCount INT NOT NULL
+        """,
+        'keys': ['EmployeeKey'],
+        'rebuild': True,
+        'source': """
+            SELECT f.{fact_key} AS FactOrderKey, f.EmployeeKey, f.TotalAmount
+            FROM FactOrders f
+            WHERE f.EmployeeKey IS NOT NULL
+        """,
+        'measures': {
+            'Revenue': 'COALESCE(SUM(s.TotalAmount), 0)',
+            'OrderCount': 'COUNT(*)',
+        },
+    },
+    'AggCountryRevenue': {
+        'columns': """
+            Country VARCHAR(50) PRIMARY KEY,
+            Revenue DECIMAL(18,2) NOT NULL,
+            OrderCount INT NOT NULL,
+            CustomerCount INT NOT NULL
+        """,
+        'keys': ['Country'],
+        'rebuild': True,
+        'source': """
+            SELECT f.{fact_key} AS FactOrderKey, c.Country, f.CustomerKey, f.TotalAmount
+            FROM FactOrders f
+            JOIN DimCustomer c ON f.CustomerKey = c.CustomerKey
+            WHERE c.Country IS NOT NULL
+        """,
+        'measures': {
+            'Revenue': 'COALESCE(SUM(s.TotalAmount), 0)',
+            'OrderCount': 'COUNT(*)',
+            'CustomerCount': 'COUNT(DISTINCT s.CustomerKey)',
+        },
+    },
+}
+
+# Journal des exécutions de l'ETL : chaque exécution change la version du DW lue par le dashboard,
+# même quand elle ne fait que modifier des lignes existantes
+ETL_RUNS_COLUMNS = """
+    RunKey {identity},
+    StartedAt DATETIME NOT NULL,
+    FinishedAt DATETIME
+"""
 
 class Northwind:
     def __init__(self):
@@ -35,21 +143,16 @@ class Northwind:
         except Exception as e:
             print(f"   ⚠️  Erreur création DW: {e}")
     
-        # Connexion au data warehouse
+        # Connexion au data warehouse (SQL Server, ou fichier embarqué selon DW_WAREHOUSE)
         print("\n3. Connexion au data warehouse...")
+        self.dw = warehouse_backend()
         self.dw_conn = create_datawere_connection()
         
         if self.dw_conn is None:
             # Essayer une connexion directe comme alternative
             print("   Tentative de connexion alternative...")
             try:
-                self.dw_conn = pyodbc.connect(
-                  'DRIVER={ODBC Driver 18 for SQL Server};'
-                  'SERVER=localhost;'
-                  'DATABASE=DataWareHouse;'
-                  'Trusted_Connection=yes;'
-                  'Encrypt=no;'
-                )
+                self.dw_conn = self.dw.connect()
                 print("   ✅ Connexion DW établie (méthode alternative)")
             except Exception as e:
                 print(f"   ❌ Impossible de se connecter au DW: {e}")
@@ -69,16 +172,7 @@ class Northwind:
     def check_table_exists(self, table_name):
         """Vérifie si une table existe dans le DW"""
         try:
-            cursor = self.dw_conn.cursor()
-            cursor.execute(f"""
-                SELECT COUNT(*) 
-                FROM INFORMATION_SCHEMA.TABLES 
-                WHERE TABLE_NAME = '{table_name}' 
-                AND TABLE_CATALOG = '{DatabaseConfig.DW_SERVER['database']}'
-            """)
-            exists = cursor.fetchone()[0] > 0
-            cursor.close()
-            return exists
+            return table_name in self.dw.tables(self.dw_conn)
         except Exception as e:
             print(f"⚠️  Erreur vérification table {table_name}: {e}")
             return False
@@ -112,7 +206,8 @@ class Northwind:
             'IsWeekend': (dates.weekday >= 5).astype(int)
         })
     
-        print(f" Chargement de {len(dim_date):,} dates dans SQL Server...")
+        print(f" Chargement de {len(dim_date):,} dates dans le DW...")
+        self._create_dim_date_table()
     
         cursor = self.dw_conn.cursor()
         cursor.fast_executemany = True  # Magique
@@ -149,9 +244,7 @@ class Northwind:
         """Crée la table DimDate si elle n'existe pas"""
         try:
             cursor = self.dw_conn.cursor()
-            cursor.execute("""
-                IF NOT EXISTS (SELECT * FROM sysobjects WHERE name='DimDate' AND xtype='U')
-                CREATE TABLE DimDate (
+            cursor.execute(self.dw.create_table('DimDate', """
                     DateKey INT PRIMARY KEY,
                     Date DATE NOT NULL,
                     Year INT NOT NULL,
@@ -162,8 +255,7 @@ class Northwind:
                     DayOfWeek VARCHAR(20),
                     IsWeekend BIT,
                     UNIQUE(Date)
-                )
-            """)
+            """))
             self.dw_conn.commit()
             cursor.close()
             print("  ✅ Table DimDate créée")
@@ -210,7 +302,8 @@ class Northwind:
         data = {}
         for name, query in queries.items():
             try:
-                data[name] = pd.read_sql(query, self.source_conn)
+                data[name] = read_columnar(self.source_conn, query,
+                                           connection_string=DatabaseConfig.SQL_SERVER_CONNECTION_STRING)
                 print(f"  ✅ {name}: {len(data[name])} lignes")
             except Exception as e:
                 print(f"  ❌ Erreur extraction {name}: {e}")
@@ -229,7 +322,7 @@ class Northwind:
         print("-"*30)
         
         try:
-            access_conn_str = f"DRIVER={{Microsoft Access Driver (*.mdb, *.accdb)}};DBQ={DatabaseConfig.ACCESS_DB_PATH};"
+            access_conn_str = access_connection_string(DatabaseConfig.ACCESS_DB_PATH)
             access_conn = pyodbc.connect(access_conn_str)
             
             # D'abord, voir quelles tables existent
@@ -258,7 +351,7 @@ class Northwind:
                             break
                 
                 query = f"SELECT * FROM [{customer_table}] WHERE [ID] IS NOT NULL"
-                customers_df = pd.read_sql(query, access_conn)
+                customers_df = read_columnar(access_conn, query, connection_string=access_conn_str)
                 print(f"  ✅ Table {customer_table}: {len(customers_df)} lignes")
                 
                 # Afficher les colonnes pour vérification
@@ -318,7 +411,7 @@ class Northwind:
                             break
                 
                 query = f"SELECT * FROM [{employee_table}] WHERE [ID] IS NOT NULL"
-                employees_df = pd.read_sql(query, access_conn)
+                employees_df = read_columnar(access_conn, query, connection_string=access_conn_str)
                 print(f"  ✅ Table {employee_table}: {len(employees_df)} lignes")
                 
                 # Transformer selon la structure réelle
@@ -428,7 +521,7 @@ class Northwind:
                     query = f"SELECT {select_clause} FROM [{orders_table}] WHERE [{available_columns.get('OrderID', 'ID')}] IS NOT NULL"
 
                     print(f"    Requête générée: {query}")
-                    orders_df = pd.read_sql(query, access_conn)
+                    orders_df = read_columnar(access_conn, query, connection_string=access_conn_str)
                     print(f"  ✅ Table {orders_table}: {len(orders_df)} lignes")
 
                 try:
@@ -448,7 +541,7 @@ class Northwind:
                         FROM [{order_details_table}] od
                         WHERE od.[Order ID] IS NOT NULL
                     """
-                    order_details_df = pd.read_sql(details_query, access_conn)
+                    order_details_df = read_columnar(access_conn, details_query, connection_string=access_conn_str)
                     print(f"  ✅ Table {order_details_table}: {len(order_details_df)} lignes")
                     
                     if not order_details_df.empty:
@@ -518,18 +611,20 @@ class Northwind:
         
         # 1. Lire les données Access originales pour le mapping
         try:
-            access_conn_str = f"DRIVER={{Microsoft Access Driver (*.mdb, *.accdb)}};DBQ={DatabaseConfig.ACCESS_DB_PATH};"
+            access_conn_str = access_connection_string(DatabaseConfig.ACCESS_DB_PATH)
             access_conn = pyodbc.connect(access_conn_str)
             
             # Mapping Customers Access
-            customers_df = pd.read_sql("SELECT [ID], [Company] FROM [Customers]", access_conn)
+            customers_df = read_columnar(access_conn, "SELECT [ID], [Company] FROM [Customers]",
+                                         connection_string=access_conn_str)
             for _, row in customers_df.iterrows():
                 customer_id = str(row['ID'])
                 company_name = str(row['Company'])
                 mapping['customers'][customer_id] = company_name
             
             # Mapping Employees Access  
-            employees_df = pd.read_sql("SELECT [ID], [First Name], [Last Name] FROM [Employees]", access_conn)
+            employees_df = read_columnar(access_conn, "SELECT [ID], [First Name], [Last Name] FROM [Employees]",
+                                         connection_string=access_conn_str)
             for _, row in employees_df.iterrows():
                 employee_id = str(row['ID'])
                 first_name = str(row['First Name'])
@@ -555,10 +650,10 @@ class Northwind:
         
         # 1. Si c'est SQL, chercher directement
         if source_system == 'SQL':
-            cursor.execute("""
-                SELECT TOP 1 CustomerKey FROM DimCustomer 
+            cursor.execute(self.dw.limit("""
+                SELECT CustomerKey FROM DimCustomer 
                 WHERE CustomerID = ? AND SourceSystem = 'SQL'
-            """, (str(customer_id),))
+            """, 1), (str(customer_id),))
             result = cursor.fetchone()
             if result:
                 return result[0]
@@ -567,10 +662,10 @@ class Northwind:
         elif source_system == 'Access':
             # D'abord, essayer de trouver le CustomerID Access dans DimCustomer
             access_customer_id = f"ACC-{customer_id}"
-            cursor.execute("""
-                SELECT TOP 1 CustomerKey FROM DimCustomer 
+            cursor.execute(self.dw.limit("""
+                SELECT CustomerKey FROM DimCustomer 
                 WHERE CustomerID = ? AND SourceSystem = 'Access'
-            """, (access_customer_id,))
+            """, 1), (access_customer_id,))
             result = cursor.fetchone()
             if result:
                 return result[0]
@@ -588,10 +683,10 @@ class Northwind:
         if source_system == 'SQL':
             try:
                 emp_id = int(employee_id)
-                cursor.execute("""
-                    SELECT TOP 1 EmployeeKey FROM DimEmployee 
+                cursor.execute(self.dw.limit("""
+                    SELECT EmployeeKey FROM DimEmployee 
                     WHERE EmployeeID = ? AND SourceSystem = 'SQL'
-                """, (emp_id,))
+                """, 1), (emp_id,))
                 result = cursor.fetchone()
                 if result:
                     return result[0]
@@ -603,10 +698,10 @@ class Northwind:
             try:
                 # EmployeeID Access est stocké comme 1000 + ID original
                 access_employee_id = 1000 + int(employee_id)
-                cursor.execute("""
-                    SELECT TOP 1 EmployeeKey FROM DimEmployee 
+                cursor.execute(self.dw.limit("""
+                    SELECT EmployeeKey FROM DimEmployee 
                     WHERE EmployeeID = ? AND SourceSystem = 'Access'
-                """, (access_employee_id,))
+                """, 1), (access_employee_id,))
                 result = cursor.fetchone()
                 if result:
                     return result[0]
@@ -886,7 +981,7 @@ class Northwind:
             print("  📋 Chargement DimCustomer...")
             try:
                 existing_query = "SELECT CustomerID, SourceSystem FROM DimCustomer"
-                existing_customers = pd.read_sql(existing_query, self.dw_conn)
+                existing_customers = read_columnar(self.dw_conn, existing_query)
                 
                 if not existing_customers.empty:
                     dim_customer['composite_key'] = dim_customer['CustomerID'].astype(str) + '_' + dim_customer['SourceSystem'].astype(str)
@@ -946,7 +1041,7 @@ class Northwind:
             print("  📋 Chargement DimEmployee...")
             try:
                 existing_query = "SELECT EmployeeID, SourceSystem FROM DimEmployee"
-                existing_employees = pd.read_sql(existing_query, self.dw_conn)
+                existing_employees = read_columnar(self.dw_conn, existing_query)
                 
                 if not existing_employees.empty:
                     dim_employee['composite_key'] = dim_employee['EmployeeID'].astype(str) + '_' + dim_employee['SourceSystem'].astype(str)
@@ -1016,11 +1111,8 @@ class Northwind:
         """S'assure que la table DimCustomer existe"""
         try:
             cursor = self.dw_conn.cursor()
-            cursor.execute("""
-                IF NOT EXISTS (SELECT * FROM sysobjects WHERE name='DimCustomer' AND xtype='U')
-                BEGIN
-                    CREATE TABLE DimCustomer (
-                        CustomerKey INT IDENTITY(1,1) PRIMARY KEY,
+            cursor.execute(self.dw.create_table('DimCustomer', """
+                        CustomerKey {identity},
                         CustomerID VARCHAR(10) NOT NULL,
                         CompanyName VARCHAR(100) NOT NULL,
                         ContactName VARCHAR(100),
@@ -1033,9 +1125,7 @@ class Northwind:
                         Phone VARCHAR(30),
                         SourceSystem VARCHAR(20),
                         UNIQUE(CustomerID, SourceSystem)
-                    );
-                END
-            """)
+            """))
             self.dw_conn.commit()
             cursor.close()
         except Exception as e:
@@ -1045,11 +1135,8 @@ class Northwind:
         """S'assure que la table DimEmployee existe"""
         try:
             cursor = self.dw_conn.cursor()
-            cursor.execute("""
-                IF NOT EXISTS (SELECT * FROM sysobjects WHERE name='DimEmployee' AND xtype='U')
-                BEGIN
-                    CREATE TABLE DimEmployee (
-                        EmployeeKey INT IDENTITY(1,1) PRIMARY KEY,
+            cursor.execute(self.dw.create_table('DimEmployee', """
+                        EmployeeKey {identity},
                         EmployeeID INT NOT NULL,
                         LastName VARCHAR(50) NOT NULL,
                         FirstName VARCHAR(50) NOT NULL,
@@ -1066,9 +1153,7 @@ class Northwind:
                         ReportsTo INT,
                         SourceSystem VARCHAR(20),
                         UNIQUE(EmployeeID, SourceSystem)
-                    );
-                END
-            """)
+            """))
             self.dw_conn.commit()
             cursor.close()
         except Exception as e:
@@ -1078,11 +1163,8 @@ class Northwind:
         """S'assure que la table FactOrders existe"""
         try:
             cursor = self.dw_conn.cursor()
-            cursor.execute("""
-                IF NOT EXISTS (SELECT * FROM sysobjects WHERE name='FactOrders' AND xtype='U')
-                BEGIN
-                    CREATE TABLE FactOrders (
-                        FactOrderKey INT IDENTITY(1,1) PRIMARY KEY,
+            cursor.execute(self.dw.create_table('FactOrders', """
+                        FactOrderKey {identity},
                         OrderID INT NOT NULL,
                         CustomerKey INT,
                         EmployeeKey INT,
@@ -1105,14 +1187,11 @@ class Northwind:
                         FOREIGN KEY (CustomerKey) REFERENCES DimCustomer(CustomerKey),
                         FOREIGN KEY (EmployeeKey) REFERENCES DimEmployee(EmployeeKey),
                         FOREIGN KEY (OrderDateKey) REFERENCES DimDate(DateKey)
-                    );
-                    
-                    -- Créer des index pour les performances
-                    CREATE INDEX IX_FactOrders_OrderDateKey ON FactOrders(OrderDateKey);
-                    CREATE INDEX IX_FactOrders_CustomerKey ON FactOrders(CustomerKey);
-                    CREATE INDEX IX_FactOrders_EmployeeKey ON FactOrders(EmployeeKey);
-                END
-            """)
+            """))
+            
+            # Créer des index pour les performances
+            for column in ['OrderDateKey', 'CustomerKey', 'EmployeeKey']:
+                cursor.execute(self.dw.create_index(f'IX_FactOrders_{column}', 'FactOrders', column))
             self.dw_conn.commit()
             cursor.close()
             print("  ✅ Table FactOrders vérifiée/créée")
@@ -1141,7 +1220,8 @@ class Northwind:
             
             # Filtrer les commandes existantes
             existing_query = "SELECT OrderID, SourceSystem FROM FactOrders"
-            existing_orders = pd.read_sql(existing_query, self.dw_conn)
+            # Lu sur dw_conn, pas par arrow-odbc : les lignes de cette session doivent être vues
+            existing_orders = read_columnar(self.dw_conn, existing_query)
     
             if not existing_orders.empty:
                 fact_orders['composite_key'] = fact_orders['OrderID'].astype(str) + '_' + fact_orders['SourceSystem'].astype(str)
@@ -1192,10 +1272,10 @@ class Northwind:
                     if source_system == 'SQL':
                         # Pour SQL Server
                         if pd.notna(customer_id):
-                            cursor.execute("""
-                                SELECT TOP 1 CustomerKey FROM DimCustomer 
+                            cursor.execute(self.dw.limit("""
+                                SELECT CustomerKey FROM DimCustomer 
                                 WHERE CustomerID = ? AND SourceSystem = 'SQL'
-                            """, (str(customer_id),))
+                            """, 1), (str(customer_id),))
                             result = cursor.fetchone()
                             if result:
                                 customer_key = result[0]
@@ -1207,10 +1287,10 @@ class Northwind:
                         if pd.notna(customer_id):
                             # 1. Essayer avec le format ACC-XX
                             access_customer_id = f"ACC-{customer_id}"
-                            cursor.execute("""
-                                SELECT TOP 1 CustomerKey FROM DimCustomer 
+                            cursor.execute(self.dw.limit("""
+                                SELECT CustomerKey FROM DimCustomer 
                                 WHERE CustomerID = ? AND SourceSystem = 'Access'
-                            """, (access_customer_id,))
+                            """, 1), (access_customer_id,))
                             result = cursor.fetchone()
                             
                             if result:
@@ -1219,10 +1299,10 @@ class Northwind:
                                 # 2. Chercher par nom de compagnie via le mapping
                                 company_name = access_mapping['customers'].get(str(customer_id))
                                 if company_name:
-                                    cursor.execute("""
-                                        SELECT TOP 1 CustomerKey FROM DimCustomer 
+                                    cursor.execute(self.dw.limit("""
+                                        SELECT CustomerKey FROM DimCustomer 
                                         WHERE CompanyName LIKE ? AND SourceSystem = 'Access'
-                                    """, (f"%{company_name}%",))
+                                    """, 1), (f"%{company_name}%",))
                                     result = cursor.fetchone()
                                     if result:
                                         customer_key = result[0]
@@ -1238,10 +1318,10 @@ class Northwind:
                         if pd.notna(employee_id):
                             try:
                                 emp_id = int(employee_id)
-                                cursor.execute("""
-                                    SELECT TOP 1 EmployeeKey FROM DimEmployee 
+                                cursor.execute(self.dw.limit("""
+                                    SELECT EmployeeKey FROM DimEmployee 
                                     WHERE EmployeeID = ? AND SourceSystem = 'SQL'
-                                """, (emp_id,))
+                                """, 1), (emp_id,))
                                 result = cursor.fetchone()
                                 if result:
                                     employee_key = result[0]
@@ -1256,10 +1336,10 @@ class Northwind:
                             try:
                                 # 1. Essayer avec 1000 + ID
                                 access_employee_id = 1000 + int(employee_id)
-                                cursor.execute("""
-                                    SELECT TOP 1 EmployeeKey FROM DimEmployee 
+                                cursor.execute(self.dw.limit("""
+                                    SELECT EmployeeKey FROM DimEmployee 
                                     WHERE EmployeeID = ? AND SourceSystem = 'Access'
-                                """, (access_employee_id,))
+                                """, 1), (access_employee_id,))
                                 result = cursor.fetchone()
                                 
                                 if result:
@@ -1269,12 +1349,12 @@ class Northwind:
                                     full_name = access_mapping['employees'].get(str(employee_id))
                                     if full_name:
                                         # Essayer différents formats de nom
-                                        cursor.execute("""
-                                            SELECT TOP 1 EmployeeKey FROM DimEmployee 
-                                            WHERE (FirstName + ' ' + LastName LIKE ? 
-                                                   OR LastName + ', ' + FirstName LIKE ?)
+                                        cursor.execute(self.dw.limit(f"""
+                                            SELECT EmployeeKey FROM DimEmployee 
+                                            WHERE ({self.dw.concat("FirstName", "' '", "LastName")} LIKE ? 
+                                                   OR {self.dw.concat("LastName", "', '", "FirstName")} LIKE ?)
                                             AND SourceSystem = 'Access'
-                                        """, (f"%{full_name}%", f"%{full_name}%"))
+                                        """, 1), (f"%{full_name}%", f"%{full_name}%"))
                                         result = cursor.fetchone()
                                         if result:
                                             employee_key = result[0]
@@ -1346,6 +1426,141 @@ class Northwind:
             import traceback
             traceback.print_exc()
     
+    def start_run(self):
+        """Enregistre le début d'une exécution de l'ETL et retourne sa clé"""
+        try:
+            cursor = self.dw_conn.cursor()
+            cursor.execute(self.dw.create_table('EtlRuns', ETL_RUNS_COLUMNS))
+            cursor.execute("INSERT INTO EtlRuns (StartedAt) VALUES (?)", datetime.now())
+            cursor.execute("SELECT MAX(RunKey) FROM EtlRuns")
+            run_key = cursor.fetchone()[0]
+            self.dw_conn.commit()
+            cursor.close()
+            return run_key
+        except Exception as e:
+            print(f"  ⚠️  Exécution non enregistrée: {e}")
+            return None
+    
+    def finish_run(self, run_key):
+        """Marque une exécution de l'ETL comme terminée"""
+        if run_key is None:
+            return
+        try:
+            cursor = self.dw_conn.cursor()
+            cursor.execute("UPDATE EtlRuns SET FinishedAt = ? WHERE RunKey = ?", datetime.now(), run_key)
+            self.dw_conn.commit()
+            cursor.close()
+        except Exception as e:
+            print(f"  ⚠️  Fin d'exécution non enregistrée: {e}")
+    
+    def fact_key_column(self):
+        """Retourne la clé auto-incrémentée de FactOrders, None si la table est absente ou sans clé"""
+        try:
+            cursor = self.dw_conn.cursor()
+            cursor.execute("SELECT * FROM FactOrders WHERE 1 = 0")
+            columns = [col[0] for col in cursor.description]
+            cursor.close()
+        except Exception:
+            return None
+        return next((col for col in FACT_KEY_COLUMNS if col in columns), None)
+    
+    def get_last_fact_key(self):
+        """Retourne la plus grande clé de fait chargée, 0 si FactOrders est vide ou absente"""
+        fact_key = self.fact_key_column()
+        if fact_key is None:
+            return 0
+        try:
+            cursor = self.dw_conn.cursor()
+            cursor.execute(f"SELECT MAX({fact_key}) FROM FactOrders")
+            last_key = cursor.fetchone()[0]
+            cursor.close()
+            return int(last_key) if last_key is not None else 0
+        except Exception:
+            return 0
+    
+    def _ensure_aggregate_tables_exist(self):
+        """Crée les tables d'agrégats manquantes et retourne leurs noms"""
+        created = []
+        for table, spec in AGGREGATE_TABLES.items():
+            if self.check_table_exists(table):
+                continue
+            try:
+                cursor = self.dw_conn.cursor()
+                cursor.execute(self.dw.create_table(table, spec['columns']))
+                self.dw_conn.commit()
+                cursor.close()
+                created.append(table)
+                print(f"  ✅ Table {table} créée")
+            except Exception as e:
+                print(f"  ❌ Erreur création {table}: {e}")
+        return created
+    
+    def _new_facts_in_group(self, source, keys, alias):
+        """Sous-requête des faits récents (FactOrderKey > ?) du groupe de la ligne alias"""
+        match = ' AND '.join(f"n.{key} = {alias}.{key}" for key in keys)
+        return f"SELECT 1 FROM ({source}) AS n WHERE n.FactOrderKey > ? AND {match}"
+    
+    def refresh_aggregates(self, since_key=0):
+        """Met à jour les tables d'agrégats pour les faits dont FactOrderKey > since_key
+        
+        Seuls les mois touchés par ces faits sont supprimés puis recalculés depuis
+        FactOrders. Les tables par dimension ('rebuild') et celles qui viennent
+        d'être créées sont remplies entièrement.
+        """
+        print("\n📊 MISE À JOUR DES AGRÉGATS")
+        print("-"*30)
+        
+        if self.dw_conn is None:
+            print("  ℹ️  Pas de connexion au DW")
+            return
+        
+        fact_key = self.fact_key_column()
+        if fact_key is None:
+            print("  ⚠️  FactOrders absente ou sans clé de fait, agrégats non mis à jour")
+            return
+        
+        created = self._ensure_aggregate_tables_exist()
+        
+        try:
+            cursor = self.dw_conn.cursor()
+            for table, spec in AGGREGATE_TABLES.items():
+                source = spec['source'].format(fact_key=fact_key)
+                keys = spec['keys']
+                measures = spec['measures']
+                columns = ', '.join(keys + list(measures))
+                select = ', '.join([f"s.{key}" for key in keys] + list(measures.values()))
+                group_by = ', '.join(f"s.{key}" for key in keys)
+                
+                if table in created or spec.get('rebuild'):
+                    # Table neuve ou par dimension : tous les faits
+                    if table not in created:
+                        cursor.execute(f"DELETE FROM {table}")
+                    cursor.execute(f"""
+                        INSERT INTO {table} ({columns})
+                        SELECT {select} FROM ({source}) AS s
+                        GROUP BY {group_by}
+                    """)
+                    print(f"  ✅ {table}: {cursor.rowcount} lignes calculées")
+                    continue
+                
+                # Groupes touchés par les nouveaux faits
+                cursor.execute(f"DELETE FROM {table} WHERE EXISTS ({self._new_facts_in_group(source, keys, table)})",
+                               since_key)
+                cursor.execute(f"""
+                    INSERT INTO {table} ({columns})
+                    SELECT {select} FROM ({source}) AS s
+                    WHERE EXISTS ({self._new_facts_in_group(source, keys, 's')})
+                    GROUP BY {group_by}
+                """, since_key)
+                print(f"  ✅ {table}: {cursor.rowcount} lignes mises à jour")
+            
+            self.dw_conn.commit()
+            cursor.close()
+            
+        except Exception as e:
+            self.dw_conn.rollback()
+            print(f"  ❌ Erreur mise à jour des agrégats: {e}")
+    
     def make_factorders_not_null(self):
         """Après chargement, rend les colonnes NOT NULL et nettoie"""
         print("\n🔧 NETTOYAGE FINAL DE FACTORDERS")
@@ -1382,6 +1597,8 @@ class Northwind:
         print("="*50)
         
         try:
+            run_key = self.start_run()
+            
             # Étape 1: Créer/remplir DimDate
             self.create_dim_date(1990, 2025)
             
@@ -1420,9 +1637,13 @@ class Northwind:
             self.load_dimensions_to_dw(dim_customer, dim_employee)
             
             # Étape 6: Charger les faits (AJOUTÉ)
+            last_fact_key = self.get_last_fact_key()
             self.load_facts_to_dw(fact_orders)
             
-            # Étape 7: Sauvegarder pour dashboard
+            # Étape 7: Mettre à jour les agrégats des nouveaux faits
+            self.refresh_aggregates(last_fact_key)
+            
+            # Étape 8: Sauvegarder pour dashboard
             print("\n🎯 PRÉPARATION POUR DASHBOARD")
             print("-"*30)
             
@@ -1435,6 +1656,9 @@ class Northwind:
             except Exception as e:
                 print(f"  ⚠️  Impossible de sauvegarder les données: {e}")
             
+            self.export_extract()
+            
+            self.finish_run(run_key)
             self.show_summary()
             
             print("\n" + "="*50)
@@ -1445,6 +1669,33 @@ class Northwind:
             print(f"\n❌ ERREUR CRITIQUE DANS L'ETL: {e}")
             raise
     
+    def export_extract(self, directory=EXTRACT_DIR):
+        """Publie les tables du DW en CSV pour le mode hors ligne du dashboard"""
+        if self.dw_conn is None:
+            print("❌ Pas de connexion au DW")
+            return
+        
+        path = None
+        try:
+            os.makedirs(directory, exist_ok=True)
+            for table in EXTRACT_TABLES:
+                # Lecture par blocs, le fichier complet n'est renommé qu'une fois écrit
+                path = os.path.join(directory, f"{table}.csv")
+                rows = 0
+                # Une table vide donne un bloc vide, son en-tête remplace quand même l'ancien fichier
+                for i, chunk in enumerate(iter_columnar(self.dw_conn, f"SELECT * FROM {table}",
+                                                        connection_string=self.dw.connection_string(),
+                                                        batch_rows=EXTRACT_CHUNK_ROWS)):
+                    chunk.to_csv(path + '.tmp', mode='w' if i == 0 else 'a', header=(i == 0), index=False)
+                    rows += len(chunk)
+                os.replace(path + '.tmp', path)
+                print(f"  ✅ {table}: {rows} lignes exportées dans {path}")
+        except Exception as e:
+            print(f"  ⚠️  Impossible d'exporter l'extrait: {e}")
+            # Pas de fichier à moitié écrit laissé à côté de l'extrait
+            if path is not None and os.path.exists(path + '.tmp'):
+                os.remove(path + '.tmp')
+    
     def show_summary(self):
         """Affiche un résumé du data warehouse"""
         print("\n📊 RÉSUMÉ DATA WAREHOUSE")
@@ -1454,7 +1705,7 @@ class Northwind:
             print("❌ Pas de connexion au DW")
             return
         
-        tables = ['DimDate', 'DimCustomer', 'DimEmployee', 'FactOrders']
+        tables = ['DimDate', 'DimCustomer', 'DimEmployee', 'FactOrders'] + list(AGGREGATE_TABLES)
         for table in tables:
             try:
                 cursor = self.dw_conn.cursor()
@@ -0,0 +1,198 @@
+# query_cache.py
+import os
+import re
+import json
+import hashlib
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+from warehouse import DatabaseError
+
+# Where Data Explorer results are kept between runs
+QUERY_CACHE_DIR = os.path.join(os.path.expanduser('~'), '.dw_dashboard', 'query_cache')
+
+# Where the dashboard keeps the frames of its last load for the next start
+SNAPSHOT_DIR = os.path.join(os.path.expanduser('~'), '.dw_dashboard', 'snapshot')
+
+# Row counts and highest keys of the warehouse tables, every ETL load moves them
+VERSION_QUERY = """
+    SELECT (SELECT COUNT(*) FROM FactOrders), (SELECT MAX(OrderID) FROM FactOrders),
+           (SELECT COUNT(*) FROM DimCustomer), (SELECT MAX(CustomerKey) FROM DimCustomer),
+           (SELECT COUNT(*) FROM DimEmployee), (SELECT MAX(EmployeeKey) FROM DimEmployee),
+           (SELECT COUNT(*) FROM DimDate), (SELECT MAX(DateKey) FROM DimDate)
+"""
+
+# Last ETL run and how many finished, a run that only rewrites rows in place still moves them
+RUN_MARKER_QUERY = "SELECT MAX(RunKey), COUNT(FinishedAt) FROM EtlRuns"
+
+# Tables VERSION_QUERY follows, the only ones a cached result may read
+VERSIONED_TABLES = {'factorders', 'dimcustomer', 'dimemployee', 'dimdate'}
+
+# Functions whose value changes between two runs of the same query
+VOLATILE_SQL = re.compile(r"\b(?:GETDATE|GETUTCDATE|SYSDATETIME|SYSUTCDATETIME|SYSDATETIMEOFFSET|CURRENT_TIMESTAMP|"
+                          r"CURRENT_DATE|CURRENT_TIME|NEWID|NEWSEQUENTIALID|RAND|RANDOM|NOW|TABLESAMPLE)\b",
+                          re.IGNORECASE)
+
+# Table name, possibly schema-qualified and bracketed
+SQL_NAME = r"(?:\[[^\]]+\]|\w+)(?:\s*\.\s*(?:\[[^\]]+\]|\w+))*"
+TABLE_SOURCE = re.compile(rf"\b(?:FROM|JOIN|APPLY)\s+({SQL_NAME})(\s*\()?", re.IGNORECASE)
+NEXT_TABLE_SOURCE = re.compile(rf"(?:\s+(?:AS\s+)?(?!WHERE\b|JOIN\b|GROUP\b|ORDER\b|UNION\b)\w+)?\s*,\s*({SQL_NAME})(\s*\()?",
+                               re.IGNORECASE)
+COMMON_TABLE = re.compile(r"(\w+)\s+AS\s*\(", re.IGNORECASE)
+
+def warehouse_version(conn):
+    """Return a string that changes whenever the warehouse data changes"""
+    cursor = conn.cursor()
+    row = list(cursor.execute(VERSION_QUERY).fetchone())
+    try:
+        row += cursor.execute(RUN_MARKER_QUERY).fetchone()
+    except DatabaseError:
+        pass  # warehouse loaded before the ETL recorded its runs
+    cursor.close()
+    return '|'.join(str(value) for value in row)
+
+def table_sources(text):
+    """Names of the tables a query reads, None when it reads a table-valued function"""
+    names = []
+    for match in TABLE_SOURCE.finditer(text):
+        while match is not None:
+            if match.group(2):
+                return None
+            # Tables of another schema or database are not the versioned ones
+            name = re.sub(r"[\[\]\s]", '', match.group(1)).lower()
+            names.append(name[len('dbo.'):] if name.startswith('dbo.') else name)
+            match = NEXT_TABLE_SOURCE.match(text, match.end(1))
+    return names
+
+def cacheable_query(query):
+    """Whether a query's result only changes with the warehouse version
+    
+    That is a SELECT of the versioned tables only, calling no volatile
+    function, whose TOP or LIMIT comes with an ORDER BY.
+    """
+    # SQLite reads the clock through date('now')
+    if re.search(r"'now'", query, re.IGNORECASE):
+        return False
+    text = re.sub(r"'(?:[^']|'')*'", "''", query)
+    text = re.sub(r"--[^\n]*|/\*.*?\*/", ' ', text, flags=re.DOTALL)
+    if not re.match(r"\s*(?:SELECT|WITH)\b", text, re.IGNORECASE) or re.search(r"\bINTO\b", text, re.IGNORECASE):
+        return False
+    if VOLATILE_SQL.search(text):
+        return False
+    if re.search(r"\b(?:TOP|LIMIT)\b", text, re.IGNORECASE) and not re.search(r"\bORDER\s+BY\b", text, re.IGNORECASE):
+        return False
+    sources = table_sources(text)
+    common_tables = {name.lower() for name in COMMON_TABLE.findall(text)}
+    return bool(sources) and all(name in VERSIONED_TABLES or name in common_tables for name in sources)
+
+def normalize_sql(query):
+    """Collapse whitespace outside string literals and drop the final semicolon"""
+    parts = re.split(r"('(?:[^']|'')*')", query.strip().rstrip(';').strip())
+    return ''.join(part if part.startswith("'") else re.sub(r'\s+', ' ', part)
+                   for part in parts)
+
+def digest(text):
+    """Short stable hash used in cache file names"""
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()[:24]
+
+class QueryResultCache:
+    """Parquet files of query results, valid for one warehouse version"""
+
+    def __init__(self, directory=QUERY_CACHE_DIR):
+        self.directory = directory
+        self.version = None
+
+    def path(self, query, version):
+        """File of a query result for a warehouse version"""
+        return os.path.join(self.directory, f"{digest(version)}_{digest(normalize_sql(query))}.parquet")
+
+    def set_version(self, version):
+        """Switch to a warehouse version, deleting the results of older ones"""
+        if version == self.version:
+            return
+        self.version = version
+        if os.path.isdir(self.directory):
+            current = digest(version) + '_'
+            for name in os.listdir(self.directory):
+                if name.endswith('.parquet') and not name.startswith(current):
+                    try:
+                        os.remove(os.path.join(self.directory, name))
+                    except OSError:
+                        pass
+
+    def get(self, query, version):
+        """Return the cached result of a query, or None"""
+        self.set_version(version)
+        path = self.path(query, version)
+        if not os.path.exists(path):
+            return None
+        try:
+            return pd.read_parquet(path)
+        except Exception:
+            return None
+
+    def put(self, query, version, df):
+        """Store a query result, results parquet can't hold are not cached"""
+        self.set_version(version)
+        path = self.path(query, version)
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            df.to_parquet(path + '.tmp', index=False)
+            os.replace(path + '.tmp', path)
+        except Exception:
+            if os.path.exists(path + '.tmp'):
+                os.remove(path + '.tmp')
+
+class TableSnapshot:
+    """Arrow IPC files of loaded frames, stamped with the warehouse state they were read at
+
+    Files are uncompressed, so loading reads them through a memory map
+    without decoding. The columns are then copied out into the same numpy
+    dtypes a warehouse load gives, which leaves the files free to be replaced
+    while the dashboard runs.
+    The manifest is written last and names the frames, the schema they were
+    built for and the stamp; a snapshot for another schema is ignored.
+    """
+
+    def __init__(self, directory=SNAPSHOT_DIR):
+        self.directory = directory
+
+    def path(self, name):
+        """File of a frame"""
+        return os.path.join(self.directory, f"{name}.arrow")
+
+    def manifest_path(self):
+        """File naming the frames of the snapshot and their stamp"""
+        return os.path.join(self.directory, 'manifest.json')
+
+    def load(self, schema):
+        """Return (frames, stamp) of a snapshot built for schema, or None"""
+        try:
+            with open(self.manifest_path(), encoding='utf-8') as f:
+                manifest = json.load(f)
+            if manifest['schema'] != schema:
+                return None
+            frames = {}
+            for name in manifest['frames']:
+                with pa.memory_map(self.path(name)) as source:
+                    frames[name] = pa.ipc.open_file(source).read_all().to_pandas()
+            return frames, manifest['stamp']
+        except Exception:
+            return None
+
+    def save(self, frames, schema, stamp):
+        """Replace the snapshot, nothing is kept if a frame can't be written"""
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            # No manifest while the files are replaced, a partial snapshot is never loaded
+            if os.path.exists(self.manifest_path()):
+                os.remove(self.manifest_path())
+            for name, df in frames.items():
+                feather.write_feather(df.reset_index(drop=True), self.path(name) + '.tmp',
+                                      compression='uncompressed')
+                os.replace(self.path(name) + '.tmp', self.path(name))
+            with open(self.manifest_path() + '.tmp', 'w', encoding='utf-8') as f:
+                json.dump({'frames': list(frames), 'schema': schema, 'stamp': stamp}, f)
+            os.replace(self.manifest_path() + '.tmp', self.manifest_path())
+        except Exception:
+            pass
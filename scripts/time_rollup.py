@@ -0,0 +1,77 @@
+# time_rollup.py
+import pandas as pd
+
+# Calendar attributes every level keeps next to its sums
+DAY_COLUMNS = ['Date', 'Year', 'Quarter', 'Month', 'MonthName', 'DayOfWeek']
+
+class TimeRollup:
+    """Order revenue summed per day, with coarser periods built from the level below
+
+    Built once per data load. Day sums roll up to months, quarters and years,
+    weeks and weekdays are summed from the days of each year, so a period or
+    year switch only reads the buckets of one level. New orders are added to
+    the day level and the coarser levels are rebuilt from it.
+    """
+
+    def __init__(self, orders):
+        # Day level: revenue and order count per date, the only pass over the orders
+        self.days = self.sum_days(orders)
+        self.build_levels()
+
+    def add(self, orders):
+        """Fold new orders into the day level and rebuild the coarser levels"""
+        self.days = self.roll_up(pd.concat([self.days, self.sum_days(orders)], ignore_index=True), DAY_COLUMNS)
+        self.build_levels()
+
+    @staticmethod
+    def sum_days(orders):
+        """Revenue and order count per date"""
+        days = orders.groupby(DAY_COLUMNS, observed=True)['TotalAmount'].agg(['sum', 'count'])
+        days = days.rename(columns={'sum': 'TotalAmount', 'count': 'Orders'}).reset_index()
+        days['MonthName'] = days['MonthName'].astype(str)
+        days['DayOfWeek'] = days['DayOfWeek'].astype(str)
+        return days
+
+    def build_levels(self):
+        """Months, quarters, years, weeks and weekdays summed from the days"""
+        self.months = self.roll_up(self.days, ['Year', 'Quarter', 'Month', 'MonthName'])
+        self.quarters = self.roll_up(self.months, ['Year', 'Quarter'])
+        self.years = self.roll_up(self.quarters, ['Year'])
+
+        # Weeks start on Monday; a week crossing a year end has a part in each year
+        week_start = self.days['Date'] - pd.to_timedelta(self.days['Date'].dt.weekday, unit='D')
+        self.weeks = self.roll_up(self.days.assign(Date=week_start), ['Year', 'Date'])
+        self.weekdays = self.roll_up(self.days, ['Year', 'DayOfWeek'])
+
+    @staticmethod
+    def roll_up(level, keys):
+        """Sum a level into coarser buckets"""
+        return level.groupby(keys, sort=True)[['TotalAmount', 'Orders']].sum().reset_index()
+
+    @staticmethod
+    def in_year(level, year):
+        """Buckets of one year, or all of them"""
+        return level[level['Year'] == year] if year else level
+
+    def series(self, period, year=None):
+        """Revenue per bucket of a period, in the columns of the time series queries"""
+        if period == "Daily":
+            return self.in_year(self.days, year)[['Date', 'TotalAmount']].reset_index(drop=True)
+        elif period == "Weekly":
+            weeks = self.in_year(self.weeks, year)
+            return weeks.groupby('Date', sort=True)['TotalAmount'].sum().reset_index()
+        elif period == "Monthly":
+            return self.in_year(self.months, year)[['Year', 'Month', 'MonthName', 'TotalAmount']].reset_index(drop=True)
+        elif period == "Quarterly":
+            return self.in_year(self.quarters, year)[['Year', 'Quarter', 'TotalAmount']].reset_index(drop=True)
+        return self.in_year(self.years, year)[['Year', 'TotalAmount']].reset_index(drop=True)
+
+    def day_of_week(self, year=None):
+        """Average, total and count of order revenue per weekday"""
+        weekdays = self.in_year(self.weekdays, year).groupby('DayOfWeek')[['TotalAmount', 'Orders']].sum()
+        return pd.DataFrame({
+            'DayOfWeek': weekdays.index,
+            'Mean': weekdays['TotalAmount'] / weekdays['Orders'],
+            'Sum': weekdays['TotalAmount'],
+            'Count': weekdays['Orders'],
+        }).reset_index(drop=True)
@@ -0,0 +1,213 @@
+# warehouse.py
+import os
+import re
+import sqlite3
+import time
+from datetime import date, datetime
+from decimal import Decimal
+
+try:
+    import pyodbc
+except ImportError:  # only the SQL Server warehouse needs the ODBC driver manager
+    pyodbc = None
+
+# Environment variable choosing the warehouse of the ETL and the dashboard:
+# unset or "sqlserver" for SQL Server, "sqlite:<path>" for an embedded SQLite file
+WAREHOUSE_ENV = 'DW_WAREHOUSE'
+
+# Errors raised by any warehouse connection
+DatabaseError = (sqlite3.Error,) + ((pyodbc.Error,) if pyodbc is not None else ())
+
+# SQLite virtual machine steps between two query timeout checks
+SQLITE_PROGRESS_STEPS = 10000
+
+class SqlServerWarehouse:
+    """DataWareHouse database on SQL Server, through the ODBC driver"""
+
+    embedded = False
+    identity = 'INT IDENTITY(1,1) PRIMARY KEY'
+
+    def __init__(self, server='localhost', database='DataWareHouse', driver='ODBC Driver 18 for SQL Server'):
+        self.server = server
+        self.database = database
+        self.driver = driver
+        self.spec = f'sqlserver:{server}/{database}'
+
+    def connection_string(self, database=None):
+        """ODBC connection string of the warehouse, or of another database on the server"""
+        return (
+            f'DRIVER={{{self.driver}}};'
+            f'SERVER={self.server};'
+            f'DATABASE={database or self.database};'
+            'Trusted_Connection=yes;'
+            'Encrypt=no;'
+        )
+
+    def connect(self, database=None, **kwargs):
+        """Open a pyodbc connection"""
+        if pyodbc is None:
+            raise ImportError('pyodbc is required for the SQL Server warehouse')
+        return pyodbc.connect(self.connection_string(database), **kwargs)
+
+    def limit(self, query, rows):
+        """Query returning only its first rows rows"""
+        return re.sub(r'^\s*SELECT(\s+DISTINCT)?', lambda m: f'{m.group(0)} TOP ({int(rows)})',
+                      query, count=1, flags=re.IGNORECASE)
+
+    def offset(self, query, rows):
+        """Ordered query returning rows rows from the offset given as its last parameter"""
+        return f"{query} OFFSET ? ROWS FETCH NEXT {int(rows)} ROWS ONLY"
+
+    def concat(self, *parts):
+        """String concatenation of SQL expressions"""
+        return ' + '.join(parts)
+
+    def week_start(self, column):
+        """Monday of the week of a DATE expression"""
+        return f"DATEADD(DAY, -(DATEDIFF(DAY, '19000101', {column}) % 7), {column})"
+
+    def create_table(self, table, columns):
+        """DDL creating a table unless it exists, {identity} in columns is the auto-increment key"""
+        return f"""
+            IF NOT EXISTS (SELECT * FROM sysobjects WHERE name='{table}' AND xtype='U')
+            BEGIN
+                CREATE TABLE {table} ({columns.format(identity=self.identity)});
+            END
+        """
+
+    def create_index(self, index, table, columns):
+        """DDL creating an index unless it exists"""
+        return f"""
+            IF NOT EXISTS (SELECT * FROM sys.indexes WHERE name = '{index}')
+            BEGIN
+                CREATE INDEX {index} ON {table} ({columns});
+            END
+        """
+
+    def tables(self, conn):
+        """Names of the tables of the warehouse"""
+        cursor = conn.cursor()
+        cursor.execute("SELECT TABLE_NAME FROM INFORMATION_SCHEMA.TABLES WHERE TABLE_TYPE = 'BASE TABLE'")
+        names = {row[0] for row in cursor.fetchall()}
+        cursor.close()
+        return names
+
+def sqlite_value(value):
+    """Parameter value as sqlite3 binds it, for the types pyodbc accepts"""
+    if isinstance(value, datetime):
+        # Warehouse dates are DATE columns, stored as ISO text
+        return value.date().isoformat() if value.time() == datetime.min.time() else value.isoformat(' ')
+    if isinstance(value, date):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    if hasattr(value, 'item'):  # numpy scalars
+        return value.item()
+    return value
+
+def sqlite_params(params):
+    """Parameters given pyodbc style, as separate arguments or one sequence"""
+    if len(params) == 1 and isinstance(params[0], (list, tuple, dict)):
+        params = params[0]
+    if isinstance(params, dict):
+        return {name: sqlite_value(value) for name, value in params.items()}
+    return [sqlite_value(value) for value in params]
+
+class SqliteCursor(sqlite3.Cursor):
+    """sqlite3 cursor called the way the pyodbc code calls its cursors"""
+
+    def execute(self, sql, *params):
+        self.connection.start_statement()
+        return super().execute(sql, sqlite_params(params))
+
+    def executemany(self, sql, seq_of_params):
+        self.connection.start_statement()
+        return super().executemany(sql, (sqlite_params((params,)) for params in seq_of_params))
+
+    def cancel(self):
+        """Abort the running statement, from any thread"""
+        self.connection.interrupt()
+
+class SqliteConnection(sqlite3.Connection):
+    """sqlite3 connection with pyodbc's cursor conventions and query timeout"""
+
+    timeout = 0  # seconds, 0 waits forever
+
+    def cursor(self, factory=SqliteCursor):
+        return super().cursor(factory)
+
+    def execute(self, sql, *params):
+        return self.cursor().execute(sql, *params)
+
+    def start_statement(self):
+        """Arm the timeout of the next statement"""
+        if self.timeout:
+            deadline = time.monotonic() + self.timeout
+            self.set_progress_handler(lambda: time.monotonic() > deadline, SQLITE_PROGRESS_STEPS)
+        else:
+            self.set_progress_handler(None, 0)
+
+class SqliteWarehouse:
+    """Data warehouse in an embedded SQLite file, no database server needed"""
+
+    embedded = True
+    identity = 'INTEGER PRIMARY KEY AUTOINCREMENT'
+
+    def __init__(self, path):
+        self.path = os.path.abspath(path)
+        self.spec = f'sqlite:{self.path}'
+
+    def connection_string(self, database=None):
+        """No ODBC connection string, the file is opened with sqlite3"""
+        return None
+
+    def connect(self, **kwargs):
+        """Open a connection to the file, creating it if needed"""
+        # Workers open their own connections but may be cancelled from the GUI thread
+        conn = sqlite3.connect(self.path, factory=SqliteConnection, check_same_thread=False)
+        # Readers keep going while the ETL appends
+        conn.execute('PRAGMA journal_mode=WAL')
+        return conn
+
+    def limit(self, query, rows):
+        """Query returning only its first rows rows"""
+        return f"{query.rstrip().rstrip(';')} LIMIT {int(rows)}"
+
+    def offset(self, query, rows):
+        """Ordered query returning rows rows from the offset given as its last parameter"""
+        return f"{query} LIMIT {int(rows)} OFFSET ?"
+
+    def concat(self, *parts):
+        """String concatenation of SQL expressions"""
+        return ' || '.join(parts)
+
+    def week_start(self, column):
+        """Monday of the week of a DATE expression, 1900-01-01 being a Monday"""
+        return (f"date({column}, '-' || (CAST(julianday({column}) - julianday('1900-01-01') AS INTEGER) % 7)"
+                f" || ' days')")
+
+    def create_table(self, table, columns):
+        """DDL creating a table unless it exists, {identity} in columns is the auto-increment key"""
+        return f"CREATE TABLE IF NOT EXISTS {table} ({columns.format(identity=self.identity)})"
+
+    def create_index(self, index, table, columns):
+        """DDL creating an index unless it exists"""
+        return f"CREATE INDEX IF NOT EXISTS {index} ON {table} ({columns})"
+
+    def tables(self, conn):
+        """Names of the tables of the warehouse"""
+        cursor = conn.cursor()
+        cursor.execute("SELECT name FROM sqlite_master WHERE type = 'table'")
+        names = {row[0] for row in cursor.fetchall()}
+        cursor.close()
+        return names
+
+def warehouse_backend(spec=None):
+    """Warehouse named by spec, by default the one DW_WAREHOUSE names"""
+    if spec is None:
+        spec = os.environ.get(WAREHOUSE_ENV, '')
+    if spec.startswith('sqlite:'):
+        return SqliteWarehouse(spec[len('sqlite:'):])
+    if spec in ('', 'sqlserver'):
+        return SqlServerWarehouse()
+    raise ValueError(f"Unknown warehouse {spec!r}, expected 'sqlserver' or 'sqlite:<path>'")
@@ -0,0 +1,121 @@
+# conftest.py
+import os
+import sys
+import numpy as np
+import pandas as pd
+import pytest
+
+# The project modules live flat in scripts/, as they are run from there
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'scripts'))
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+import create_database
+from warehouse import warehouse_backend
+
+COUNTRIES = ['Germany', 'USA', 'France', 'Brazil', 'UK', 'Spain']
+TITLES = ['Sales Representative', 'Sales Manager', 'Vice President, Sales']
+
+def make_dates(start='1996-07-01', end='1998-06-30'):
+    """DimDate rows as the ETL builds them"""
+    dates = pd.date_range(start, end, freq='D')
+    return pd.DataFrame({
+        'DateKey': dates.strftime('%Y%m%d').astype(int),
+        'Date': dates.strftime('%Y-%m-%d'),
+        'Year': dates.year,
+        'Quarter': dates.quarter,
+        'Month': dates.month,
+        'Day': dates.day,
+        'MonthName': dates.strftime('%B'),
+        'DayOfWeek': dates.strftime('%A'),
+        'IsWeekend': (dates.dayofweek >= 5).astype(int),
+    })
+
+def make_customers(count=30, rng=None):
+    """DimCustomer rows, several per country"""
+    rng = rng or np.random.default_rng(1)
+    return pd.DataFrame({
+        'CustomerID': [f'C{i:03d}' for i in range(1, count + 1)],
+        'CompanyName': [f'Company {i}' for i in range(1, count + 1)],
+        'ContactName': [f'Contact {i}' for i in range(1, count + 1)],
+        'City': [f'City {i % 7}' for i in range(1, count + 1)],
+        'Country': rng.choice(COUNTRIES, count),
+        'SourceSystem': 'SQL',
+    })
+
+def make_employees(count=6):
+    """DimEmployee rows"""
+    return pd.DataFrame({
+        'EmployeeID': range(1, count + 1),
+        'LastName': [f'Last{i}' for i in range(1, count + 1)],
+        'FirstName': [f'First{i}' for i in range(1, count + 1)],
+        'Title': [TITLES[i % len(TITLES)] for i in range(count)],
+        'Country': ['USA' if i % 2 else 'UK' for i in range(count)],
+        'SourceSystem': 'SQL',
+    })
+
+def make_orders(count, dates, customers=30, employees=6, first_order=10248, rng=None):
+    """FactOrders rows with random customers, employees, dates and amounts"""
+    rng = rng or np.random.default_rng(2)
+    order_dates = pd.to_datetime(dates['Date']).to_numpy()[rng.integers(0, len(dates), count)]
+    order_dates = pd.DatetimeIndex(np.sort(order_dates))
+    delivered = rng.random(count) < 0.9
+    return pd.DataFrame({
+        'OrderID': np.arange(first_order, first_order + count),
+        'CustomerKey': rng.integers(1, customers + 1, count),
+        'EmployeeKey': rng.integers(1, employees + 1, count),
+        'OrderDateKey': order_dates.strftime('%Y%m%d').astype(int),
+        'OrderDate': order_dates.strftime('%Y-%m-%d'),
+        'ShippedDate': np.where(delivered, (order_dates + pd.Timedelta(days=5)).strftime('%Y-%m-%d'), None),
+        'Freight': rng.uniform(1, 200, count).round(2),
+        'IsDelivered': delivered.astype(int),
+        'TotalAmount': rng.gamma(2.0, 800.0, count).round(2),
+        'SourceSystem': 'SQL',
+    })
+
+def insert_rows(conn, table, df):
+    """Insert a frame into a warehouse table"""
+    columns = ', '.join(df.columns)
+    marks = ', '.join('?' for _ in df.columns)
+    rows = [tuple(None if pd.isna(value) else value for value in row) for row in df.itertuples(index=False)]
+    conn.cursor().executemany(f"INSERT INTO {table} ({columns}) VALUES ({marks})", rows)
+    conn.commit()
+
+@pytest.fixture
+def sqlite_warehouse(tmp_path, monkeypatch):
+    """Embedded warehouse built by create_database.py and filled with 600 orders"""
+    monkeypatch.setenv('DW_WAREHOUSE', f"sqlite:{tmp_path / 'dw.sqlite'}")
+    create_database.create_dw_schema()
+    warehouse = warehouse_backend()
+    conn = warehouse.connect()
+    dates = make_dates()
+    insert_rows(conn, 'DimDate', dates)
+    insert_rows(conn, 'DimCustomer', make_customers())
+    insert_rows(conn, 'DimEmployee', make_employees())
+    insert_rows(conn, 'FactOrders', make_orders(600, dates))
+    conn.close()
+    return warehouse
+
+@pytest.fixture
+def warehouse_etl(sqlite_warehouse):
+    """ETL connected to the test warehouse only, without its source connections"""
+    # The ETL module needs the ODBC driver manager of its sources
+    etl_main = pytest.importorskip('etl_main', exc_type=ImportError)
+    etl = object.__new__(etl_main.Northwind)
+    etl.dw = sqlite_warehouse
+    etl.dw_conn = sqlite_warehouse.connect()
+    yield etl
+    etl.dw_conn.close()
+
+@pytest.fixture(scope='session')
+def qt_app():
+    """One QApplication for the whole session, windows need it alive"""
+    pytest.importorskip('PyQt5')
+    from PyQt5.QtWidgets import QApplication
+    return QApplication.instance() or QApplication([])
+
+@pytest.fixture
+def dashboard_warehouse(sqlite_warehouse, qt_app, monkeypatch):
+    """Dashboard module reading the embedded test warehouse"""
+    import Dashboard
+    monkeypatch.setattr(Dashboard, 'WAREHOUSE', sqlite_warehouse)
+    return sqlite_warehouse
@@ -0,0 +1,47 @@
+# test_aggregates.py
+import numpy as np
+import pandas as pd
+from conftest import insert_rows, make_dates, make_orders
+
+def read(conn, query):
+    return pd.read_sql(query, conn)
+
+def expected_aggregates(conn):
+    """Summary tables grouped from scratch with pandas"""
+    facts = read(conn, "SELECT * FROM FactOrders")
+    months = facts.merge(read(conn, "SELECT DateKey, Year, Month FROM DimDate"),
+                         left_on='OrderDateKey', right_on='DateKey')
+    countries = facts.merge(read(conn, "SELECT CustomerKey, Country FROM DimCustomer"), on='CustomerKey')
+    return {
+        'AggMonthlyRevenue': months.groupby(['Year', 'Month']).agg(
+            Revenue=('TotalAmount', 'sum'), OrderCount=('TotalAmount', 'size'),
+            DeliveredCount=('IsDelivered', 'sum')),
+        'AggCustomerRevenue': facts.groupby(['CustomerKey']).agg(
+            Revenue=('TotalAmount', 'sum'), OrderCount=('TotalAmount', 'size')),
+        'AggEmployeePerformance': facts.groupby(['EmployeeKey']).agg(
+            Revenue=('TotalAmount', 'sum'), OrderCount=('TotalAmount', 'size')),
+        'AggCountryRevenue': countries.groupby(['Country']).agg(
+            Revenue=('TotalAmount', 'sum'), OrderCount=('TotalAmount', 'size'),
+            CustomerCount=('CustomerKey', 'nunique')),
+    }
+
+def assert_aggregates_match(conn):
+    for table, expected in expected_aggregates(conn).items():
+        keys = list(expected.index.names)
+        stored = read(conn, f"SELECT * FROM {table}").set_index(keys).sort_index()[list(expected.columns)]
+        pd.testing.assert_frame_equal(stored, expected, check_dtype=False, check_exact=False, rtol=1e-9)
+
+def test_refresh_follows_new_facts_and_moved_customers(warehouse_etl):
+    conn = warehouse_etl.dw_conn
+    warehouse_etl.refresh_aggregates()
+    assert_aggregates_match(conn)
+
+    last_key = warehouse_etl.get_last_fact_key()
+    insert_rows(conn, 'FactOrders', make_orders(80, make_dates('1998-05-01'), customers=2, first_order=20000,
+                                                rng=np.random.default_rng(5)))
+    # Customers whose old orders only now count for another country
+    conn.execute("UPDATE DimCustomer SET Country = 'Mexico' WHERE CustomerKey IN (3, 4)")
+    conn.execute("UPDATE DimCustomer SET Country = 'UK' WHERE CustomerKey = 5")
+    conn.commit()
+    warehouse_etl.refresh_aggregates(last_key)
+    assert_aggregates_match(conn)
@@ -0,0 +1,72 @@
+# test_charts.py
+import numpy as np
+import pytest
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from charts import BarChart, OffscreenChart, PieChart, ScatterChart
+
+NAMES = ['Germany', 'USA', 'France', 'Brazil']
+VALUES = [230285.0, 245584.0, 81358.0, 106925.0]
+
+def call(name, *args, **kwargs):
+    return (name, args, kwargs)
+
+def drawn(chart_class, *args, calls, size=(6, 3), dpi=100, **kwargs):
+    """Offscreen chart after a first frame, with its pixels and hit map"""
+    offscreen = OffscreenChart(chart_class, *args, **kwargs)
+    pixels, hits = offscreen.draw(calls, size, dpi)
+    return offscreen, np.asarray(pixels), hits
+
+def display(chart, point):
+    """Display pixel of a data point of the chart"""
+    return chart.ax.transData.transform(point)
+
+def test_frames_follow_the_canvas_size():
+    offscreen, pixels, _ = drawn(BarChart, 'Revenue', calls=[call('update', NAMES, VALUES)])
+    assert pixels.shape == (300, 600, 4)
+    # Something else than the white background was drawn
+    assert (pixels[..., :3] < 200).any()
+    pixels, _ = offscreen.draw([], (5, 2), 150)
+    assert np.asarray(pixels).shape == (300, 750, 4)
+
+def test_calls_of_a_frame_draw_it_once(monkeypatch):
+    offscreen, _, _ = drawn(BarChart, 'Revenue', calls=[call('update', NAMES, VALUES)])
+    draws = []
+    monkeypatch.setattr(FigureCanvasAgg, 'draw', lambda canvas: draws.append(canvas))
+    offscreen.draw([call('set_title', 'Revenue by country'), call('update', NAMES[:3], VALUES[:3]),
+                    call('update', NAMES[:2], VALUES[:2])], (6, 3), 100)
+    assert len(draws) == 1
+    assert offscreen.chart.names == NAMES[:2]
+
+@pytest.mark.parametrize('horizontal', [False, True])
+def test_clicks_find_the_bars(horizontal):
+    offscreen, _, hits = drawn(BarChart, 'Revenue', horizontal=horizontal,
+                               calls=[call('update', NAMES, VALUES, keys=[1, 2, 3, 4])])
+    for index, key in enumerate([1, 2, 3, 4]):
+        point = (VALUES[index] / 2, index) if horizontal else (index, VALUES[index] / 2)
+        assert hits.key_at(*display(offscreen.chart, point)) == key
+    # Between two bars, and outside the axes
+    gap = (VALUES[0] / 2, 0.5) if horizontal else (0.5, VALUES[0] / 2)
+    assert hits.key_at(*display(offscreen.chart, gap)) is None
+    assert hits.key_at(1, 1) is None
+
+def test_clicks_find_the_wedges():
+    offscreen, _, hits = drawn(PieChart, 'Segments', ['#FF9800', '#4CAF50', '#2196F3'],
+                               calls=[call('update', ['Low', 'Medium', 'High'], [20, 30, 50])], size=(5, 4))
+    for wedge, key in zip(offscreen.chart.slices, ['Low', 'Medium', 'High']):
+        middle = np.radians((wedge.theta1 + wedge.theta2) / 2)
+        assert hits.key_at(*display(offscreen.chart, (0.5 * np.cos(middle), 0.5 * np.sin(middle)))) == key
+    assert hits.key_at(*display(offscreen.chart, (0.9, 0.9))) is None
+
+def test_clicks_find_the_points():
+    x, y = [40, 80, 120], [60000.0, 150000.0, 230000.0]
+    offscreen, _, hits = drawn(ScatterChart, 'Employees', 'Orders', 'Revenue', 'Average order',
+                               calls=[call('update', x, y, [100, 150, 200], [1200, 1500, 1700], keys=[7, 8, 9])],
+                               size=(5, 4))
+    for point, key in zip(zip(x, y), [7, 8, 9]):
+        assert hits.key_at(*(display(offscreen.chart, point) + 2)) == key
+    assert hits.key_at(*display(offscreen.chart, (60, 200000.0))) is None
+
+def test_message_has_nothing_to_click():
+    offscreen, _, _ = drawn(BarChart, 'Revenue', calls=[call('update', NAMES, VALUES)])
+    _, hits = offscreen.draw([call('show_message', 'No data available')], (6, 3), 100)
+    assert hits is None
@@ -0,0 +1,100 @@
+# test_columnar_fetch.py
+import warnings
+from datetime import date, datetime
+from decimal import Decimal
+import pandas as pd
+import pyarrow as pa
+import pytest
+import columnar_fetch
+from columnar_fetch import iter_columnar, read_columnar
+
+class RowCursor:
+    """DBAPI cursor over fixed rows, typed as pyodbc returns them"""
+
+    def __init__(self, names, rows):
+        self.names, self.rows = names, rows
+        self.description = None
+
+    def execute(self, query, *params):
+        self.description = [(name, None, None, None, None, None, None) for name in self.names]
+        self.position = 0
+        return self
+
+    def fetchmany(self, size):
+        rows = self.rows[self.position:self.position + size]
+        self.position += len(rows)
+        return rows
+
+    def fetchall(self):
+        return self.fetchmany(len(self.rows))
+
+    def close(self):
+        pass
+
+class RowConnection:
+    """DBAPI connection whose cursors return fixed rows"""
+
+    def __init__(self, names, rows):
+        self.names, self.rows = names, rows
+
+    def cursor(self):
+        return RowCursor(self.names, self.rows)
+
+    def commit(self):
+        pass
+
+def read_sql(conn, query, params=None, parse_dates=None):
+    """The frame pd.read_sql builds, the reference the columnar fetch must match"""
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', UserWarning)  # pandas warns about DBAPI connections
+        return pd.read_sql(query, conn, params=params, parse_dates=parse_dates)
+
+# Freight is MONEY, Discount REAL, Region sometimes NULL, Ref mixes types as SQLite allows
+ODBC_NAMES = ['OrderID', 'OrderDate', 'ShippedDate', 'Freight', 'Discount', 'Region', 'Ref']
+ODBC_ROWS = [
+    (10248 + i, datetime(1996, 7, 4) + pd.Timedelta(days=i), None if i % 5 == 0 else date(1996, 7, 9),
+     None if i % 6 == 0 else Decimal('32.3819') * i, 0.05 * (i % 3), None if i % 4 == 0 else 'RJ', i if i % 2 else f'R{i}')
+    for i in range(250)
+]
+
+@pytest.mark.parametrize('batch_rows', [1, 7, 100, 1000])
+def test_driver_types_match_read_sql(batch_rows):
+    conn = RowConnection(ODBC_NAMES, ODBC_ROWS)
+    query = "SELECT * FROM Orders"
+    expected = read_sql(conn, query, parse_dates=['OrderDate'])
+    df = read_columnar(conn, query, parse_dates=['OrderDate'], batch_rows=batch_rows)
+    # Decimals round to the same doubles as read_sql's float() of each value
+    pd.testing.assert_frame_equal(df, expected, check_exact=True)
+
+def test_arrow_decimals_round_like_float():
+    values = [Decimal('636961.2389'), None, Decimal('0.1000'), Decimal('9876543.2109')]
+    chunk = columnar_fetch.numeric_chunk(pa.array(values, type=pa.decimal128(18, 4)))
+    assert chunk.to_pylist() == [None if value is None else float(value) for value in values]
+
+@pytest.mark.parametrize('query, params', [
+    ("SELECT * FROM FactOrders", None),
+    ("SELECT * FROM FactOrders WHERE OrderDateKey BETWEEN ? AND ?", [19970101, 19971231]),
+    ("SELECT OrderID, SourceSystem FROM FactOrders WHERE OrderDate >= ?", [date(1998, 1, 1)]),
+    ("SELECT * FROM DimCustomer WHERE Country = ?", ['Nowhere']),
+    ("SELECT d.Year, SUM(f.TotalAmount) AS TotalAmount FROM FactOrders f "
+     "JOIN DimDate d ON f.OrderDateKey = d.DateKey GROUP BY d.Year", None),
+])
+def test_warehouse_reads_match_read_sql(sqlite_warehouse, query, params):
+    conn = sqlite_warehouse.connect()
+    expected = read_sql(conn, query, params)
+    pd.testing.assert_frame_equal(read_columnar(conn, query, params, batch_rows=64), expected)
+    chunks = list(iter_columnar(conn, query, params, batch_rows=64))
+    # As many frames as read_sql gives, one empty frame for an empty result
+    assert len(chunks) == len(list(pd.read_sql(query, conn, params=params, chunksize=64)))
+    pd.testing.assert_frame_equal(pd.concat(chunks, ignore_index=True), expected, check_dtype=False)
+    conn.close()
+
+def test_typed_parameters_stay_on_the_cursor(sqlite_warehouse, monkeypatch):
+    calls = []
+    monkeypatch.setattr(columnar_fetch, 'read_arrow_batches_from_odbc', lambda **kwargs: calls.append(kwargs))
+    assert not columnar_fetch.text_params([19970101, None])
+    conn = sqlite_warehouse.connect()
+    query = "SELECT OrderID FROM FactOrders WHERE OrderDateKey >= ?"
+    df = read_columnar(conn, query, [19980101], connection_string='DSN=warehouse')
+    conn.close()
+    assert not calls and len(df) > 0
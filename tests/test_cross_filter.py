@@ -0,0 +1,63 @@
+# test_cross_filter.py
+import numpy as np
+import pandas as pd
+import pytest
+from cross_filter import CrossFilter
+
+@pytest.fixture
+def facts():
+    """Fact rows with every filter attribute, some of them missing"""
+    rng = np.random.default_rng(7)
+    count = 1003
+    facts = pd.DataFrame({
+        'Country': rng.choice(['Germany', 'USA', 'France', 'UK'], count),
+        'Year': rng.choice([1996, 1997, 1998], count),
+        'Month': rng.integers(1, 13, count),
+        'EmployeeKey': rng.integers(1, 10, count),
+        'Segment': rng.choice(['Low', 'Medium', 'High'], count),
+    })
+    facts.loc[rng.random(count) < 0.05, 'Country'] = None
+    return facts
+
+def pandas_mask(facts, *selections):
+    """The rows a selection keeps, by boolean indexing"""
+    mask = np.ones(len(facts), dtype=bool)
+    for selection in selections:
+        for attr, values in selection.items():
+            mask &= facts[attr].isin(values).to_numpy()
+    return mask
+
+@pytest.mark.parametrize('selections', [
+    ({'Country': ['Germany']},),
+    ({'Country': ['Germany', 'UK'], 'Year': [1997]},),
+    ({'Segment': ['High']}, {'EmployeeKey': [3, 4], 'Month': [12]}),
+    ({'Country': ['Nowhere']},),
+    ({'Year': [1996], 'Country': ['USA']}, {'Year': [1998]}),
+])
+def test_mask_matches_boolean_indexing(facts, selections):
+    cross_filter = CrossFilter(facts)
+    np.testing.assert_array_equal(cross_filter.mask(*selections), pandas_mask(facts, *selections))
+    np.testing.assert_array_equal(cross_filter.rows(*selections), np.flatnonzero(pandas_mask(facts, *selections)))
+
+def test_no_selection_keeps_every_row(facts):
+    cross_filter = CrossFilter(facts)
+    assert cross_filter.bitmap() is None
+    assert cross_filter.mask({}).all()
+    assert list(cross_filter.values('Country')) == ['France', 'Germany', 'UK', 'USA']
+
+def test_segments_do_not_depend_on_the_customer_filters():
+    pytest.importorskip('PyQt5')
+    from types import SimpleNamespace
+    import Dashboard
+    rng = np.random.default_rng(8)
+    customers = pd.DataFrame({'CustomerKey': range(1, 61), 'Country': rng.choice(['UK', 'USA'], 60),
+                              'TotalSpent': rng.gamma(2.0, 5000.0, 60)})
+    segments = Dashboard.spending_segments(customers.set_index('CustomerKey')['TotalSpent'])
+    assert segments.value_counts().to_dict() == {'Low': 20, 'Medium': 20, 'High': 20}
+    dashboard = SimpleNamespace(customer_segments=segments)
+    uk = customers[customers['Country'] == 'UK']
+    high = Dashboard.DataWarehouseDashboard.filter_segment(dashboard, uk, 'High')
+    assert set(high['CustomerKey']) == set(uk['CustomerKey']) & set(segments.index[segments == 'High'])
+    # Customers without orders fall in the lowest segment
+    newcomer = pd.DataFrame({'CustomerKey': [99], 'Country': ['UK'], 'TotalSpent': [0.0]})
+    assert Dashboard.DataWarehouseDashboard.filter_segment(dashboard, newcomer, 'All')['Segment'].tolist() == ['Low']
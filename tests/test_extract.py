@@ -0,0 +1,62 @@
+# test_extract.py
+import os
+import pandas as pd
+import pytest
+
+pytest.importorskip('PyQt5')
+import Dashboard
+# The ETL module needs the ODBC driver manager of its sources
+etl_main = pytest.importorskip('etl_main', exc_type=ImportError)
+
+def warehouse_table(warehouse, table):
+    conn = warehouse.connect()
+    df = Dashboard.read_table(conn, table)
+    conn.close()
+    return df
+
+@pytest.fixture
+def extract_dir(tmp_path):
+    """Extract directory the ETL creates on its first export"""
+    return str(tmp_path / 'extract')
+
+@pytest.fixture
+def extract_etl(warehouse_etl, dashboard_warehouse, monkeypatch):
+    """ETL exporting in small blocks, so every table spans several of them"""
+    monkeypatch.setattr(etl_main, 'EXTRACT_CHUNK_ROWS', 128)
+    return warehouse_etl
+
+@pytest.mark.parametrize('table', etl_main.EXTRACT_TABLES)
+def test_extract_reads_like_the_warehouse(extract_etl, extract_dir, table):
+    extract_etl.export_extract(extract_dir)
+    pd.testing.assert_frame_equal(Dashboard.read_extract_table(extract_dir, table),
+                                  warehouse_table(extract_etl.dw, table))
+
+def test_emptied_table_replaces_its_old_extract(extract_etl, extract_dir):
+    extract_etl.export_extract(extract_dir)
+    extract_etl.dw_conn.execute("DELETE FROM FactOrders")
+    extract_etl.dw_conn.execute("DELETE FROM DimCustomer WHERE CustomerKey > 10")
+    extract_etl.dw_conn.commit()
+    extract_etl.export_extract(extract_dir)
+    for table in ['FactOrders', 'DimCustomer']:
+        pd.testing.assert_frame_equal(Dashboard.read_extract_table(extract_dir, table),
+                                      warehouse_table(extract_etl.dw, table), check_dtype=False)
+    assert len(Dashboard.read_extract_table(extract_dir, 'FactOrders')) == 0
+    assert sorted(os.listdir(extract_dir)) == sorted(f"{table}.csv" for table in etl_main.EXTRACT_TABLES)
+
+def test_failed_export_keeps_the_previous_extract(extract_etl, extract_dir, monkeypatch):
+    extract_etl.export_extract(extract_dir)
+    before = {table: Dashboard.read_extract_table(extract_dir, table) for table in etl_main.EXTRACT_TABLES}
+    extract_etl.dw_conn.execute("DELETE FROM DimDate WHERE Year = 1998")
+    extract_etl.dw_conn.commit()
+    read_blocks = etl_main.iter_columnar
+
+    def broken_blocks(*args, **kwargs):
+        # The connection drops after the first block
+        blocks = read_blocks(*args, **kwargs)
+        yield next(blocks)
+        raise ConnectionError('connection lost')
+    monkeypatch.setattr(etl_main, 'iter_columnar', broken_blocks)
+    extract_etl.export_extract(extract_dir)
+    for table, df in before.items():
+        pd.testing.assert_frame_equal(Dashboard.read_extract_table(extract_dir, table), df)
+    assert not [name for name in os.listdir(extract_dir) if name.endswith('.tmp')]
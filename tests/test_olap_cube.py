@@ -0,0 +1,94 @@
+# test_olap_cube.py
+import numpy as np
+import pandas as pd
+import pytest
+from olap_cube import OlapCube
+
+MEASURES = ['OrderCount', 'TotalAmount', 'Freight', 'DeliveredCount']
+
+def make_facts(count, seed, countries=('Germany', 'USA', 'France', 'UK'), years=(1996, 1997, 1998)):
+    """Fact rows with the cube dimensions, a few without a country"""
+    rng = np.random.default_rng(seed)
+    months = rng.integers(1, 13, count)
+    facts = pd.DataFrame({
+        'Year': rng.choice(years, count),
+        'Quarter': (months - 1) // 3 + 1,
+        'Month': months,
+        'Country': rng.choice(list(countries), count),
+        'CustomerKey': rng.integers(1, 40, count),
+        'EmployeeKey': rng.integers(1, 10, count),
+        'Title': rng.choice(['Sales Representative', 'Sales Manager'], count),
+        'SourceSystem': rng.choice(['SQL', 'Access'], count),
+        'TotalAmount': rng.gamma(2.0, 800.0, count).round(2),
+        'Freight': rng.uniform(1, 200, count).round(2),
+        'IsDelivered': (rng.random(count) < 0.9).astype(int),
+    })
+    facts['Country'] = facts['Country'].where(rng.random(count) > 0.03)
+    return facts
+
+def pandas_roll_up(facts, by):
+    """The same measures by a plain pandas group-by"""
+    measures = facts.assign(OrderCount=1, DeliveredCount=facts['IsDelivered'])
+    if not by:
+        return pd.DataFrame({name: [measures[name].sum()] for name in MEASURES})
+    return measures.groupby(by, sort=True)[MEASURES].sum().reset_index()
+
+def assert_same_roll_up(result, expected):
+    result = result.reset_index(drop=True)
+    expected = expected.reset_index(drop=True)[list(result.columns)]
+    pd.testing.assert_frame_equal(result, expected, check_dtype=False)
+
+BY = [[], ['Year'], ['Year', 'Month'], ['Country'], ['CustomerKey'], ['EmployeeKey', 'Year'],
+      ['Title'], ['Country', 'SourceSystem'], ['Quarter', 'Country', 'EmployeeKey']]
+
+@pytest.mark.parametrize('by', BY)
+def test_roll_up_matches_group_by(by):
+    facts = make_facts(2000, 1)
+    assert_same_roll_up(OlapCube(facts).roll_up(by), pandas_roll_up(facts, by))
+
+@pytest.mark.parametrize('filters, by', [
+    ({'Country': 'Germany'}, ['Year']),
+    ({'Year': [1997, 1998], 'EmployeeKey': [2, 5]}, ['CustomerKey']),
+    ({'CustomerKey': [3, 7, 11]}, []),
+    ({'Country': ['Nowhere']}, ['Year']),
+])
+def test_dice_matches_boolean_filter(filters, by):
+    facts = make_facts(2000, 2)
+    mask = np.ones(len(facts), dtype=bool)
+    for dim, wanted in filters.items():
+        mask &= facts[dim].isin(np.atleast_1d(wanted)).to_numpy()
+    expected = pandas_roll_up(facts[mask], by)
+    assert_same_roll_up(OlapCube(facts).dice(**filters).roll_up(by), expected)
+
+def test_slice_and_drill_down():
+    facts = make_facts(2000, 3)
+    cube = OlapCube(facts)
+    sliced = cube.slice('Year', 1997)
+    assert 'Year' not in sliced.dimensions
+    assert_same_roll_up(sliced.roll_up(['Country']), pandas_roll_up(facts[facts['Year'] == 1997], ['Country']))
+    assert_same_roll_up(cube.drill_down(['Year']), pandas_roll_up(facts, ['Year', 'Quarter']))
+    assert_same_roll_up(cube.drill_down(['Year', 'Quarter']), pandas_roll_up(facts, ['Year', 'Quarter', 'Month']))
+
+def test_top_matches_nlargest():
+    facts = make_facts(2000, 4)
+    expected = pandas_roll_up(facts, ['CustomerKey']).nlargest(10, 'TotalAmount')
+    assert_same_roll_up(OlapCube(facts).top('CustomerKey', 10), expected)
+
+def test_missing_labels_are_kept_unless_dropped():
+    facts = make_facts(2000, 5)
+    groups = OlapCube(facts).roll_up(['Country'], dropna=False)
+    assert groups['Country'].isna().sum() == 1
+    assert groups['OrderCount'].sum() == len(facts)
+
+def test_incremental_add_matches_a_rebuild():
+    old = make_facts(1500, 6)
+    # New facts bring a year and a country the cube has not seen
+    new = make_facts(400, 7, countries=('Germany', 'Brazil'), years=(1998, 1999))
+    cube = OlapCube(old)
+    cube.roll_up(['Country', 'SourceSystem'])  # a cuboid rolled up before the add
+    cube.add(new)
+    rebuilt = OlapCube(pd.concat([old, new], ignore_index=True))
+    for by in BY:
+        assert_same_roll_up(cube.roll_up(by), rebuilt.roll_up(by))
+    assert_same_roll_up(cube.dice(Country='Brazil').roll_up(['Year']),
+                        rebuilt.dice(Country='Brazil').roll_up(['Year']))
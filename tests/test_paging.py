@@ -0,0 +1,105 @@
+# test_paging.py
+import threading
+import pandas as pd
+import pytest
+
+pytest.importorskip('PyQt5')
+import Dashboard
+
+def browse(query, rows):
+    """Plan and pages of a query, fetched by the explorer's page worker"""
+    plan, start, pages = None, None, []
+    while True:
+        worker = Dashboard.PageWorker(query, rows, plan, start, len(pages), 0, 0)
+        results, errors = [], []
+        worker.page_ready.connect(lambda generation, page, df, position: results.append((df, position)))
+        worker.failed.connect(errors.append)
+        worker.run()
+        if errors:
+            raise ValueError(errors[0])
+        page_df, (plan, start) = results[0]
+        pages.append(page_df)
+        if len(page_df) < rows:
+            return plan, pd.concat(pages, ignore_index=True)
+
+def read_all(warehouse, query):
+    """Every row of a query, in no particular order"""
+    conn = warehouse.connect()
+    df = pd.read_sql(query, conn)
+    conn.close()
+    return df
+
+def rows_of(df):
+    """Rows of a frame as plain tuples, whatever the dtypes pages were built with"""
+    return list(df.astype(object).itertuples(index=False, name=None))
+
+def same_rows(a, b):
+    """Whether two frames hold the same rows, whatever their order"""
+    return list(a.columns) == list(b.columns) and sorted(rows_of(a)) == sorted(rows_of(b))
+
+def test_table_key_is_paged_by_keyset(dashboard_warehouse):
+    query = "SELECT * FROM FactOrders WHERE TotalAmount > 100"
+    plan, pages = browse(query, 70)
+    assert plan[0] == 'keyset'
+    assert plan[1] in Dashboard.FACT_KEY_COLUMNS
+    assert same_rows(pages, read_all(dashboard_warehouse, query))
+
+def test_duplicate_first_column_keeps_every_row(dashboard_warehouse):
+    query = "SELECT Country, CompanyName FROM DimCustomer"
+    plan, pages = browse(query, 4)
+    assert plan == ('offset', 2)
+    assert len(pages) == 30
+    assert same_rows(pages, read_all(dashboard_warehouse, query))
+
+def test_join_is_not_paged_on_a_dimension_key(dashboard_warehouse):
+    query = """
+        SELECT c.CustomerKey, f.OrderID FROM DimCustomer c
+        JOIN FactOrders f ON f.CustomerKey = c.CustomerKey
+    """
+    plan, pages = browse(query, 100)
+    assert plan[0] == 'offset'
+    assert same_rows(pages, read_all(dashboard_warehouse, query))
+
+def test_query_order_by_is_kept(dashboard_warehouse):
+    query = "SELECT CompanyName, Country FROM DimCustomer ORDER BY Country, CompanyName"
+    plan, pages = browse(query, 7)
+    assert plan == ('ordered', None)
+    assert rows_of(pages) == rows_of(read_all(dashboard_warehouse, query))
+
+def test_with_query_needs_an_order_by(dashboard_warehouse):
+    ordered = "WITH t AS (SELECT Country, COUNT(*) AS n FROM DimCustomer GROUP BY Country) SELECT * FROM t ORDER BY Country"
+    plan, pages = browse(ordered, 2)
+    assert plan == ('ordered', None)
+    assert rows_of(pages) == rows_of(read_all(dashboard_warehouse, ordered))
+    with pytest.raises(ValueError, match='ORDER BY'):
+        browse(ordered.replace(' ORDER BY Country', ''), 2)
+
+def test_statements_other_than_select_are_rejected(dashboard_warehouse):
+    with pytest.raises(ValueError, match='SELECT'):
+        browse("DELETE FROM FactOrders", 10)
+    assert len(read_all(dashboard_warehouse, "SELECT OrderID FROM FactOrders")) == 600
+
+def test_keyset_key_needs_a_single_table():
+    assert Dashboard.keyset_key("SELECT DateKey, Year FROM DimDate WHERE Year = 1997", ['DateKey', 'Year']) == 'DateKey'
+    assert Dashboard.keyset_key("SELECT d.DateKey FROM dbo.DimDate AS d", ['DateKey']) == 'DateKey'
+    assert Dashboard.keyset_key("SELECT DateKey FROM DimDate, DimCustomer", ['DateKey']) is None
+    assert Dashboard.keyset_key("SELECT DISTINCT DateKey FROM DimDate", ['DateKey']) is None
+    assert Dashboard.keyset_key("SELECT Year FROM DimDate", ['Year']) is None
+    assert Dashboard.keyset_key("SELECT CustomerKey FROM FactOrders", ['CustomerKey']) is None
+
+def test_closing_waits_for_replaced_page_workers(dashboard_warehouse, monkeypatch):
+    # A driver that only gives up the statement a while after the cancel
+    monkeypatch.setattr(Dashboard.PageWorker, 'cancel',
+                        lambda worker: threading.Timer(0.3, Dashboard.QueryWorker.cancel, [worker]).start())
+    dashboard = Dashboard.DataWarehouseDashboard(snapshot=False)
+    dashboard.query_text.setPlainText("WITH RECURSIVE r(x) AS (SELECT 1 UNION ALL SELECT x + 1 FROM r) "
+                                      "SELECT x FROM r ORDER BY x")
+    dashboard.query_timeout_spin.setValue(0)
+    dashboard.paged_check.setChecked(True)
+    workers = []
+    for _ in range(3):
+        dashboard.execute_query()
+        workers.append(dashboard.page_worker)
+    assert dashboard.stopping_workers == workers[:2]
+    dashboard.close()
+    assert all(worker.isFinished() for worker in workers)
@@ -0,0 +1,61 @@
+# test_query_cache.py
+import pandas as pd
+import pytest
+from query_cache import QueryResultCache, cacheable_query, normalize_sql, warehouse_version
+
+@pytest.mark.parametrize('query', [
+    "SELECT * FROM FactOrders",
+    "select CompanyName from dbo.[DimCustomer] where Country = 'GETDATE()'",
+    "SELECT TOP 10 * FROM FactOrders ORDER BY TotalAmount DESC",
+    "SELECT * FROM FactOrders f JOIN DimCustomer c ON f.CustomerKey = c.CustomerKey",
+    "SELECT * FROM FactOrders f, DimEmployee e WHERE f.EmployeeKey = e.EmployeeKey",
+    "WITH t AS (SELECT CustomerKey FROM FactOrders) SELECT * FROM t",
+    "SELECT * FROM (SELECT Year FROM DimDate) AS d",
+])
+def test_warehouse_table_queries_are_cached(query):
+    assert cacheable_query(query)
+
+@pytest.mark.parametrize('query', [
+    "SELECT GETDATE(), * FROM DimDate",
+    "SELECT NEWID() AS id, CustomerKey FROM DimCustomer",
+    "SELECT date('now') FROM DimDate",
+    "SELECT TOP 10 * FROM FactOrders",
+    "SELECT * FROM FactOrders LIMIT 10",
+    "SELECT * FROM AggMonthlyRevenue",
+    "SELECT * FROM sys.tables",
+    "SELECT * FROM INFORMATION_SCHEMA.COLUMNS",
+    "SELECT * FROM Northwind.dbo.Customers",
+    "SELECT * FROM FactOrders f, Staging s WHERE f.OrderID = s.OrderID",
+    "SELECT * FROM (SELECT * FROM Staging) AS s",
+    "SELECT * INTO Copy FROM DimDate",
+    "UPDATE FactOrders SET Freight = 0",
+    "SELECT 1",
+])
+def test_other_queries_are_not_cached(query):
+    assert not cacheable_query(query)
+
+def test_cache_round_trip(tmp_path):
+    cache = QueryResultCache(str(tmp_path))
+    df = pd.DataFrame({'Country': ['UK', 'USA'], 'Revenue': [1.5, 2.0]})
+    cache.put("SELECT *  FROM DimCustomer;", 'v1', df)
+    assert normalize_sql("SELECT *  FROM DimCustomer;") == "SELECT * FROM DimCustomer"
+    pd.testing.assert_frame_equal(cache.get("SELECT * FROM DimCustomer", 'v1'), df)
+    # A new version drops the results of the previous one
+    assert cache.get("SELECT * FROM DimCustomer", 'v2') is None
+    assert cache.get("SELECT * FROM DimCustomer", 'v1') is None
+
+def test_etl_run_changes_the_version(sqlite_warehouse):
+    conn = sqlite_warehouse.connect()
+    before = warehouse_version(conn)
+    # An ETL run that only rewrites rows in place leaves counts and keys alone
+    conn.execute("UPDATE FactOrders SET Freight = Freight + 1")
+    conn.execute(sqlite_warehouse.create_table('EtlRuns', "RunKey {identity}, StartedAt DATETIME NOT NULL, "
+                                                            "FinishedAt DATETIME"))
+    conn.execute("INSERT INTO EtlRuns (StartedAt) VALUES ('1998-07-01 02:00:00')")
+    conn.commit()
+    started = warehouse_version(conn)
+    conn.execute("UPDATE EtlRuns SET FinishedAt = '1998-07-01 02:05:00'")
+    conn.commit()
+    finished = warehouse_version(conn)
+    conn.close()
+    assert len({before, started, finished}) == 3
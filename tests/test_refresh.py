@@ -0,0 +1,66 @@
+# test_refresh.py
+import numpy as np
+import pandas as pd
+import pytest
+from conftest import insert_rows, make_customers, make_dates, make_orders
+
+pytest.importorskip('PyQt5')
+import Dashboard
+
+def open_dashboard():
+    """Dashboard loaded from the warehouse, with change probes on"""
+    return Dashboard.DataWarehouseDashboard(auto_refresh=3600, snapshot=False)
+
+def plain(df):
+    """Frame with categorical columns as plain values, categories depend on the load history"""
+    return df.astype({col: object for col in df.columns if isinstance(df[col].dtype, pd.CategoricalDtype)})
+
+def append_rows(warehouse):
+    """New customers, one from a new country, and orders spread over the loaded dates"""
+    customers = make_customers(33, rng=np.random.default_rng(11)).iloc[30:].assign(Country='Mexico')
+    orders = make_orders(150, make_dates(), customers=33, first_order=20000, rng=np.random.default_rng(12))
+    conn = warehouse.connect()
+    insert_rows(conn, 'DimCustomer', customers)
+    insert_rows(conn, 'FactOrders', orders)
+    conn.close()
+
+def test_folded_rows_match_a_full_load(dashboard_warehouse):
+    dashboard = open_dashboard()
+    assert dashboard.refresh_marks is not None
+    append_rows(dashboard_warehouse)
+
+    worker = Dashboard.RefreshWorker(dashboard.refresh_version, dashboard.refresh_marks, dashboard.fact_key)
+    updates = []
+    worker.changed.connect(updates.append)
+    worker.run()
+    assert len(updates) == 1 and not updates[0]['reload']
+    assert len(updates[0]['FactOrders']) == 150
+    dashboard.apply_refresh(updates[0])
+
+    reloaded = open_dashboard()
+    # Same rows in the same date order as a full load, new orders after the old ones of their day
+    pd.testing.assert_frame_equal(plain(dashboard.analysis_df), plain(reloaded.analysis_df), check_dtype=False)
+    np.testing.assert_array_equal(dashboard.order_dates, reloaded.order_dates)
+    assert dashboard.refresh_marks == reloaded.refresh_marks
+    for by in [['Year', 'Month'], ['Country'], ['CustomerKey'], ['EmployeeKey', 'Title']]:
+        # Folded labels are appended to the cube, so groups are compared in label order
+        folded, loaded = (plain(cube.roll_up(by)).sort_values(by, ignore_index=True) for cube in (dashboard.cube, reloaded.cube))
+        pd.testing.assert_frame_equal(folded, loaded, check_dtype=False)
+    for period in ["Daily", "Weekly", "Monthly", "Yearly"]:
+        pd.testing.assert_frame_equal(dashboard.time_rollup.series(period), reloaded.time_rollup.series(period),
+                                      check_dtype=False)
+    pd.testing.assert_series_equal(dashboard.customer_segments, reloaded.customer_segments)
+    assert 'Mexico' in set(dashboard.customer_countries)
+
+def test_merged_orders_stay_sorted_by_date(dashboard_warehouse):
+    dashboard = open_dashboard()
+    old = dashboard.analysis_df
+    new_rows = old.sample(40, random_state=1).assign(OrderID=np.arange(30000, 30040)).sort_values('OrderDate')
+    merged = dashboard.merge_sorted_orders(new_rows.reset_index(drop=True))
+    assert len(merged) == len(old) + 40
+    assert merged['OrderDate'].is_monotonic_increasing
+    # Each new row follows the loaded orders of its date
+    for order_id, day in zip(new_rows['OrderID'], new_rows['OrderDate']):
+        same_day = merged.index[merged['OrderDate'] == day]
+        assert merged.loc[same_day, 'OrderID'].iloc[-1] >= 30000
+        assert merged.index[merged['OrderID'] == order_id][0] > same_day[(merged.loc[same_day, 'OrderID'] < 30000).to_numpy()].max()
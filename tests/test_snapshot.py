@@ -0,0 +1,45 @@
+# test_snapshot.py
+import os
+import numpy as np
+import pandas as pd
+from query_cache import TableSnapshot
+
+SCHEMA = {'format': 1, 'warehouse': 'sqlite:dw.sqlite', 'columns': {'FactOrders': ['OrderID', 'OrderDate']}}
+STAMP = {'version': 'v1', 'fact_key': 'FactOrderKey', 'marks': {'FactOrders': [3, 3]}}
+
+def frames():
+    """Frames with the dtypes of a dashboard load"""
+    return {
+        'orders': pd.DataFrame({
+            'OrderID': np.array([10248, 10249, 10250], dtype='int32'),
+            'OrderDate': pd.to_datetime(['1996-07-04', '1996-07-05', None]),
+            'TotalAmount': [440.0, np.nan, 1552.6],
+            'Country': pd.Categorical(['France', 'Germany', 'France']),
+        }),
+        'customers': pd.DataFrame({'CustomerKey': [1, 2], 'CompanyName': ['Alfreds', None]}),
+    }
+
+def test_round_trip(tmp_path):
+    snapshot = TableSnapshot(str(tmp_path))
+    snapshot.save(frames(), SCHEMA, STAMP)
+    loaded, stamp = snapshot.load(SCHEMA)
+    assert stamp == STAMP
+    for name, df in frames().items():
+        pd.testing.assert_frame_equal(loaded[name], df)
+
+def test_loaded_frames_do_not_hold_the_files(tmp_path):
+    snapshot = TableSnapshot(str(tmp_path))
+    snapshot.save(frames(), SCHEMA, STAMP)
+    loaded, _ = snapshot.load(SCHEMA)
+    snapshot.save({'orders': frames()['orders'].iloc[:1]}, SCHEMA, dict(STAMP, version='v2'))
+    reloaded, stamp = snapshot.load(SCHEMA)
+    assert stamp['version'] == 'v2' and len(reloaded['orders']) == 1
+    pd.testing.assert_frame_equal(loaded['orders'], frames()['orders'])
+
+def test_other_schema_or_partial_snapshot_is_ignored(tmp_path):
+    snapshot = TableSnapshot(str(tmp_path))
+    assert snapshot.load(SCHEMA) is None
+    snapshot.save(frames(), SCHEMA, STAMP)
+    assert snapshot.load(dict(SCHEMA, format=2)) is None
+    os.remove(snapshot.manifest_path())
+    assert snapshot.load(SCHEMA) is None
@@ -0,0 +1,59 @@
+# test_time_rollup.py
+import numpy as np
+import pandas as pd
+import pytest
+from conftest import make_dates, make_orders
+from time_rollup import TimeRollup
+
+def dated_orders(count, seed):
+    """Orders with the calendar columns of the dashboard analysis frame"""
+    orders = make_orders(count, make_dates(), rng=np.random.default_rng(seed))
+    dates = pd.to_datetime(orders['OrderDate'])
+    return pd.DataFrame({
+        'Date': dates,
+        'Year': dates.dt.year,
+        'Quarter': dates.dt.quarter,
+        'Month': dates.dt.month,
+        'MonthName': dates.dt.strftime('%B'),
+        'DayOfWeek': dates.dt.strftime('%A'),
+        'TotalAmount': orders['TotalAmount'],
+    })
+
+def direct_series(orders, period, year=None):
+    """Revenue per bucket of a period summed straight from the orders"""
+    if year:
+        orders = orders[orders['Year'] == year]
+    if period == "Daily":
+        return orders.groupby('Date')['TotalAmount'].sum().reset_index()
+    if period == "Weekly":
+        week = orders['Date'] - pd.to_timedelta(orders['Date'].dt.weekday, unit='D')
+        return orders.assign(Date=week).groupby('Date')['TotalAmount'].sum().reset_index()
+    keys = {"Monthly": ['Year', 'Month', 'MonthName'], "Quarterly": ['Year', 'Quarter'], "Yearly": ['Year']}[period]
+    return orders.groupby(keys)['TotalAmount'].sum().reset_index()
+
+def assert_same_series(rollup, expected):
+    pd.testing.assert_frame_equal(rollup.astype({'TotalAmount': float}), expected, check_dtype=False,
+                                  check_exact=False)
+
+@pytest.mark.parametrize('period', ["Daily", "Weekly", "Monthly", "Quarterly", "Yearly"])
+@pytest.mark.parametrize('year', [None, 1997])
+def test_levels_match_the_orders(period, year):
+    orders = dated_orders(800, 3)
+    assert_same_series(TimeRollup(orders).series(period, year), direct_series(orders, period, year))
+
+def test_day_of_week_matches_the_orders():
+    orders = dated_orders(800, 4)
+    expected = orders[orders['Year'] == 1997].groupby('DayOfWeek')['TotalAmount'].agg(['mean', 'sum', 'count'])
+    weekdays = TimeRollup(orders).day_of_week(1997).set_index('DayOfWeek')
+    np.testing.assert_allclose(weekdays['Mean'], expected['mean'])
+    np.testing.assert_allclose(weekdays['Sum'], expected['sum'])
+    assert (weekdays['Count'] == expected['count']).all()
+
+def test_added_orders_match_a_rebuild():
+    orders = dated_orders(900, 5)
+    rollup = TimeRollup(orders.iloc[:700])
+    rollup.add(orders.iloc[700:])
+    rebuilt = TimeRollup(orders)
+    for period in ["Daily", "Weekly", "Monthly", "Quarterly", "Yearly"]:
+        assert_same_series(rollup.series(period), rebuilt.series(period).astype({'TotalAmount': float}))
+    pd.testing.assert_frame_equal(rollup.day_of_week(), rebuilt.day_of_week(), check_exact=False)
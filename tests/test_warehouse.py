@@ -0,0 +1,71 @@
+# test_warehouse.py
+import threading
+import time
+from datetime import date, datetime
+from decimal import Decimal
+import numpy as np
+import pandas as pd
+import pytest
+from warehouse import DatabaseError, SqliteWarehouse, warehouse_backend
+
+# Never ends on its own, only a timeout or a cancel stops it
+ENDLESS_QUERY = "WITH RECURSIVE r(x) AS (SELECT 1 UNION ALL SELECT x + 1 FROM r) SELECT MAX(x) FROM r"
+
+def test_backend_spec():
+    warehouse = warehouse_backend('sqlite:dw.sqlite')
+    assert isinstance(warehouse, SqliteWarehouse) and warehouse.spec.endswith('dw.sqlite')
+    assert not warehouse_backend('sqlserver').embedded
+    with pytest.raises(ValueError):
+        warehouse_backend('duckdb:dw.duckdb')
+
+def test_timeout_stops_a_query(tmp_path):
+    conn = SqliteWarehouse(str(tmp_path / 'dw.sqlite')).connect()
+    conn.timeout = 0.2
+    started = time.monotonic()
+    with pytest.raises(DatabaseError):
+        conn.cursor().execute(ENDLESS_QUERY)
+    assert time.monotonic() - started < 5
+    # The next statement gets its own time
+    assert conn.cursor().execute("SELECT 1").fetchone()[0] == 1
+    conn.close()
+
+def test_cancel_from_another_thread(tmp_path):
+    conn = SqliteWarehouse(str(tmp_path / 'dw.sqlite')).connect()
+    cursor = conn.cursor()
+    timer = threading.Timer(0.2, cursor.cancel)
+    timer.start()
+    with pytest.raises(DatabaseError):
+        cursor.execute(ENDLESS_QUERY)
+    timer.join()
+    conn.close()
+
+def test_parameters_bind_like_pyodbc(tmp_path):
+    conn = SqliteWarehouse(str(tmp_path / 'dw.sqlite')).connect()
+    conn.execute("CREATE TABLE t (d DATE, ts DATETIME, amount DECIMAL(10,2), n INT)")
+    conn.execute("INSERT INTO t VALUES (?, ?, ?, ?)", datetime(1997, 1, 2), datetime(1997, 1, 2, 3, 4, 5),
+                 Decimal('12.50'), np.int64(7))
+    conn.cursor().executemany("INSERT INTO t VALUES (?, ?, ?, ?)", [(date(1998, 5, 6), None, 1.5, 8)])
+    rows = conn.execute("SELECT * FROM t WHERE n >= ? ORDER BY n", [7]).fetchall()
+    assert rows == [('1997-01-02', '1997-01-02 03:04:05', 12.5, 7), ('1998-05-06', None, 1.5, 8)]
+    conn.close()
+
+def test_schema_smoke(sqlite_warehouse):
+    conn = sqlite_warehouse.connect()
+    assert {'DimDate', 'DimCustomer', 'DimEmployee', 'FactOrders'} <= sqlite_warehouse.tables(conn)
+    cursor = conn.cursor()
+    cursor.execute("SELECT * FROM FactOrders WHERE 1 = 0")
+    assert cursor.description[0][0] == 'FactOrderKey'
+    count, revenue = conn.execute("SELECT COUNT(*), SUM(TotalAmount) FROM FactOrders").fetchone()
+    assert count == 600 and revenue > 0
+    first = conn.execute(sqlite_warehouse.limit("SELECT OrderID FROM FactOrders ORDER BY OrderID", 3)).fetchall()
+    page = conn.execute(sqlite_warehouse.offset("SELECT OrderID FROM FactOrders ORDER BY OrderID", 2), 1).fetchall()
+    assert [row[0] for row in first][1:] == [row[0] for row in page]
+    conn.close()
+
+def test_week_start(sqlite_warehouse):
+    conn = sqlite_warehouse.connect()
+    dates = pd.read_sql(f"SELECT Date, {sqlite_warehouse.week_start('Date')} AS WeekStart FROM DimDate", conn)
+    conn.close()
+    days = pd.to_datetime(dates['Date'])
+    expected = (days - pd.to_timedelta(days.dt.weekday, unit='D')).dt.strftime('%Y-%m-%d')
+    assert (dates['WeekStart'] == expected).all()